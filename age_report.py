@@ -0,0 +1,168 @@
+"""
+文件年龄与类型分布报告模块
+
+对一个卷做一次流式扫描，按文件类型和修改/访问时间的年龄段，
+把字节数和文件数累加到固定大小的二维计数器中。
+内存占用只与类型数和年龄段数有关，与文件数量无关。
+"""
+
+import os
+import csv
+import time
+import logging
+
+# 文件类型分类，按扩展名归类
+CATEGORIES = [
+    "documents", "images", "video", "audio", "archives",
+    "code", "logs", "databases", "executables", "other"
+]
+
+# 每个扩展名只能属于一个类型。"ts" 归为视频：按占用空间统计时，大的 .ts 文件几乎都是
+# MPEG-TS 录像，TypeScript 源文件的空间可以忽略
+_EXTENSIONS = {
+    "documents": ["txt", "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx", "odt", "ods", "rtf", "md", "csv"],
+    "images": ["jpg", "jpeg", "png", "gif", "bmp", "tif", "tiff", "webp", "heic", "raw", "svg", "psd"],
+    "video": ["mp4", "mkv", "avi", "mov", "wmv", "flv", "webm", "m4v", "ts"],
+    "audio": ["mp3", "wav", "flac", "aac", "ogg", "m4a", "wma"],
+    "archives": ["zip", "rar", "7z", "tar", "gz", "tgz", "bz2", "xz", "zst", "iso", "cab", "deb", "rpm"],
+    "code": ["py", "c", "h", "cpp", "hpp", "java", "js", "go", "rs", "cs", "rb", "php", "sh", "json",
+             "xml", "yaml", "yml", "html", "css", "pyc", "o", "class", "jar"],
+    "logs": ["log", "out", "err", "journal"],
+    "databases": ["db", "sqlite", "sqlite3", "mdb", "accdb", "ibd", "frm", "mdf", "ldf", "bak", "dump"],
+    "executables": ["exe", "dll", "so", "dylib", "msi", "sys", "bin", "appimage"],
+}
+EXTENSION_CATEGORY = {ext: index for index, name in enumerate(CATEGORIES)
+                      for ext in _EXTENSIONS.get(name, [])}
+OTHER_CATEGORY = CATEGORIES.index("other")
+
+# 年龄段上限（天），最后一段没有上限
+AGE_BUCKETS = [7, 30, 90, 180, 365]
+AGE_BUCKET_LABELS = ["<7d", "7-30d", "30-90d", "90-180d", "180-365d", ">365d"]
+
+# 统计维度: 修改时间、访问时间、最后使用时间（两者中较新者）
+AXES = ["mtime", "atime", "last_use"]
+
+DAY = 86400
+
+
+def categorize(name):
+    """根据文件名返回类型分类的下标"""
+    dot = name.rfind(".")
+    if dot <= 0:
+        return OTHER_CATEGORY
+    ext = name[dot + 1:].lower()
+    category = EXTENSION_CATEGORY.get(ext)
+    if category is None and ext.isdigit():
+        # 轮转日志 app.log.1
+        return CATEGORIES.index("logs") if ".log." in name.lower() else OTHER_CATEGORY
+    return OTHER_CATEGORY if category is None else category
+
+
+def age_bucket(age_seconds):
+    """返回年龄所在年龄段的下标"""
+    days = age_seconds / DAY
+    for index, limit in enumerate(AGE_BUCKETS):
+        if days < limit:
+            return index
+    return len(AGE_BUCKETS)
+
+
+class AgeReport:
+    """
+    文件年龄/类型二维直方图
+
+    bytes[axis][category][bucket] 和 files[axis][category][bucket] 都是固定大小的计数器。
+    """
+
+    def __init__(self, root="", now=None):
+        self.root = root
+        self.now = now if now is not None else time.time()
+        rows = len(CATEGORIES)
+        cols = len(AGE_BUCKETS) + 1
+        self.bytes = {axis: [[0] * cols for _ in range(rows)] for axis in AXES}
+        self.files = {axis: [[0] * cols for _ in range(rows)] for axis in AXES}
+        self.total_bytes = 0
+        self.total_files = 0
+        self.errors = 0
+
+    def add(self, name, size, mtime, atime):
+        """把一个文件累加到直方图中"""
+        category = categorize(name)
+        for axis, timestamp in (("mtime", mtime), ("atime", atime), ("last_use", max(mtime, atime))):
+            bucket = age_bucket(max(self.now - timestamp, 0))
+            self.bytes[axis][category][bucket] += size
+            self.files[axis][category][bucket] += 1
+        self.total_bytes += size
+        self.total_files += 1
+
+    def cold_bytes(self, days=90, axis="last_use"):
+        """返回指定维度上至少days天未变化的字节数（按年龄段边界统计）"""
+        first = sum(1 for limit in AGE_BUCKETS if limit <= days)
+        return sum(sum(row[first:]) for row in self.bytes[axis])
+
+    def rows(self, axis):
+        """
+        返回用于表格显示或导出的行
+
+        返回:
+            list: [(类型, [各年龄段字节数])]
+        """
+        return [(CATEGORIES[i], list(row)) for i, row in enumerate(self.bytes[axis])]
+
+    def to_csv(self, path):
+        """导出为CSV: axis, category, age_bucket, bytes, files"""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["axis", "category", "age_bucket", "bytes", "files"])
+            for axis in AXES:
+                for i, category in enumerate(CATEGORIES):
+                    for j, label in enumerate(AGE_BUCKET_LABELS):
+                        writer.writerow([axis, category, label, self.bytes[axis][i][j], self.files[axis][i][j]])
+
+
+def scan_volume(root, one_filesystem=True, cancel_event=None, report=None):
+    """
+    流式扫描目录树并生成年龄报告
+
+    参数:
+        root (str): 扫描根目录
+        one_filesystem (bool): 不进入其他文件系统的挂载点
+        cancel_event (threading.Event): 设置后尽快停止扫描
+        report (AgeReport): 累加到已有报告，None表示新建
+
+    返回:
+        AgeReport: 扫描结果
+    """
+    report = report or AgeReport(root)
+    start = time.monotonic()
+    try:
+        root_dev = os.stat(root).st_dev
+    except OSError as e:
+        logging.error(f"无法访问扫描目录 {root}: {e}")
+        return report
+
+    stack = [root]
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            logging.info(f"年龄报告扫描被取消: {root}")
+            break
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if one_filesystem and entry.stat(follow_symlinks=False).st_dev != root_dev:
+                                continue
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            report.add(entry.name, st.st_size, st.st_mtime, st.st_atime)
+                    except OSError:
+                        report.errors += 1
+        except OSError:
+            report.errors += 1
+
+    logging.info(f"年龄报告扫描完成: {root}，{report.total_files} 个文件，"
+                 f"耗时 {time.monotonic() - start:.1f} 秒")
+    return report
@@ -0,0 +1,198 @@
+"""
+报警汇总窗口
+
+共享存储阵列写满时，几十个挂载点会同时越过阈值。汇总模式把短时间内到达的报警
+合并到一个窗口中，按严重程度列出所有受影响的驱动器；之后到达的报警直接更新这个窗口，
+而不是为每个驱动器和级别各弹出一个窗口。
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+COLUMNS = ("level", "drive", "value", "free")
+HEADINGS = {"level": "level", "drive": "drive", "value": "usage", "free": "free_space"}
+# 汇总窗口中各级别的排序，延迟报警排在使用率报警之后
+SEVERITY = {"critical": 0, "warning": 1, "latency": 2, "notice": 3}
+LEVEL_COLORS = {"critical": "#FFCCCC", "warning": "#FFFFCC", "latency": "#FFE5CC", "notice": "#CCE5FF"}
+GB = 1024 ** 3
+
+
+def entry_key(info):
+    """汇总窗口中每条报警的标识：同一驱动器的同一级别只占一行"""
+    return f"{info['level']}|{info['drive']}"
+
+
+def sort_entries(infos):
+    """按严重程度、再按使用率从高到低排列"""
+    return sorted(infos, key=lambda i: (SEVERITY.get(i["level"], len(SEVERITY)),
+                                        -i["usage"]["percent"], i["drive"]))
+
+
+def format_entry(info, translate):
+    """
+    把一条报警格式化为一行
+
+    返回:
+        tuple: 与 COLUMNS 顺序一致的字符串
+    """
+    usage = info["usage"]
+    if info["level"] == "latency":
+        p99 = max(stats["p99_ms"] for stats in info["latency"].values())
+        value = f"p99 {p99:.0f} ms"
+    else:
+        value = f"{usage['percent']:.1f}%"
+    return (translate("level_" + info["level"]), info["drive"], value, f"{usage['free'] / GB:.2f} GB")
+
+
+def count_levels(infos):
+    """返回 {级别: 条数}，按严重程度排列"""
+    counts = {}
+    for info in sort_entries(infos):
+        counts[info["level"]] = counts.get(info["level"], 0) + 1
+    return counts
+
+
+class AlertDigestWindow:
+    """
+    报警汇总窗口，由 SimpleDiskMonitor 在UI线程中创建和更新
+
+    on_dismiss(infos) 在报警被确认、复查后解除或窗口关闭时调用，用于重置报警状态。
+    """
+
+    def __init__(self, monitor, parent, on_dismiss):
+        self.monitor = monitor
+        self._ = monitor._
+        self.on_dismiss = on_dismiss
+        self.entries = {}
+
+        self.window = tk.Toplevel(parent)
+        self.window.geometry("520x420")
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.summary_label = tk.Label(self.window, text="", justify=tk.LEFT, anchor=tk.W)
+        self.summary_label.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        frame = tk.Frame(self.window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.tree = ttk.Treeview(frame, columns=COLUMNS, show="headings", selectmode="extended")
+        for column in COLUMNS:
+            self.tree.heading(column, text=self._(HEADINGS[column]))
+            self.tree.column(column, width=180 if column == "drive" else 90,
+                             anchor=tk.E if column in ("value", "free") else tk.W, stretch=column == "drive")
+        for level, color in LEVEL_COLORS.items():
+            self.tree.tag_configure(level, background=color)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # 选中报警的详细信息（写入最多的进程、压舱文件等）
+        self.detail_label = tk.Label(self.window, text="", justify=tk.LEFT, anchor=tk.W, wraplength=490)
+        self.detail_label.pack(fill=tk.X, padx=10)
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self.update_detail())
+
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(fill=tk.X, pady=10)
+        self.recheck_button = tk.Button(button_frame, text=self._("digest_recheck"), command=self.recheck)
+        self.recheck_button.pack(side=tk.LEFT, padx=10)
+        tk.Button(button_frame, text=self._("digest_acknowledge"), command=self.acknowledge_selected).pack(side=tk.LEFT)
+        tk.Button(button_frame, text=self._("close"), command=self.close, width=10).pack(side=tk.RIGHT, padx=10)
+
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    def exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def add(self, infos):
+        """加入或更新一批报警，已有的行原地更新"""
+        for info in infos:
+            key = entry_key(info)
+            values = format_entry(info, self._)
+            if key in self.entries:
+                self.tree.item(key, values=values)
+            else:
+                self.tree.insert("", tk.END, iid=key, values=values, tags=(info["level"],))
+            self.entries[key] = info
+        self.refresh()
+        self.window.deiconify()
+        self.window.lift()
+
+    def remove(self, keys):
+        removed = [self.entries.pop(key) for key in keys if key in self.entries]
+        for info in removed:
+            self.tree.delete(entry_key(info))
+        if removed:
+            self.on_dismiss(removed)
+        if not self.entries:
+            self.window.destroy()
+        else:
+            self.refresh()
+
+    def refresh(self):
+        """重新排序并更新窗口标题和汇总行"""
+        order = [entry_key(info) for info in sort_entries(self.entries.values())]
+        if list(self.tree.get_children("")) != order:
+            for index, key in enumerate(order):
+                self.tree.move(key, "", index)
+        counts = count_levels(self.entries.values())
+        summary = ", ".join(f"{self._('level_' + level)} {count}" for level, count in counts.items())
+        self.window.title(self._("digest_title", len(self.entries)))
+        self.summary_label.config(text=summary)
+        self.update_detail()
+
+    def update_detail(self):
+        selection = self.tree.selection()
+        info = self.entries.get(selection[0]) if selection else None
+        if not info:
+            self.detail_label.config(text="")
+            return
+        self.detail_label.config(text=self.monitor._format_alert_details(info).strip())
+
+    def acknowledge_selected(self):
+        self.remove(list(self.tree.selection()))
+
+    def recheck(self):
+        """在后台线程中重新读取各驱动器的使用率，结果回到UI线程后由 apply_recheck 处理"""
+        with self.monitor.lock:
+            thresholds = {level: self.monitor.config.get(f"{level}_threshold", default)
+                          for level, default in (("critical", 90), ("warning", 75), ("notice", 60))}
+        drives = sorted({info["drive"] for info in self.entries.values() if info["level"] in thresholds})
+        if not drives:
+            return
+        # 卡住的网络挂载点可能让读取阻塞很久，不能在Tk线程中读取
+        self.recheck_button.config(state=tk.DISABLED)
+        threading.Thread(target=self._recheck_worker, args=(drives, thresholds), daemon=True).start()
+
+    def _recheck_worker(self, drives, thresholds):
+        usages = {drive: self.monitor.get_disk_usage(drive) for drive in drives}
+        self.monitor.ui_queue.put(("digest_recheck_result", self, thresholds, usages))
+
+    def apply_recheck(self, thresholds, usages):
+        """已回落到该级别阈值以下的报警自动解除，其余更新为最新的使用率"""
+        if not self.exists():
+            return
+        self.recheck_button.config(state=tk.NORMAL)
+        resolved = []
+        for key, info in list(self.entries.items()):
+            usage = usages.get(info["drive"])
+            if info["level"] not in thresholds or not usage:
+                continue
+            if usage["percent"] < thresholds[info["level"]]:
+                resolved.append(key)
+            else:
+                info = dict(info, usage=usage)
+                self.entries[key] = info
+                self.tree.item(key, values=format_entry(info, self._))
+        self.remove(resolved)
+
+    def close(self):
+        infos = list(self.entries.values())
+        self.entries = {}
+        self.window.destroy()
+        if infos:
+            self.on_dismiss(infos)
@@ -0,0 +1,221 @@
+"""
+无界面模式的报警输出
+
+服务器上没有弹窗，报警通过可配置的输出（sink）发出。配置项 alert_sinks 是一个列表，例如:
+    [{"type": "log"},
+     {"type": "syslog", "min_level": "warning"},
+     {"type": "file", "path": "/var/log/disk-alerts.jsonl"},
+     {"type": "command", "command": ["/usr/local/bin/page-oncall"], "min_level": "critical"},
+     {"type": "webhook", "url": "http://alerts.example/hook"}]
+每个输出都可以设置 min_level，只接收该级别及以上的报警。
+
+AlertRouter 负责去重：同一驱动器的报警只在级别变化、或超过重复间隔后再次发出；
+驱动器回落到正常后发出一条 resolved 事件。
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+
+# 输出过滤用的级别顺序，延迟报警与警告同级
+LEVEL_RANK = {"notice": 1, "latency": 2, "warning": 2, "critical": 3}
+LOG_LEVELS = {"notice": logging.INFO, "latency": logging.WARNING, "warning": logging.WARNING,
+              "critical": logging.CRITICAL}
+
+
+def alert_key(info):
+    """去重用的标识：使用率报警和延迟报警分别跟踪"""
+    return (info["drive"], "latency" if info["level"] == "latency" else "usage")
+
+
+class Sink:
+    """报警输出的基类"""
+
+    def __init__(self, min_level="notice"):
+        self.min_rank = LEVEL_RANK.get(min_level, 1)
+
+    def accepts(self, event):
+        return LEVEL_RANK.get(event["level"], 1) >= self.min_rank
+
+    def emit(self, event):
+        raise NotImplementedError
+
+
+class LogSink(Sink):
+    """写入程序日志（无界面模式下即标准错误，由 journald 收集）"""
+
+    def emit(self, event):
+        level = logging.INFO if event["event"] == "resolved" else LOG_LEVELS.get(event["level"], logging.WARNING)
+        logging.log(level, event["message"])
+
+
+class StreamSink(Sink):
+    """每条报警输出一行JSON到标准输出"""
+
+    def __init__(self, stream=None, min_level="notice"):
+        super().__init__(min_level)
+        self.stream = stream
+
+    def emit(self, event):
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+        stream.flush()
+
+
+class FileSink(Sink):
+    """追加JSON行到文件；每次重新打开，兼容 logrotate"""
+
+    def __init__(self, path, min_level="notice"):
+        super().__init__(min_level)
+        self.path = path
+
+    def emit(self, event):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+class SyslogSink(Sink):
+    """写入 syslog（仅 Unix）"""
+
+    def __init__(self, ident="simple-disk-monitor", facility="daemon", min_level="notice"):
+        super().__init__(min_level)
+        import syslog
+        self.syslog = syslog
+        self.priorities = {"notice": syslog.LOG_NOTICE, "latency": syslog.LOG_WARNING,
+                           "warning": syslog.LOG_WARNING, "critical": syslog.LOG_CRIT}
+        syslog.openlog(ident, syslog.LOG_PID, getattr(syslog, f"LOG_{facility.upper()}", syslog.LOG_DAEMON))
+
+    def emit(self, event):
+        priority = self.syslog.LOG_INFO if event["event"] == "resolved" else self.priorities.get(
+            event["level"], self.syslog.LOG_WARNING)
+        self.syslog.syslog(priority, event["message"])
+
+
+class CommandSink(Sink):
+    """
+    执行外部命令，报警的JSON写入标准输入
+
+    同时设置环境变量 DISK_MONITOR_EVENT / _DRIVE / _LEVEL / _PERCENT，方便简单的 shell 脚本使用。
+    """
+
+    def __init__(self, command, timeout=10, min_level="notice"):
+        super().__init__(min_level)
+        self.command = command if isinstance(command, list) else [command]
+        self.timeout = timeout
+
+    def emit(self, event):
+        import subprocess
+        env = dict(os.environ,
+                   DISK_MONITOR_EVENT=event["event"],
+                   DISK_MONITOR_DRIVE=event["drive"],
+                   DISK_MONITOR_LEVEL=event["level"],
+                   DISK_MONITOR_PERCENT=f"{event.get('percent', 0):.1f}")
+        result = subprocess.run(self.command, input=json.dumps(event, ensure_ascii=False).encode("utf-8"),
+                                env=env, timeout=self.timeout, capture_output=True)
+        if result.returncode != 0:
+            logging.warning(f"报警命令 {self.command[0]} 返回 {result.returncode}: "
+                            f"{result.stderr.decode('utf-8', 'replace').strip()[:200]}")
+
+
+class WebhookSink(Sink):
+    """以JSON POST到指定URL"""
+
+    def __init__(self, url, timeout=5, headers=None, min_level="notice"):
+        super().__init__(min_level)
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def emit(self, event):
+        import urllib.request
+        request = urllib.request.Request(self.url, data=json.dumps(event, ensure_ascii=False).encode("utf-8"),
+                                         headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+SINK_TYPES = {
+    "log": LogSink,
+    "stdout": StreamSink,
+    "file": FileSink,
+    "syslog": SyslogSink,
+    "command": CommandSink,
+    "webhook": WebhookSink,
+}
+
+
+def build_sinks(specs):
+    """
+    根据配置创建输出列表，无效的配置项记录日志后跳过
+
+    参数:
+        specs (list): alert_sinks 配置，每项为 {"type": 类型, ...参数}
+    """
+    sinks = []
+    for spec in specs or []:
+        spec = dict(spec)
+        kind = spec.pop("type", None)
+        sink_class = SINK_TYPES.get(kind)
+        if sink_class is None:
+            logging.warning(f"未知的报警输出类型: {kind}")
+            continue
+        try:
+            sinks.append(sink_class(**spec))
+        except Exception as e:
+            logging.error(f"创建报警输出 {kind} 失败: {e}")
+    return sinks
+
+
+class AlertRouter:
+    """
+    报警去重和分发，监控线程每轮检查调用:
+        begin_cycle() -> should_emit(...)（每个报警）-> end_cycle(...)
+    """
+
+    def __init__(self, sinks, repeat_seconds=3600):
+        self.sinks = sinks
+        self.repeat_seconds = repeat_seconds
+        # {alert_key: (级别, 上次发出的时间)}
+        self.active = {}
+        self.seen = set()
+        self._lock = threading.Lock()
+
+    def begin_cycle(self):
+        with self._lock:
+            self.seen = set()
+
+    def should_emit(self, info, now=None):
+        """记录本轮仍处于报警状态的驱动器，返回是否需要发出这条报警"""
+        now = time.monotonic() if now is None else now
+        key = alert_key(info)
+        with self._lock:
+            self.seen.add(key)
+            previous = self.active.get(key)
+            if (previous is not None and previous[0] == info["level"]
+                    and (self.repeat_seconds <= 0 or now - previous[1] < self.repeat_seconds)):
+                return False
+            self.active[key] = (info["level"], now)
+            return True
+
+    def end_cycle(self, present_drives):
+        """
+        结束一轮检查，返回本轮没有再报警的 [(驱动器, 级别)]，即已解除的报警
+
+        本轮没有检查到的驱动器（例如暂时无法访问）保持原状态。
+        """
+        with self._lock:
+            resolved = [key for key in self.active if key not in self.seen and key[0] in present_drives]
+            levels = [(key[0], self.active.pop(key)[0]) for key in resolved]
+        return levels
+
+    def emit(self, event):
+        for sink in self.sinks:
+            if not sink.accepts(event):
+                continue
+            try:
+                sink.emit(event)
+            except Exception as e:
+                logging.error(f"报警输出 {type(sink).__name__} 失败: {e}")
@@ -0,0 +1,122 @@
+"""
+应急压舱文件模块
+
+在空间充足时为驱动器预分配一个“压舱”文件；当驱动器进入严重级别时由监控线程
+立即删除它，瞬间释放空间为运维人员争取时间；使用率回落到警告阈值以下后再重新创建。
+"""
+
+import os
+import sys
+import logging
+import threading
+
+BALLAST_NAME = ".disk_monitor_ballast"
+CHUNK_SIZE = 4 * 1024 * 1024
+# 创建失败（空间不足、配额、只读、不支持预分配等）后跳过的 ensure() 次数，即大约多少轮检查后重试
+RETRY_AFTER_CHECKS = 30
+
+
+def default_ballast_path(drive):
+    """返回驱动器上默认的压舱文件路径"""
+    return os.path.join(drive, BALLAST_NAME)
+
+
+def allocate_file(path, size):
+    """
+    创建一个真正占用磁盘空间（非稀疏）的文件
+
+    优先使用 posix_fallocate；Windows 上扩展文件长度即可分配空间；
+    其他平台退回到写入零块。失败时删除不完整的文件并抛出 OSError。
+    """
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(f.fileno(), 0, size)
+            elif sys.platform == "win32":
+                f.truncate(size)
+            else:
+                zeros = bytes(CHUNK_SIZE)
+                remaining = size
+                while remaining > 0:
+                    remaining -= f.write(zeros[:min(CHUNK_SIZE, remaining)])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class BallastManager:
+    """
+    管理各驱动器的压舱文件
+
+    release() 只做一次删除调用，可以直接在监控线程中执行；
+    创建可能较慢，在后台线程中进行。创建失败后 RETRY_AFTER_CHECKS 轮检查内不再重试，
+    压舱文件被释放（驱动器进入过严重级别）或大小配置改变时立即允许重试。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._creating = set()
+        # 创建失败的压舱文件: {路径: [大小, 剩余跳过次数]}
+        self._failed = {}
+
+    def exists(self, path):
+        return os.path.isfile(path)
+
+    def release(self, drive, path):
+        """删除压舱文件，返回释放的字节数"""
+        with self._lock:
+            self._failed.pop(path, None)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            logging.warning(f"磁盘 {drive} 进入严重级别，已释放压舱文件 {path}（{size / (1024**2):.0f} MB）")
+            return size
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logging.error(f"释放压舱文件 {path} 失败: {e}")
+            return 0
+
+    def should_create(self, usage, size, warning_threshold):
+        """
+        判断是否可以创建压舱文件：创建后使用率仍低于警告阈值，避免创建后立即触发报警
+        """
+        if not usage or usage["total"] <= 0:
+            return False
+        return (usage["used"] + size) / usage["total"] * 100 < warning_threshold and usage["free"] > size
+
+    def ensure(self, drive, path, size, usage, warning_threshold):
+        """压舱文件不存在且空间充足时，在后台线程中创建"""
+        if self.exists(path) or not self.should_create(usage, size, warning_threshold):
+            return False
+        with self._lock:
+            if drive in self._creating:
+                return False
+            failure = self._failed.get(path)
+            if failure and failure[0] == size and failure[1] > 0:
+                failure[1] -= 1
+                return False
+            self._creating.add(drive)
+        threading.Thread(target=self._create, args=(drive, path, size), daemon=True).start()
+        return True
+
+    def _create(self, drive, path, size):
+        try:
+            allocate_file(path, size)
+            with self._lock:
+                self._failed.pop(path, None)
+            logging.info(f"已为磁盘 {drive} 创建压舱文件 {path}（{size / (1024**2):.0f} MB）")
+        except OSError as e:
+            with self._lock:
+                self._failed[path] = [size, RETRY_AFTER_CHECKS]
+            logging.error(f"创建压舱文件 {path} 失败，{RETRY_AFTER_CHECKS} 轮检查后重试: {e}")
+        finally:
+            with self._lock:
+                self._creating.discard(drive)
@@ -0,0 +1,272 @@
+"""
+策略驱动的自动清理模块
+
+每条清理策略描述“在某个目录下删除哪些文件”，目前支持两种动作:
+    older_than   删除修改时间早于 days 天的匹配文件
+    keep_newest  每个目录中只保留最新的 keep 个匹配文件（适用于轮转日志）
+
+每次运行都会先生成预览（将删除哪些文件、共多少字节）；只有关闭 dry_run 时才真正删除，
+并且必须带上之前已报告过的预览的计划指纹（plan_id）：计划在预览之后发生变化时不删除，
+只返回新的预览，等待重新确认。
+删除以批次为单位并行执行，并受每秒操作数和每秒字节数两个令牌桶限制，
+避免清理任务抢占生产业务的I/O。
+"""
+
+import os
+import time
+import fnmatch
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from process_io import match_drive
+
+ACTIONS = ("older_than", "keep_newest")
+DAY = 86400
+
+
+def validate_policy(policy):
+    """
+    校验一条清理策略，返回规范化后的副本
+
+    异常:
+        ValueError: 策略缺少必要字段或取值不合法
+    """
+    if not isinstance(policy, dict):
+        raise ValueError("清理策略必须是字典")
+    action = policy.get("action")
+    if action not in ACTIONS:
+        raise ValueError(f"未知的清理动作: {action}")
+    path = policy.get("path")
+    if not path or not os.path.isabs(path):
+        raise ValueError(f"清理路径必须是绝对路径: {path}")
+    if os.path.dirname(os.path.normpath(path)) == os.path.normpath(path):
+        raise ValueError(f"不允许清理驱动器根目录: {path}")
+
+    normalized = {
+        "action": action,
+        "path": path,
+        "pattern": policy.get("pattern", "*"),
+        "recursive": bool(policy.get("recursive", False)),
+        "drive": policy.get("drive"),
+    }
+    if action == "older_than":
+        days = policy.get("days")
+        if not isinstance(days, (int, float)) or days <= 0:
+            raise ValueError(f"older_than 策略的 days 必须大于0: {days}")
+        normalized["days"] = days
+    else:
+        keep = policy.get("keep")
+        if not isinstance(keep, int) or keep < 0:
+            raise ValueError(f"keep_newest 策略的 keep 必须是非负整数: {keep}")
+        normalized["keep"] = keep
+    return normalized
+
+
+def _iter_matching_files(path, pattern, recursive):
+    """
+    遍历目录中匹配模式的普通文件，不跟随符号链接
+
+    生成:
+        tuple: (所在目录, 文件路径, stat结果)
+    """
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and fnmatch.fnmatch(entry.name, pattern):
+                            yield current, entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logging.warning(f"无法读取清理目录 {current}: {e}")
+
+
+def plan_policy(policy, now=None):
+    """
+    生成单条策略的删除计划
+
+    返回:
+        list: [(文件路径, 字节数)]
+    """
+    now = now if now is not None else time.time()
+    candidates = []
+    if policy["action"] == "older_than":
+        cutoff = now - policy["days"] * DAY
+        for _, path, st in _iter_matching_files(policy["path"], policy["pattern"], policy["recursive"]):
+            if st.st_mtime < cutoff:
+                candidates.append((path, st.st_size))
+    else:
+        per_dir = {}
+        for directory, path, st in _iter_matching_files(policy["path"], policy["pattern"], policy["recursive"]):
+            per_dir.setdefault(directory, []).append((st.st_mtime, path, st.st_size))
+        for files in per_dir.values():
+            files.sort(reverse=True)
+            candidates.extend((path, size) for _, path, size in files[policy["keep"]:])
+    return candidates
+
+
+def plan_id(plan):
+    """删除计划的指纹：文件路径和大小都相同时才相同"""
+    import hashlib
+    digest = hashlib.sha1()
+    for path, size in sorted(plan):
+        digest.update(f"{path}\0{size}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()[:16]
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶限速器
+
+    rate为每秒补充的令牌数，0或负数表示不限速。
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """
+        取出amount个令牌，不足时阻塞等待
+
+        请求可以超过桶容量：余额记为负数，调用者睡眠到欠下的令牌补足为止，
+        因此大文件也按实际字节数计费，长期速率不会超过rate。
+        """
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class CleanupEngine:
+    """清理引擎：生成预览，并在限速下并行执行删除"""
+
+    def __init__(self, max_iops=100, max_bytes_per_sec=0, workers=4, batch_size=32):
+        self.max_iops = max_iops
+        self.max_bytes_per_sec = max_bytes_per_sec
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def preview(self, policies, now=None):
+        """
+        生成所有策略的删除计划（不会删除任何文件）
+
+        返回:
+            list: [(文件路径, 字节数)]，同一文件只出现一次
+        """
+        seen = set()
+        plan = []
+        for policy in policies:
+            for path, size in plan_policy(policy, now):
+                if path not in seen:
+                    seen.add(path)
+                    plan.append((path, size))
+        return plan
+
+    def _delete_batch(self, batch, ops_bucket, bytes_bucket):
+        freed = 0
+        deleted = 0
+        errors = 0
+        for path, size in batch:
+            ops_bucket.acquire(1)
+            bytes_bucket.acquire(size)
+            try:
+                os.remove(path)
+                freed += size
+                deleted += 1
+            except FileNotFoundError:
+                # 文件已被其他程序删除
+                continue
+            except OSError as e:
+                logging.error(f"删除文件 {path} 失败: {e}")
+                errors += 1
+        return deleted, freed, errors
+
+    def run(self, policies, dry_run=True, now=None, approved_plan=None):
+        """
+        执行一次清理
+
+        参数:
+            policies (list): 已校验的策略列表
+            dry_run (bool): True时只生成预览
+            approved_plan (str): 已报告并确认过的预览的 plan_id；与当前计划不一致时只生成预览
+
+        返回:
+            dict: {"dry_run", "plan_id", "approval_required", "planned_files", "planned_bytes", "preview",
+                   "deleted_files", "reclaimed_bytes", "errors", "duration"}
+        """
+        start = time.monotonic()
+        plan = self.preview(policies, now)
+        current_plan = plan_id(plan)
+        approval_required = not dry_run and approved_plan != current_plan
+        if approval_required:
+            if approved_plan is not None:
+                logging.warning("清理计划在预览之后发生了变化，需要重新确认后才会删除")
+            dry_run = True
+        report = {
+            "dry_run": dry_run,
+            "plan_id": current_plan,
+            "approval_required": approval_required,
+            "planned_files": len(plan),
+            "planned_bytes": sum(size for _, size in plan),
+            "preview": plan[:20],
+            "deleted_files": 0,
+            "reclaimed_bytes": 0,
+            "errors": 0,
+            "duration": 0.0
+        }
+        logging.info(f"清理预览: 计划删除 {report['planned_files']} 个文件，"
+                     f"共 {report['planned_bytes'] / (1024**2):.1f} MB；示例: {[p for p, _ in plan[:5]]}")
+
+        if not dry_run and plan:
+            ops_bucket = TokenBucket(self.max_iops)
+            bytes_bucket = TokenBucket(self.max_bytes_per_sec)
+            batches = [plan[i:i + self.batch_size] for i in range(0, len(plan), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for deleted, freed, errors in executor.map(
+                        lambda batch: self._delete_batch(batch, ops_bucket, bytes_bucket), batches):
+                    report["deleted_files"] += deleted
+                    report["reclaimed_bytes"] += freed
+                    report["errors"] += errors
+
+        report["duration"] = time.monotonic() - start
+        if not dry_run:
+            logging.info(f"清理完成: 删除 {report['deleted_files']} 个文件，"
+                         f"回收 {report['reclaimed_bytes'] / (1024**2):.1f} MB，"
+                         f"失败 {report['errors']} 个，耗时 {report['duration']:.1f} 秒")
+        return report
+
+
+def policies_for_drive(policies, drive, drives):
+    """
+    从配置中挑出属于指定驱动器的有效策略，非法策略记录日志后跳过
+
+    策略没有指定drive时，根据path所在的驱动器自动归属。
+    """
+    selected = []
+    for policy in policies:
+        try:
+            policy = validate_policy(policy)
+        except ValueError as e:
+            logging.error(f"忽略无效的清理策略 {policy}: {e}")
+            continue
+        owner = policy["drive"] or match_drive(policy["path"], drives)
+        if owner == drive:
+            selected.append(policy)
+    return selected
@@ -0,0 +1,387 @@
+"""
+冷文件后台压缩模块
+
+用于不允许删除文件的卷：当驱动器接近警告阈值时，在配置的目录中找出
+长时间未修改且足够大的冷文件，用 gzip/lzma（安装了 zstandard 时可用 zstd）
+就地压缩。压缩在进程池中进行，并受工作进程数（CPU预算）和每秒读取字节数（I/O预算）限制：
+每个工作进程按块读取时从自己的令牌桶取令牌，各进程的速率之和等于I/O预算。
+每个文件先写入同目录下的临时文件，解压校验无误后原子替换，再删除原文件。
+进度保存在状态文件中，程序重启后可以继续。
+"""
+
+import os
+import gzip
+import lzma
+import json
+import time
+import shutil
+import logging
+import threading
+
+from cleanup import TokenBucket
+from process_io import match_drive
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TMP_SUFFIX = ".sdm-compress.tmp"
+# 状态文件中最多记录的跳过文件数，超出时淘汰最早记录的
+MAX_FAILED = 10000
+CHUNK_SIZE = 1024 * 1024
+DAY = 86400
+
+# 已经压缩过或本身不适合再压缩的扩展名
+SKIP_EXTENSIONS = {
+    ".gz", ".xz", ".zst", ".bz2", ".zip", ".7z", ".rar", ".tgz", ".lz4",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".mp4", ".mkv", ".avi", ".mov", ".m4a", ".aac", ".flac", ".ogg",
+}
+
+# 工作进程内的I/O令牌桶，由进程池初始化函数创建
+_io_bucket = None
+
+
+def available_codecs():
+    """返回当前环境可用的压缩算法"""
+    codecs = ["gzip", "lzma"]
+    if zstandard is not None:
+        codecs.append("zstd")
+    return codecs
+
+
+def codec_extension(codec):
+    return {"gzip": ".gz", "lzma": ".xz", "zstd": ".zst"}[codec]
+
+
+def _open_compressed(path, mode, codec, level=None):
+    if codec == "gzip":
+        return gzip.open(path, mode, compresslevel=level or 6)
+    if codec == "lzma":
+        return lzma.open(path, mode, preset=level or 6)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard 未安装，无法使用 zstd 压缩")
+        raw = open(path, mode)
+        if "w" in mode:
+            return zstandard.ZstdCompressor(level=level or 3).stream_writer(raw, closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    raise ValueError(f"未知的压缩算法: {codec}")
+
+
+def _init_worker(bytes_per_sec):
+    """进程池初始化函数：降低优先级，并创建本进程的I/O令牌桶（0表示不限速）"""
+    global _io_bucket
+    _lower_priority()
+    _io_bucket = TokenBucket(bytes_per_sec)
+
+
+def _lower_priority():
+    """降低压缩进程的CPU和I/O优先级"""
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    try:
+        import psutil
+        proc = psutil.Process()
+        if hasattr(psutil, "IOPRIO_CLASS_IDLE"):
+            proc.ionice(psutil.IOPRIO_CLASS_IDLE)
+        elif hasattr(psutil, "IOPRIO_VERYLOW"):
+            proc.ionice(psutil.IOPRIO_VERYLOW)
+    except Exception:
+        pass
+
+
+def compress_file(path, codec="gzip", level=None, bucket=None):
+    """
+    压缩单个文件并校验，成功后用压缩文件替换原文件
+
+    在进程池中执行，因此必须是模块级函数。每读取一块都从 bucket（默认为本进程的
+    _io_bucket）按字节数取令牌，限速覆盖实际发生的读取。
+
+    返回:
+        tuple: (路径, 原始字节数, 压缩后字节数, 状态)
+               状态为 "ok"、"not_smaller"、"changed" 或 "error: ..."
+    """
+    import hashlib
+    bucket = bucket if bucket is not None else _io_bucket
+    final = path + codec_extension(codec)
+    tmp = final + TMP_SUFFIX
+    try:
+        before = os.stat(path)
+        if os.path.exists(final):
+            return path, before.st_size, 0, "error: 目标文件已存在"
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as src, _open_compressed(tmp, "wb", codec, level) as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if bucket is not None:
+                    bucket.acquire(len(chunk))
+                digest.update(chunk)
+                dst.write(chunk)
+
+        # 压缩期间文件被修改过则放弃，下一轮再处理
+        after = os.stat(path)
+        if (after.st_mtime, after.st_size) != (before.st_mtime, before.st_size):
+            os.remove(tmp)
+            return path, before.st_size, 0, "changed"
+
+        compressed_size = os.path.getsize(tmp)
+        if compressed_size >= before.st_size:
+            os.remove(tmp)
+            return path, before.st_size, compressed_size, "not_smaller"
+
+        # 解压校验：重新读取整个压缩文件，同样计入I/O预算
+        if bucket is not None:
+            bucket.acquire(compressed_size)
+        check = hashlib.sha256()
+        with _open_compressed(tmp, "rb", codec) as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                check.update(chunk)
+        if check.digest() != digest.digest():
+            os.remove(tmp)
+            return path, before.st_size, compressed_size, "error: 校验失败"
+
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        shutil.copystat(path, tmp)
+        os.replace(tmp, final)
+        os.remove(path)
+        return path, before.st_size, compressed_size, "ok"
+    except Exception as e:
+        try:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        except OSError:
+            pass
+        return path, 0, 0, f"error: {e}"
+
+
+def find_cold_files(root, min_age_days=90, min_size=1024 * 1024, skip=(), now=None):
+    """
+    查找可以压缩的冷文件，同时清理上次中断留下的临时文件
+
+    生成:
+        tuple: (路径, 字节数)
+    """
+    now = now if now is not None else time.time()
+    cutoff = now - min_age_days * DAY
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        if entry.name.endswith(TMP_SUFFIX):
+                            logging.info(f"删除中断的压缩临时文件: {entry.path}")
+                            os.remove(entry.path)
+                            continue
+                        if os.path.splitext(entry.name)[1].lower() in SKIP_EXTENSIONS or entry.path in skip:
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        if st.st_size >= min_size and st.st_mtime < cutoff:
+                            yield entry.path, st.st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class CompressionState:
+    """
+    压缩进度状态，持久化为JSON文件
+
+    failed 记录压缩失败或不划算的文件 {路径: [mtime, 字节数]}，文件被修改或删除后不再跳过，
+    最多保留 max_failed 条，状态文件的大小不随卷上文件数增长。
+    """
+
+    def __init__(self, path=None, max_failed=MAX_FAILED):
+        self.path = path
+        self.max_failed = max_failed
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.data = {"saved_bytes": {}, "compressed_files": {}, "failed": {}}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logging.error(f"读取压缩状态文件失败: {e}")
+        if not isinstance(self.data["failed"], dict):
+            # 旧版本只记录路径，无法判断文件是否已变化，这些文件重新尝试一次
+            self.data["failed"] = {}
+
+    def record(self, drive, original, compressed):
+        with self._lock:
+            self.data["saved_bytes"][drive] = self.data["saved_bytes"].get(drive, 0) + original - compressed
+            self.data["compressed_files"][drive] = self.data["compressed_files"].get(drive, 0) + 1
+            self._dirty = True
+
+    def record_failure(self, path):
+        """记录文件当前的 mtime 和大小；文件已不存在时不记录"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            failed = self.data["failed"]
+            failed.pop(path, None)
+            failed[path] = [st.st_mtime, st.st_size]
+            while len(failed) > self.max_failed:
+                del failed[next(iter(failed))]
+            self._dirty = True
+
+    def failed(self):
+        """
+        返回应当跳过的文件路径
+
+        同时删除已被修改或删除的文件的记录，这些文件下一轮重新尝试。
+        """
+        with self._lock:
+            entries = list(self.data["failed"].items())
+        stale = []
+        for path, (mtime, size) in entries:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stale.append(path)
+                continue
+            if (st.st_mtime, st.st_size) != (mtime, size):
+                stale.append(path)
+        with self._lock:
+            for path in stale:
+                self.data["failed"].pop(path, None)
+            if stale:
+                self._dirty = True
+            return set(self.data["failed"])
+
+    def saved_bytes(self, drive):
+        with self._lock:
+            return self.data["saved_bytes"].get(drive, 0)
+
+    def save(self):
+        """写入状态文件；自上次保存以来没有变化时跳过"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self.data, ensure_ascii=False)
+            self._dirty = False
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.error(f"保存压缩状态文件失败: {e}")
+            with self._lock:
+                self._dirty = True
+
+
+class CompressionWorker:
+    """
+    后台压缩调度器
+
+    每个驱动器同一时间只有一轮压缩，压缩轮次在后台线程中运行，
+    实际压缩由进程池完成。每一轮有自己的停止事件，新启动的轮次不会撤销对其他轮次的停止请求。
+    """
+
+    def __init__(self, state_file=None, workers=1, max_bytes_per_sec=20 * 1024 * 1024,
+                 codec="gzip", min_age_days=90, min_size=1024 * 1024):
+        self.state = CompressionState(state_file)
+        self.workers = workers
+        self.max_bytes_per_sec = max_bytes_per_sec
+        self.codec = codec if codec in available_codecs() else "gzip"
+        self.min_age_days = min_age_days
+        self.min_size = min_size
+        # {驱动器: 该轮的停止事件}
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def is_running(self, drive):
+        with self._lock:
+            return drive in self._running
+
+    def start(self, drive, roots):
+        """为驱动器启动一轮压缩，已在运行时返回False"""
+        with self._lock:
+            if drive in self._running:
+                return False
+            stop_event = threading.Event()
+            self._running[drive] = stop_event
+        threading.Thread(target=self._run, args=(drive, roots, stop_event), daemon=True).start()
+        return True
+
+    def stop(self):
+        """请求所有正在运行的压缩轮次尽快停止（退出或资源降级时调用），已提交的文件会处理完"""
+        with self._lock:
+            for stop_event in self._running.values():
+                stop_event.set()
+
+    def _run(self, drive, roots, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        # 进程池（以及 multiprocessing）只在真正开始压缩时才导入
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        start = time.monotonic()
+        saved_before = self.state.saved_bytes(drive)
+        failed = self.state.failed()
+        logging.info(f"开始压缩磁盘 {drive} 上的冷文件: {roots}，算法 {self.codec}")
+        try:
+            # I/O预算平分给各工作进程，读取时在进程内按块限速
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.max_bytes_per_sec / self.workers,)) as executor:
+                pending = set()
+                for root in roots:
+                    if stop_event.is_set():
+                        break
+                    for path, _ in find_cold_files(root, self.min_age_days, self.min_size, failed):
+                        if stop_event.is_set():
+                            break
+                        pending.add(executor.submit(compress_file, path, self.codec))
+                        # 限制在途任务数，避免一次性提交整棵目录树
+                        if len(pending) >= self.workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            self._collect(drive, done)
+                for future in pending:
+                    self._collect(drive, [future])
+        except Exception as e:
+            logging.error(f"压缩磁盘 {drive} 时出错: {e}", exc_info=True)
+        finally:
+            self.state.save()
+            with self._lock:
+                self._running.pop(drive, None)
+        saved = self.state.saved_bytes(drive) - saved_before
+        logging.info(f"磁盘 {drive} 压缩轮次结束: 本轮节省 {saved / (1024**2):.1f} MB，"
+                     f"耗时 {time.monotonic() - start:.1f} 秒")
+
+    def _collect(self, drive, futures):
+        for future in futures:
+            path, original, compressed, status = future.result()
+            if status == "ok":
+                self.state.record(drive, original, compressed)
+            elif status.startswith("error") or status == "not_smaller":
+                # 压缩不划算或失败的文件不再重试
+                logging.info(f"跳过文件 {path}: {status}")
+                self.state.record_failure(path)
+        # 每批结果都落盘，保证重启后进度不丢失
+        self.state.save()
+
+
+def roots_for_drive(paths, drive, drives):
+    """返回配置的压缩目录中位于指定驱动器上的目录"""
+    return [path for path in paths if os.path.isdir(path) and match_drive(path, drives) == drive]
@@ -0,0 +1,452 @@
+"""
+设置窗口
+
+只在用户打开设置时才导入，程序启动时不需要加载 tkinter。
+"""
+
+import json
+import queue
+import logging
+import threading
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+# 配置窗口中探测驱动器容量的线程数，卡死的网络挂载点最多占用其中一个
+DRIVE_PROBE_WORKERS = 4
+
+
+class ConfigWindow(tk.Toplevel):
+    def __init__(self, monitor, parent=None):
+        try:
+            super().__init__(parent)
+            logging.info("配置窗口初始化")
+            self.title(monitor._("settings_title"))
+            self.geometry("600x800")  # 增加窗口尺寸，确保所有内容可见
+            self.minsize(600, 800)    # 添加最小窗口大小限制
+            self.resizable(True, True)  # 允许调整大小
+            self.monitor = monitor
+            self.config = monitor.config
+            # 记录当前语言，用于检测变化
+            self.current_language = self.config.get("language", "zh_CN")
+            # 预先初始化列表，确保toggle_drive_selection方法总是有效
+            self.drive_checkbuttons = []
+            self.drive_vars = {}
+            self.drive_cb_by_drive = {}
+            self.drive_status = {}
+            self.drives_loaded = False
+            self.create_widgets()
+            # 窗口居中
+            self.update_idletasks()
+            width = self.winfo_width()
+            height = self.winfo_height()
+            x = (self.winfo_screenwidth() // 2) - (width // 2)
+            y = (self.winfo_screenheight() // 2) - (height // 2)
+            self.geometry(f'{width}x{height}+{x}+{y}')
+            self.focus_set()
+            logging.info("配置窗口创建成功")
+        except Exception as e:
+            logging.error(f"配置窗口初始化失败: {e}", exc_info=True)
+            raise
+    
+    def create_widgets(self):
+        # 创建一个包含所有内容的主框架，该框架可滚动
+        # 这样可以确保内容过多时，按钮始终可见
+        main_container = tk.Frame(self)
+        main_container.pack(fill=tk.BOTH, expand=True)
+        
+        # 创建内容部分的画布，可滚动
+        canvas = tk.Canvas(main_container)
+        scrollbar = ttk.Scrollbar(main_container, orient=tk.VERTICAL, command=canvas.yview)
+        
+        # 创建将放置所有控件的可滚动框架
+        main_frame = tk.Frame(canvas)
+        
+        # 配置画布滚动区域
+        main_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        # 设置画布的初始大小和滚动性能参数
+        canvas.configure(width=430, height=550)  # 设置合适的初始大小
+        
+        # 创建画布窗口并放置框架
+        canvas_window = canvas.create_window((0, 0), window=main_frame, anchor="nw")
+        
+        # 当主容器调整大小时，调整画布窗口大小
+        def on_canvas_configure(event):
+            canvas.itemconfig(canvas_window, width=event.width)
+        canvas.bind('<Configure>', on_canvas_configure)
+        
+        # 绑定鼠标滚轮事件
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        
+        # 绑定鼠标滚轮事件到画布
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        
+        # 当离开窗口时解绑鼠标滚轮事件，避免影响其他窗口
+        def _unbind_mousewheel(e):
+            canvas.unbind_all("<MouseWheel>")
+        
+        # 当进入窗口时重新绑定鼠标滚轮事件
+        def _bind_mousewheel(e):
+            canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        
+        # 绑定鼠标进入离开事件
+        #canvas.bind("<Enter>", _bind_mousewheel)
+        #canvas.bind("<Leave>", _unbind_mousewheel)
+        
+        # 绑定鼠标滚轮事件到整个窗口和其子组件
+        self.bind_all("<MouseWheel>", _on_mousewheel)
+
+        # 当窗口关闭时解绑鼠标滚轮事件
+        self.bind("<Destroy>", lambda e: self.unbind_all("<MouseWheel>"))
+
+        # 配置画布和滚动条的关联
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # 放置画布和滚动条
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # 阈值设置区域
+        threshold_frame = tk.LabelFrame(main_frame, text=self.monitor._("threshold_settings"), padx=10, pady=10)
+        threshold_frame.pack(fill=tk.X, pady=5)
+
+        # 严重警告阈值
+        critical_label = tk.Label(threshold_frame, text=self.monitor._("critical_threshold"))
+        critical_label.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        self.critical_threshold = tk.Entry(threshold_frame, width=10)
+        self.critical_threshold.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
+        self.critical_threshold.insert(0, str(self.config.get("critical_threshold", 90)))
+        
+        # 警告阈值
+        warning_label = tk.Label(threshold_frame, text=self.monitor._("warning_threshold"))
+        warning_label.grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        self.warning_threshold = tk.Entry(threshold_frame, width=10)
+        self.warning_threshold.grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
+        self.warning_threshold.insert(0, str(self.config.get("warning_threshold", 75)))
+        
+        # 提示阈值
+        notice_label = tk.Label(threshold_frame, text=self.monitor._("notice_threshold"))
+        notice_label.grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        self.notice_threshold = tk.Entry(threshold_frame, width=10)
+        self.notice_threshold.grid(row=2, column=1, padx=5, pady=5, sticky=tk.W)
+        self.notice_threshold.insert(0, str(self.config.get("notice_threshold", 60)))
+        
+        # 时间设置区域
+        time_frame = tk.LabelFrame(main_frame, text=self.monitor._("time_settings"), padx=10, pady=10)
+        time_frame.pack(fill=tk.X, pady=5)
+        
+        # 检查间隔
+        interval_label = tk.Label(time_frame, text=self.monitor._("check_interval"))
+        interval_label.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        self.check_interval = tk.Entry(time_frame)
+        self.check_interval.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W+tk.E)
+        self.check_interval.insert(0, str(self.config.get("check_interval", 5)))
+
+        # 驱动器选择区域
+        drives_frame = tk.LabelFrame(main_frame, text=self.monitor._("monitor_drives"), padx=10, pady=10)
+        drives_frame.pack(fill=tk.X, pady=5)
+        
+        self.drive_vars = {}
+        
+        # 驱动器复选框 - 监控所有驱动器选项
+        self.all_drives_var = tk.BooleanVar()
+        self.all_drives_var.set(not self.config.get("drives_to_monitor", []))
+        self.all_drives_cb = tk.Checkbutton(drives_frame, text=self.monitor._("monitor_all_drives"), 
+                                          variable=self.all_drives_var, 
+                                          command=self.toggle_drive_selection)
+        self.all_drives_cb.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        # 单独的滚动框架，专门用于显示驱动器列表
+        self.drive_list_frame = tk.Frame(drives_frame)
+        self.drive_list_frame.grid(row=1, column=0, sticky=tk.W+tk.E, padx=5, pady=5)
+        
+        # 驱动器在后台线程中枚举，发现一个添加一个复选框；枚举完成前显示占位提示
+        self.drive_checkbuttons = []  # 保存复选框引用
+        self.drives_loading_label = tk.Label(self.drive_list_frame, text=self.monitor._("drives_loading"))
+        self.drives_loading_label.grid(row=0, column=0, sticky=tk.W, padx=20, pady=2)
+        self.start_drive_enumeration()
+        
+        # 语言设置区域
+        language_frame = tk.LabelFrame(main_frame, text=self.monitor._("language_settings"), padx=10, pady=10)
+        language_frame.pack(fill=tk.X, pady=5)
+
+        self.language_var = tk.StringVar(value=self.config.get("language", "zh_CN"))
+        tk.Radiobutton(language_frame, text="简体中文", variable=self.language_var, value="zh_CN").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        tk.Radiobutton(language_frame, text="English", variable=self.language_var, value="en_US").grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
+
+        # 其他选项区域
+        options_frame = tk.LabelFrame(main_frame, text=self.monitor._("other_options"), padx=10, pady=10)
+        options_frame.pack(fill=tk.X, pady=5)
+        
+        self.silent_mode_var = tk.BooleanVar()
+        self.silent_mode_var.set(self.config.get("silent_mode", False))
+        self.silent_mode_cb = tk.Checkbutton(options_frame, text=self.monitor._("silent_mode"), 
+                                           variable=self.silent_mode_var)
+        self.silent_mode_cb.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        self.startup_var = tk.BooleanVar()
+        self.startup_var.set(self.config.get("run_at_startup", False))
+        self.startup_cb = tk.Checkbutton(options_frame, text=self.monitor._("run_at_startup"), 
+                                       variable=self.startup_var)
+        self.startup_cb.grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        # 按钮区域 - 使用单独的框架确保按钮总是可见
+        button_container = tk.Frame(self)  # 此框架不在滚动区域内，确保始终可见
+        button_container.pack(fill='both', expand=True)
+        button_container.pack_propagate(False)
+        button_container.grid_propagate(False)  # 确保grid布局也不会改变容器大小
+
+        
+        # 分隔线
+        separator = ttk.Separator(button_container, orient='horizontal')
+        separator.pack(fill=tk.X, pady=5)
+        
+        # 按钮区域
+        button_frame = tk.Frame(button_container)
+        button_frame.pack(fill='both', expand=True)
+
+        # 配置button_frame的列权重，确保按钮均匀分布
+        button_frame.columnconfigure(0, weight=1)  # 左边按钮区域
+        button_frame.columnconfigure(1, weight=1)  # 中间间隔
+        button_frame.columnconfigure(2, weight=1)  # 取消按钮区域
+        button_frame.columnconfigure(3, weight=1)  # 保存按钮区域
+        
+        button_frame.rowconfigure(0, weight=1)  # 确保按钮垂直居中
+        # 创建按钮，确保它们足够大并且具有鲜明的颜色
+        apply_button = tk.Button(button_frame, text=self.monitor._("apply"), command=self.apply_config, 
+                       width=15, height=2, bg="#4CAF50", fg="white", 
+                       relief=tk.RAISED, bd=3, font=("Arial", 10, "bold"))
+        apply_button.grid(row=0, column=0, padx=10, pady=5, sticky="ew")
+
+        cancel_button = tk.Button(button_frame, text=self.monitor._("cancel"), command=self.destroy, 
+                        width=15, height=2, font=("Arial", 10, "bold"))
+        cancel_button.grid(row=0, column=2, padx=10, pady=5, sticky="ew")
+
+        save_button = tk.Button(button_frame, text=self.monitor._("save_and_close"), command=self.save_config, 
+                      width=15, height=2, bg="#2196F3", fg="white", 
+                      relief=tk.RAISED, bd=3, font=("Arial", 10, "bold"))
+        save_button.grid(row=0, column=3, padx=10, pady=5, sticky="ew")
+        
+        # 语言切换时需要更新文本的控件
+        self.translatable = [
+            (threshold_frame, "threshold_settings"),
+            (critical_label, "critical_threshold"),
+            (warning_label, "warning_threshold"),
+            (notice_label, "notice_threshold"),
+            (time_frame, "time_settings"),
+            (interval_label, "check_interval"),
+            (drives_frame, "monitor_drives"),
+            (self.all_drives_cb, "monitor_all_drives"),
+            (self.drives_loading_label, "drives_loading"),
+            (language_frame, "language_settings"),
+            (options_frame, "other_options"),
+            (self.silent_mode_cb, "silent_mode"),
+            (self.startup_cb, "run_at_startup"),
+            (apply_button, "apply"),
+            (cancel_button, "cancel"),
+            (save_button, "save_and_close"),
+        ]
+        
+        # 立即更新驱动器选择状态
+        self.toggle_drive_selection()
+
+    def start_drive_enumeration(self):
+        """在后台线程中枚举驱动器，避免卡死的网络挂载点阻塞界面"""
+        threading.Thread(target=self._enumerate_drives, daemon=True).start()
+    
+    def _enumerate_drives(self):
+        """
+        后台线程：逐个发现挂载点并交给少量探测线程读取容量
+
+        结果通过UI队列交给主线程，由 on_drive_event 更新复选框。
+        """
+        ui_queue = self.monitor.ui_queue
+        probe_queue = queue.Queue()
+        
+        def probe_worker():
+            while True:
+                drive = probe_queue.get()
+                if drive is None:
+                    return
+                usage = self.monitor.get_disk_usage(drive)
+                ui_queue.put(("config_drive_event", self, "probed", drive, usage))
+        
+        workers = [threading.Thread(target=probe_worker, daemon=True) for _ in range(DRIVE_PROBE_WORKERS)]
+        for worker in workers:
+            worker.start()
+        try:
+            for drive in self.monitor.iter_available_drives():
+                ui_queue.put(("config_drive_event", self, "found", drive, None))
+                probe_queue.put(drive)
+        except Exception as e:
+            logging.error(f"枚举驱动器时出错: {e}", exc_info=True)
+        finally:
+            for _ in workers:
+                probe_queue.put(None)
+            ui_queue.put(("config_drive_event", self, "done", None, None))
+    
+    def _drive_text(self, drive):
+        """复选框文本：驱动器名加容量信息，探测完成前显示“加载中”"""
+        status = self.drive_status.get(drive)
+        if status is None:
+            return f"{drive}  ({self.monitor._('drive_probing')})"
+        if status is False:
+            return f"{drive}  ({self.monitor._('drive_unavailable')})"
+        return f"{drive}  ({status['total'] / (1024**3):.1f} GB, {status['percent']:.0f}%)"
+    
+    def on_drive_event(self, kind, drive, usage):
+        """在主线程中处理驱动器枚举和探测结果"""
+        if not self.winfo_exists():
+            return
+        if kind == "found" and drive not in self.drive_vars:
+            var = tk.BooleanVar()
+            var.set(drive in self.config.get("drives_to_monitor", []))
+            self.drive_vars[drive] = var
+            cb = tk.Checkbutton(self.drive_list_frame, text=self._drive_text(drive), variable=var)
+            cb.grid(row=len(self.drive_checkbuttons) + 1, column=0, sticky=tk.W, padx=20, pady=2)
+            if self.all_drives_var.get():
+                cb.config(state=tk.DISABLED)
+            self.drive_checkbuttons.append(cb)  # 保存引用
+            self.drive_cb_by_drive[drive] = cb
+        elif kind == "probed":
+            self.drive_status[drive] = usage or False
+            if drive in self.drive_cb_by_drive:
+                self.drive_cb_by_drive[drive].config(text=self._drive_text(drive))
+        elif kind == "done":
+            self.drives_loaded = True
+            self.drives_loading_label.grid_remove()
+            logging.info(f"配置窗口驱动器枚举完成: {list(self.drive_vars)}")
+
+    def toggle_drive_selection(self):
+        """切换所有驱动器选择状态"""
+        all_selected = self.all_drives_var.get()
+        for drive, var in self.drive_vars.items():
+            if all_selected:
+                # 当选择"监控所有驱动器"时，重置所有驱动器的选择状态为未选中
+                var.set(False)
+        
+        for cb in self.drive_checkbuttons:
+            if all_selected:
+                cb.config(state=tk.DISABLED)
+            else:
+                cb.config(state=tk.NORMAL)
+    
+    def apply_config(self):
+        """应用设置但不关闭窗口"""
+        try:
+            # 验证并保存设置
+            if not self._validate_and_save_config():
+                return
+            
+            # 检查语言是否变更，若变更则刷新界面
+            if self.current_language != self.language_var.get():
+                self.refresh_ui()
+                
+            messagebox.showinfo(self.monitor._("success"), self.monitor._("config_applied"))
+            logging.info("用户应用了配置")
+        except Exception as e:
+            logging.error(f"应用配置时出错: {e}")
+            messagebox.showerror(self.monitor._("error"), self.monitor._("error_occurred").format(e))
+        
+    def save_config(self):
+        """验证、保存设置并关闭窗口"""
+        try:
+            # 验证并保存设置
+            if not self._validate_and_save_config():
+                return
+                
+            messagebox.showinfo(self.monitor._("success"), self.monitor._("config_saved"))
+            logging.info("用户保存了配置")
+            self.destroy()
+        except Exception as e:
+            logging.error(f"保存配置时出错: {e}")
+            messagebox.showerror(self.monitor._("error"), self.monitor._("error_occurred").format(e))
+            
+    def refresh_ui(self):
+        """在语言切换后原地更新界面文本，不重建控件，已输入的值和驱动器选择都会保留"""
+        self.current_language = self.language_var.get()
+        for widget, key in self.translatable:
+            widget.config(text=self.monitor._(key))
+        for drive, cb in self.drive_cb_by_drive.items():
+            cb.config(text=self._drive_text(drive))
+        
+        # 更新窗口标题
+        self.title(self.monitor._("settings_title"))
+            
+    def _validate_and_save_config(self):
+        """验证输入并保存配置"""
+        try:
+            # 验证输入值，增强对非数字输入的处理
+            try:
+                # 处理可能的空白字符串或非数字输入
+                critical_str = self.critical_threshold.get().strip()
+                warning_str = self.warning_threshold.get().strip()
+                notice_str = self.notice_threshold.get().strip()
+                
+                if not critical_str or not warning_str or not notice_str:
+                    raise ValueError(self.monitor._("threshold_empty"))
+                
+                critical = int(critical_str)
+                warning = int(warning_str)
+                notice = int(notice_str)
+                
+                if not (0 < notice < warning < critical <= 100):
+                    raise ValueError(self.monitor._("threshold_invalid"))
+                
+                check_interval_str = self.check_interval.get().strip()
+                
+                if not check_interval_str:
+                    raise ValueError(self.monitor._("interval_empty"))
+                
+                try:
+                    check_interval = float(check_interval_str)
+                except ValueError:
+                    raise ValueError(self.monitor._("invalid_number"))
+                
+                if check_interval <= 0:
+                    raise ValueError(self.monitor._("interval_too_small"))
+                
+            except ValueError as e:
+                messagebox.showerror(self.monitor._("input_error"), str(e))
+                return False
+            
+            # 收集配置，保留窗口中未涉及的其他配置项
+            new_config = {
+                **self.monitor.config,
+                "critical_threshold": critical,
+                "warning_threshold": warning,
+                "notice_threshold": notice,
+                "check_interval": check_interval,  # 以分钟为单位
+                "silent_mode": self.silent_mode_var.get(),
+                "run_at_startup": self.startup_var.get(),
+                "language": self.language_var.get()
+            }
+            
+            # 收集驱动器选择
+            if not self.all_drives_var.get():
+                selected_drives = [drive for drive, var in self.drive_vars.items() if var.get()]
+                # 枚举尚未完成时，保留还没出现在列表中的已选驱动器
+                if not self.drives_loaded:
+                    selected_drives += [drive for drive in self.config.get("drives_to_monitor", [])
+                                        if drive not in self.drive_vars]
+                new_config["drives_to_monitor"] = selected_drives
+            else:
+                new_config["drives_to_monitor"] = []
+            
+            # 保存到配置文件
+            with open(self.monitor.config_file, 'w', encoding='utf-8') as f:
+                json.dump(new_config, f, indent=4, ensure_ascii=False)
+            
+            # 更新监视器配置
+            self.monitor.config = new_config
+            self.monitor.apply_config()
+            
+            return True
+        except Exception as e:
+            logging.error(f"验证和保存配置时出错: {e}")
+            messagebox.showerror(self.monitor._("error"), self.monitor._("config_error"))
+            return False
@@ -0,0 +1,229 @@
+"""
+容器存储占用分析模块
+
+读取 Docker overlay2 存储驱动的本地目录，把 /var/lib/docker 的空间
+归属到镜像、容器可写层和命名卷。镜像层是不可变的，其大小按层ID缓存到磁盘，
+每次刷新只需重新统计容器可写层、容器日志和卷。
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+from reclaim import walk_size
+
+DEFAULT_DOCKER_ROOT = "/var/lib/docker"
+
+
+def _read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def chain_ids(diff_ids):
+    """根据镜像的 diff_ids 计算各层的 chain ID（与 layerdb 目录名一致）"""
+    import hashlib
+    chain = []
+    for diff_id in diff_ids:
+        if not chain:
+            chain.append(diff_id)
+        else:
+            digest = hashlib.sha256(f"{chain[-1]} {diff_id}".encode()).hexdigest()
+            chain.append(f"sha256:{digest}")
+    return chain
+
+
+class ContainerUsageAnalyzer:
+    """
+    Docker 存储占用分析器
+
+    layer_cache 保存 {层ID: 字节数}，可持久化到cache_file。
+    """
+
+    def __init__(self, docker_root=DEFAULT_DOCKER_ROOT, cache_file=None):
+        self.docker_root = docker_root
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self.layer_cache = self._load_cache()
+
+    def available(self):
+        """本机是否存在 Docker 数据目录"""
+        return os.path.isdir(self.docker_root)
+
+    def _load_cache(self):
+        if self.cache_file and os.path.exists(self.cache_file):
+            data = _read_json(self.cache_file)
+            if isinstance(data, dict):
+                return data
+        return {}
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        try:
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.layer_cache, f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            logging.error(f"保存镜像层大小缓存失败: {e}")
+
+    def _layer_size(self, layerdb, chain_id):
+        """返回镜像层大小，优先使用缓存和 layerdb 中记录的大小"""
+        layer_id = chain_id.split(":", 1)[-1]
+        with self._lock:
+            if layer_id in self.layer_cache:
+                return self.layer_cache[layer_id]
+        layer_dir = os.path.join(layerdb, "sha256", layer_id)
+        size_text = _read_text(os.path.join(layer_dir, "size"))
+        if size_text and size_text.isdigit():
+            size = int(size_text)
+        else:
+            cache_id = _read_text(os.path.join(layer_dir, "cache-id"))
+            size = walk_size(os.path.join(self.docker_root, "overlay2", cache_id, "diff")) if cache_id else 0
+        with self._lock:
+            self.layer_cache[layer_id] = size
+        return size
+
+    def _image_tags(self):
+        """读取 repositories.json，返回 {镜像ID: [标签]}"""
+        tags = {}
+        data = _read_json(os.path.join(self.docker_root, "image", "overlay2", "repositories.json")) or {}
+        for refs in data.get("Repositories", {}).values():
+            for ref, image_id in refs.items():
+                if "@sha256:" not in ref:
+                    tags.setdefault(image_id, []).append(ref)
+        return tags
+
+    def _analyze_images(self):
+        image_root = os.path.join(self.docker_root, "image", "overlay2")
+        content_dir = os.path.join(image_root, "imagedb", "content", "sha256")
+        layerdb = os.path.join(image_root, "layerdb")
+        tags = self._image_tags()
+
+        images = []
+        layer_users = {}
+        try:
+            image_ids = os.listdir(content_dir)
+        except OSError:
+            return images, 0
+        for image_hex in image_ids:
+            config = _read_json(os.path.join(content_dir, image_hex)) or {}
+            diff_ids = config.get("rootfs", {}).get("diff_ids", [])
+            layers = chain_ids(diff_ids)
+            sizes = {layer: self._layer_size(layerdb, layer) for layer in layers}
+            for layer in layers:
+                layer_users[layer] = layer_users.get(layer, 0) + 1
+            image_id = f"sha256:{image_hex}"
+            images.append({
+                "id": image_id,
+                "tags": tags.get(image_id, []),
+                "size": sum(sizes.values()),
+                "layers": sizes
+            })
+
+        # 只被一个镜像引用的层才算作该镜像独占的空间
+        shared = {layer for layer, users in layer_users.items() if users > 1}
+        for image in images:
+            image["unique_size"] = sum(size for layer, size in image["layers"].items() if layer not in shared)
+            image["layers"] = len(image["layers"])
+        images.sort(key=lambda item: item["size"], reverse=True)
+
+        # 所有镜像实际占用的空间（共享层只计一次），同时清理已删除镜像层的缓存
+        live = {layer.split(":", 1)[-1] for layer in layer_users}
+        with self._lock:
+            self.layer_cache = {layer: size for layer, size in self.layer_cache.items() if layer in live}
+            disk_total = sum(self.layer_cache.values())
+        return images, disk_total
+
+    def _analyze_containers(self):
+        containers = []
+        containers_dir = os.path.join(self.docker_root, "containers")
+        mounts_dir = os.path.join(self.docker_root, "image", "overlay2", "layerdb", "mounts")
+        try:
+            container_ids = os.listdir(containers_dir)
+        except OSError:
+            return containers
+        for container_id in container_ids:
+            config = _read_json(os.path.join(containers_dir, container_id, "config.v2.json")) or {}
+            mount_id = _read_text(os.path.join(mounts_dir, container_id, "mount-id"))
+            writable = 0
+            if mount_id:
+                writable = walk_size(os.path.join(self.docker_root, "overlay2", mount_id, "diff"))
+            containers.append({
+                "id": container_id,
+                "name": config.get("Name", "").lstrip("/"),
+                "image": config.get("Config", {}).get("Image", ""),
+                "writable": writable,
+                "logs": walk_size(os.path.join(containers_dir, container_id))
+            })
+        containers.sort(key=lambda item: item["writable"] + item["logs"], reverse=True)
+        return containers
+
+    def _analyze_volumes(self):
+        volumes = []
+        volumes_dir = os.path.join(self.docker_root, "volumes")
+        try:
+            entries = list(os.scandir(volumes_dir))
+        except OSError:
+            return volumes
+        for entry in entries:
+            data_dir = os.path.join(entry.path, "_data")
+            if entry.is_dir(follow_symlinks=False) and os.path.isdir(data_dir):
+                volumes.append({"name": entry.name, "size": walk_size(data_dir)})
+        volumes.sort(key=lambda item: item["size"], reverse=True)
+        return volumes
+
+    def analyze(self):
+        """
+        统计 Docker 存储占用
+
+        返回:
+            dict: {"driver", "supported", "images", "containers", "volumes", "totals"}
+        """
+        start = time.monotonic()
+        image_dir = os.path.join(self.docker_root, "image")
+        try:
+            drivers = os.listdir(image_dir)
+        except OSError as e:
+            logging.error(f"无法读取 Docker 数据目录 {self.docker_root}: {e}")
+            raise
+        driver = drivers[0] if len(drivers) == 1 else ("overlay2" if "overlay2" in drivers else ",".join(drivers))
+        if driver != "overlay2":
+            logging.warning(f"不支持的 Docker 存储驱动: {driver}")
+            return {"driver": driver, "supported": False, "images": [], "containers": [],
+                    "volumes": [], "totals": {}}
+
+        images, images_total = self._analyze_images()
+        containers = self._analyze_containers()
+        volumes = self._analyze_volumes()
+        self._save_cache()
+
+        result = {
+            "driver": driver,
+            "supported": True,
+            "images": images,
+            "containers": containers,
+            "volumes": volumes,
+            "totals": {
+                "images": images_total,
+                "containers": sum(c["writable"] for c in containers),
+                "logs": sum(c["logs"] for c in containers),
+                "volumes": sum(v["size"] for v in volumes)
+            }
+        }
+        logging.info(f"容器存储统计完成，耗时 {time.monotonic() - start:.2f} 秒: {result['totals']}")
+        return result
@@ -0,0 +1,113 @@
+"""
+网页仪表盘页面
+
+单个静态页面，不依赖外部资源。每隔几秒轮询 /api/status 和 /api/alerts，
+趋势图使用 /api/history 在服务端降采样后的数据，用 SVG 折线绘制。
+浏览器自动带上 If-None-Match，数据没有变化时服务端只返回 304。
+"""
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Simple Disk Monitor</title>
+<style>
+body { font: 14px sans-serif; margin: 16px; color: #222; }
+h1 { font-size: 18px; }
+table { border-collapse: collapse; width: 100%; max-width: 960px; }
+th, td { text-align: left; padding: 4px 8px; border-bottom: 1px solid #ddd; }
+.bar { width: 160px; height: 10px; background: #eee; }
+.bar div { height: 10px; background: #4a90d9; }
+.critical { background: #FFCCCC; }
+.warning { background: #FFFFCC; }
+.notice { background: #CCE5FF; }
+svg { width: 180px; height: 28px; }
+polyline { fill: none; stroke: #005ab4; stroke-width: 1; }
+#meta { color: #777; margin-bottom: 8px; }
+</style>
+</head>
+<body>
+<h1>Simple Disk Monitor</h1>
+<div id="meta"></div>
+<table>
+<thead><tr><th>Drive</th><th>Level</th><th>Usage</th><th></th><th>Free</th><th>Last hour</th></tr></thead>
+<tbody id="drives"></tbody>
+</table>
+<h1>Alerts</h1>
+<table>
+<thead><tr><th>Time</th><th>Drive</th><th>Level</th><th>Usage</th></tr></thead>
+<tbody id="alerts"></tbody>
+</table>
+<script>
+const POLL_MS = 5000, POINTS = 90;
+const GB = 1024 * 1024 * 1024;
+
+function cell(row, text, cls) {
+  const td = row.insertCell();
+  td.textContent = text;
+  if (cls) td.className = cls;
+  return td;
+}
+
+function sparkline(td, drive) {
+  fetch("/api/history?tier=hour&points=" + POINTS + "&drive=" + encodeURIComponent(drive))
+    .then(r => r.ok ? r.json() : null)
+    .then(h => {
+      if (!h || !h.points.length) return;
+      let lo = Infinity, hi = -Infinity;
+      for (const p of h.points) { lo = Math.min(lo, p[1]); hi = Math.max(hi, p[2]); }
+      const span = hi - lo || 1, scale = (h.t1 - h.t0) || 1, coords = [];
+      for (const p of h.points) {
+        const x = ((p[0] - h.t0) / scale * 178 + 1).toFixed(1);
+        coords.push(x + "," + (27 - (p[2] - lo) / span * 26).toFixed(1));
+        coords.push(x + "," + (27 - (p[1] - lo) / span * 26).toFixed(1));
+      }
+      td.innerHTML = '<svg viewBox="0 0 180 28"><polyline points="' + coords.join(" ") + '"/></svg>';
+    });
+}
+
+function refreshStatus() {
+  return fetch("/api/status").then(r => r.ok ? r.json() : null).then(s => {
+    if (!s) return;
+    document.getElementById("meta").textContent =
+      s.time + " \\u00b7 cycle " + (s.cycle.last || 0).toFixed(3) + "s";
+    const body = document.getElementById("drives");
+    body.innerHTML = "";
+    for (const d of s.drives) {
+      const row = body.insertRow();
+      row.className = d.level;
+      cell(row, d.drive);
+      cell(row, d.level);
+      cell(row, d.percent.toFixed(1) + "%");
+      cell(row, "").innerHTML = '<div class="bar"><div style="width:' + Math.min(d.percent, 100) + '%"></div></div>';
+      cell(row, (d.free / GB).toFixed(1) + " GB");
+      sparkline(cell(row, ""), d.drive);
+    }
+  });
+}
+
+function refreshAlerts() {
+  return fetch("/api/alerts?limit=20").then(r => r.ok ? r.json() : null).then(a => {
+    if (!a) return;
+    const body = document.getElementById("alerts");
+    body.innerHTML = "";
+    for (const e of a.alerts) {
+      const row = body.insertRow();
+      row.className = e.level;
+      cell(row, e.time);
+      cell(row, e.drive);
+      cell(row, e.previous + " \\u2192 " + e.level);
+      cell(row, e.percent.toFixed(1) + "%");
+    }
+  });
+}
+
+function poll() {
+  Promise.all([refreshStatus(), refreshAlerts()]).catch(() => {}).then(() => setTimeout(poll, POLL_MS));
+}
+poll();
+</script>
+</body>
+</html>
+""".encode("utf-8")
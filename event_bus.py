@@ -0,0 +1,242 @@
+"""
+Unix 域套接字上的事件订阅
+
+本机的其他程序连接 event_socket 配置的套接字后，先发送一行JSON说明要订阅的事件，
+之后每个事件以一行JSON推送给它（与 --watch 的 NDJSON 格式相同）：
+
+    {"types": ["transition", "error"], "drives": ["/data"], "levels": ["warning", "critical"]}
+
+三个字段都可以省略，省略表示不过滤；连接后 SUBSCRIBE_TIMEOUT 秒内没有发送任何内容时订阅全部事件。
+事件类型为 sample（每轮检查每个驱动器一条）、transition（级别变化）和 error（探测失败）。
+服务端先回复一条 subscribed 记录；订阅内容无法解析时回复 rejected 记录并断开。
+
+每个订阅者有自己的有界队列和写出线程（NDJSONWriter），读得慢的订阅者只会丢掉自己最旧的事件，
+不会阻塞监控线程，也不会影响其他订阅者。
+"""
+
+import os
+import json
+import stat
+import socket
+import logging
+import threading
+
+from ndjson_stream import NDJSONWriter
+
+EVENT_TYPES = ("sample", "transition", "error")
+# 等待订阅内容的时间（秒）
+SUBSCRIBE_TIMEOUT = 1.0
+# 订阅内容的最大长度
+MAX_SUBSCRIPTION_SIZE = 4096
+# 每个订阅者的队列容量
+QUEUE_SIZE = 1000
+MAX_SUBSCRIBERS = 32
+
+
+class Subscription:
+    """订阅条件，None 表示该项不过滤"""
+
+    def __init__(self, types=None, drives=None, levels=None):
+        self.types = set(types) if types else set(EVENT_TYPES)
+        self.drives = set(drives) if drives else None
+        self.levels = set(levels) if levels else None
+
+    @classmethod
+    def parse(cls, line):
+        """解析客户端发送的订阅行，空行表示订阅全部事件；格式错误时抛出 ValueError"""
+        line = line.strip()
+        if not line:
+            return cls()
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("subscription must be a JSON object")
+        fields = {}
+        for key in ("types", "drives", "levels"):
+            value = request.get(key)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                raise ValueError(f"{key} must be a list of strings")
+            fields[key] = value
+        unknown = set(fields.get("types", ())) - set(EVENT_TYPES)
+        if unknown:
+            raise ValueError(f"unknown event types: {', '.join(sorted(unknown))}")
+        return cls(**fields)
+
+    def matches(self, record):
+        if record["type"] not in self.types:
+            return False
+        if self.drives is not None and record.get("drive") not in self.drives:
+            return False
+        # error 记录没有级别，按级别过滤时也照常推送
+        if self.levels is not None and "level" in record and record["level"] not in self.levels:
+            return False
+        return True
+
+    def describe(self):
+        return {"types": sorted(self.types),
+                "drives": sorted(self.drives) if self.drives is not None else None,
+                "levels": sorted(self.levels) if self.levels is not None else None}
+
+
+class EventBus:
+    """
+    监控事件的监听器：把事件分发给 Unix 套接字上的订阅者
+
+    参数:
+        path (str): 套接字路径
+        queue_size (int): 每个订阅者的队列容量，满时丢弃最旧的事件
+        max_subscribers (int): 同时连接的订阅者上限
+    """
+
+    def __init__(self, path, queue_size=QUEUE_SIZE, max_subscribers=MAX_SUBSCRIBERS):
+        self.path = path
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.subscribers = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self):
+        """创建套接字并开始接受连接；套接字已被其他进程使用时抛出 OSError"""
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform")
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        self._remove_stale_socket()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self.path)
+            # 事件中包含挂载点和使用情况，只允许当前用户连接
+            os.chmod(self.path, 0o600)
+            server.listen(8)
+        except OSError:
+            server.close()
+            raise
+        self._server = server
+        threading.Thread(target=self._accept_loop, args=(server,), name="event-bus", daemon=True).start()
+        logging.info(f"事件订阅套接字已启动: {self.path}")
+
+    def _remove_stale_socket(self):
+        """删除上次异常退出留下的套接字文件；路径不是套接字或仍有进程在监听时报错"""
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        # 配置写错路径时不能删掉用户的普通文件
+        if not stat.S_ISSOCK(mode):
+            raise OSError(f"{self.path} exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise OSError(f"{self.path} is already in use")
+
+    def _accept_loop(self, server):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                # stop() 关闭了监听套接字
+                return
+            threading.Thread(target=self._subscribe, args=(conn,), name="event-bus-subscribe",
+                             daemon=True).start()
+
+    def _read_subscription(self, conn):
+        conn.settimeout(SUBSCRIBE_TIMEOUT)
+        data = b""
+        try:
+            while b"\n" not in data and len(data) < MAX_SUBSCRIPTION_SIZE:
+                chunk = conn.recv(MAX_SUBSCRIPTION_SIZE)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.timeout:
+            pass
+        finally:
+            conn.settimeout(None)
+        return data.split(b"\n", 1)[0].decode("utf-8", "replace")
+
+    def _subscribe(self, conn):
+        stream = conn.makefile("w", encoding="utf-8", newline="\n")
+        try:
+            subscription = Subscription.parse(self._read_subscription(conn))
+        except (ValueError, OSError) as e:
+            self._reject(conn, stream, str(e))
+            return
+        entry = {"conn": conn, "stream": stream, "subscription": subscription}
+        with self._lock:
+            accepted = self._server is not None and len(self.subscribers) < self.max_subscribers
+            if accepted:
+                entry["writer"] = NDJSONWriter(stream, maxsize=self.queue_size,
+                                               on_closed=lambda: self._remove(entry))
+                entry["writer"].put(dict(subscription.describe(), type="subscribed"))
+                self.subscribers.append(entry)
+        if not accepted:
+            self._reject(conn, stream, "too many subscribers")
+            return
+        logging.info(f"新的事件订阅者: {subscription.describe()}")
+
+    def _reject(self, conn, stream, reason):
+        try:
+            stream.write(json.dumps({"type": "rejected", "reason": reason}, ensure_ascii=False) + "\n")
+            stream.flush()
+        except OSError:
+            pass
+        self._close_connection(conn, stream)
+
+    def _close_connection(self, conn, stream):
+        try:
+            # 先 shutdown，写出线程阻塞在发送上时也能立即返回
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        for resource in (stream, conn):
+            try:
+                resource.close()
+            except OSError:
+                pass
+
+    def _remove(self, entry):
+        with self._lock:
+            if entry not in self.subscribers:
+                return
+            self.subscribers.remove(entry)
+        self._close_connection(entry["conn"], entry["stream"])
+        logging.info("事件订阅者已断开")
+
+    def __call__(self, record):
+        if record["type"] not in EVENT_TYPES:
+            return
+        with self._lock:
+            subscribers = list(self.subscribers)
+        for entry in subscribers:
+            if entry["subscription"].matches(record):
+                entry["writer"].put(record)
+
+    def stop(self):
+        """关闭监听套接字，写出各订阅者队列中剩余的事件后断开"""
+        with self._lock:
+            server, self._server = self._server, None
+            subscribers, self.subscribers = self.subscribers, []
+        if server is None:
+            return
+        try:
+            server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        for entry in subscribers:
+            entry["writer"].close(timeout=0.5)
+            self._close_connection(entry["conn"], entry["stream"])
@@ -0,0 +1,108 @@
+"""
+无界面（守护进程）模式
+
+在 Linux 服务器上运行同一个监控核心：不导入 tkinter / pystray / PIL，
+报警通过 alert_sinks 输出，由信号控制:
+    SIGTERM / SIGINT  停止
+    SIGHUP            重新加载配置
+转发来的 --reload 通过 request_reload() 走与 SIGHUP 相同的路径，在主线程中与其串行执行。
+配合 systemd 的 Type=notify 时通过 NOTIFY_SOCKET 报告就绪、重新加载和停止状态。
+"""
+
+import os
+import signal
+import socket
+import logging
+import threading
+
+# serve() 运行期间把重新加载请求交给主线程的函数
+_reload_request = None
+
+
+def sd_notify(state):
+    """向 systemd 发送状态通知；不在 systemd 下运行时什么也不做"""
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        # 抽象命名空间套接字
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode("utf-8"))
+        return True
+    except OSError as e:
+        logging.warning(f"通知 systemd 失败: {e}")
+        return False
+
+
+def request_reload():
+    """
+    从其他线程请求重新加载配置，由 serve() 的主线程执行
+
+    返回:
+        bool: serve() 没有在运行时返回 False，调用者需要自己重新加载
+    """
+    request = _reload_request
+    if request is None:
+        return False
+    request()
+    return True
+
+
+def serve(monitor):
+    """
+    启动监控并在主线程中等待信号，直到收到停止信号
+
+    在支持 sigwait 的平台上，启动任何线程之前先屏蔽信号，主线程同步等待，
+    因此信号不会打断监控线程，也不需要异步信号处理函数。
+    """
+    global _reload_request
+    stop_signals = {signal.SIGTERM, signal.SIGINT}
+    reload_signals = {signal.SIGHUP} if hasattr(signal, "SIGHUP") else set()
+
+    try:
+        if hasattr(signal, "sigwait"):
+            signal.pthread_sigmask(signal.SIG_BLOCK, stop_signals | reload_signals)
+            # 向主线程发送 SIGHUP：它已被屏蔽，由下面的 sigwait 取走
+            main_thread = threading.main_thread().ident
+            _reload_request = lambda: signal.pthread_kill(main_thread, signal.SIGHUP)
+            monitor.start_monitoring()
+            sd_notify("READY=1")
+            logging.info(f"无界面模式已启动，PID {os.getpid()}")
+            while True:
+                signum = signal.sigwait(stop_signals | reload_signals)
+                if signum in reload_signals:
+                    _reload(monitor)
+                else:
+                    logging.info(f"收到信号 {signal.Signals(signum).name}，停止监控")
+                    break
+        else:
+            # Windows 没有 sigwait，由信号处理函数设置标志，主线程每秒检查一次
+            state = {"stop": False}
+            reload_requested = threading.Event()
+            _reload_request = reload_requested.set
+            for signum in stop_signals:
+                signal.signal(signum, lambda s, f: state.update(stop=True))
+            monitor.start_monitoring()
+            logging.info(f"无界面模式已启动，PID {os.getpid()}")
+            while not state["stop"]:
+                if reload_requested.wait(1):
+                    reload_requested.clear()
+                    _reload(monitor)
+    finally:
+        _reload_request = None
+
+    sd_notify("STOPPING=1")
+    monitor.shutdown()
+
+
+def _reload(monitor):
+    logging.info("收到重新加载请求（SIGHUP 或 --reload），重新加载配置")
+    sd_notify("RELOADING=1")
+    try:
+        monitor.reload_config()
+    except Exception as e:
+        logging.error(f"重新加载配置失败: {e}", exc_info=True)
+    sd_notify("READY=1")
@@ -0,0 +1,147 @@
+"""
+磁盘使用量历史模块
+
+按驱动器保存已用空间的历史样本，分为多个分辨率的环形缓冲区：
+    hour  每分钟一个点，保留1小时
+    day   每15分钟一个点，保留1天
+    week  每小时一个点，保留1周
+每个点记录该时间段内的最小值、最大值和最后一个值，内存占用固定，
+可用于计算增长速度和绘制趋势图。
+downsample_minmax 把历史点按列降采样，趋势图和网页接口共用。
+"""
+
+import time
+import threading
+from collections import deque
+
+# (名称, 每个点的秒数, 点数)
+TIERS = (
+    ("hour", 60, 60),
+    ("day", 900, 96),
+    ("week", 3600, 168),
+)
+# 计算增长速度时要求的最短时间跨度（秒），太短的跨度噪声过大
+MIN_GROWTH_SPAN = 60
+
+
+def downsample_minmax(points, width, t0, t1):
+    """
+    把历史点按时间映射到像素列，每列保留最小值和最大值
+
+    参数:
+        points (list): [(时间, 最小值, 最大值, 最后值)]，按时间升序
+        width (int): 像素列数
+        t0, t1 (float): 图的时间范围
+
+    返回:
+        list: [(列, 最小值, 最大值)]，只包含有数据的列，按列升序
+    """
+    if width <= 0 or t1 <= t0:
+        return []
+    scale = (width - 1) / (t1 - t0)
+    cols, lows, highs = [], [], []
+    last = -1
+    for ts, low, high, _ in points:
+        if ts < t0 or ts > t1:
+            continue
+        col = int((ts - t0) * scale)
+        if col == last:
+            if low < lows[-1]:
+                lows[-1] = low
+            if high > highs[-1]:
+                highs[-1] = high
+        else:
+            cols.append(col)
+            lows.append(low)
+            highs.append(high)
+            last = col
+    return list(zip(cols, lows, highs))
+
+
+class UsageHistory:
+    """
+    多分辨率的已用空间历史
+
+    所有方法都是线程安全的。
+    """
+
+    def __init__(self, tiers=TIERS):
+        self.tiers = tiers
+        self._lock = threading.Lock()
+        # {tier名称: {drive: deque([时间段起点, 最小值, 最大值, 最后值, 最后值时间])}}
+        self._series = {name: {} for name, _, _ in tiers}
+        # {drive: (时间, 已用字节, 总字节)}
+        self._latest = {}
+
+    def record(self, drive, used, total, ts=None):
+        """记录一个样本"""
+        ts = ts if ts is not None else time.time()
+        with self._lock:
+            self._latest[drive] = (ts, used, total)
+            for name, resolution, capacity in self.tiers:
+                points = self._series[name].get(drive)
+                if points is None:
+                    points = self._series[name][drive] = deque(maxlen=capacity)
+                slot = ts - ts % resolution
+                if points and points[-1][0] == slot:
+                    point = points[-1]
+                    point[1] = min(point[1], used)
+                    point[2] = max(point[2], used)
+                    point[3] = used
+                    point[4] = ts
+                else:
+                    points.append([slot, used, used, used, ts])
+
+    def latest(self, drive):
+        """返回最近一个样本 (时间, 已用字节, 总字节)，没有样本时返回None"""
+        with self._lock:
+            return self._latest.get(drive)
+
+    def series(self, drive, tier="hour"):
+        """
+        返回指定分辨率的历史点
+
+        返回:
+            list: [(时间段起点, 最小值, 最大值, 最后值)]，按时间升序
+        """
+        with self._lock:
+            points = self._series[tier].get(drive, ())
+            return [(p[0], p[1], p[2], p[3]) for p in points]
+
+    def growth_rate(self, drive, window=3600):
+        """
+        返回最近window秒内的平均增长速度（字节/秒）
+
+        使用能覆盖该时间跨度的最细分辨率；历史不足window时使用已有的全部历史，
+        跨度不足 MIN_GROWTH_SPAN 时返回None。
+        """
+        with self._lock:
+            latest = self._latest.get(drive)
+            if latest is None:
+                return None
+            now, used_now, _ = latest
+            start = now - window
+            for name, resolution, capacity in self.tiers:
+                points = self._series[name].get(drive)
+                if not points:
+                    continue
+                # 未写满的缓冲区包含全部历史，也可以直接使用
+                if points[0][0] <= start or len(points) < capacity or name == self.tiers[-1][0]:
+                    break
+            for point in points:
+                if point[4] >= start:
+                    then, used_then = point[4], point[3]
+                    break
+            else:
+                return None
+        span = now - then
+        if span < MIN_GROWTH_SPAN:
+            return None
+        return (used_now - used_then) / span
+
+    def forget(self, drive):
+        """删除驱动器的全部历史（驱动器被移除时调用）"""
+        with self._lock:
+            self._latest.pop(drive, None)
+            for series in self._series.values():
+                series.pop(drive, None)
@@ -25,6 +25,9 @@ TRANSLATIONS = {
         "check_interval": "检查间隔 (分钟):",
         "monitor_drives": "监控驱动器",
         "monitor_all_drives": "监控所有驱动器",
+        "drives_loading": "正在查找驱动器…",
+        "drive_probing": "加载中…",
+        "drive_unavailable": "无法访问",
         "language_settings": "语言设置 / Language Settings",
         "other_options": "其他选项",
         "silent_mode": "静默模式 (不显示弹窗提示)",
@@ -48,6 +51,92 @@ TRANSLATIONS = {
         "total_space": "总空间",
         "used_space": "已使用",
         "free_space": "剩余空间",
+        "reclaimable_now": "当前可回收",
+        "level": "级别",
+        "level_normal": "正常",
+        "level_notice": "提示",
+        "level_warning": "警告",
+        "level_critical": "严重",
+        "growth_per_hour": "增长速度",
+        "latency_p99": "延迟 p99",
+        "trend": "趋势",
+        "trend_range": "趋势范围:",
+        "trend_no_data": "暂无历史数据",
+        "range_hour": "最近一小时",
+        "range_day": "最近一天",
+        "range_week": "最近一周",
+        "level_latency": "响应缓慢",
+        "tray_tooltip_line": "{} {:.0f}% {}",
+        "tray_tooltip_more": "另有 {} 个驱动器",
+        "sink_alert_line": "磁盘 {} {}: 使用率 {:.1f}%，剩余 {:.2f} GB",
+        "sink_latency_line": "磁盘 {} 响应缓慢: p99 {:.0f} ms",
+        "sink_resolved_line": "磁盘 {} 的{}报警已解除，当前使用率 {:.1f}%",
+        "forward_check_now": "已请求立即检查",
+        "forward_open_settings": "已请求打开设置窗口",
+        "forward_reload": "已请求重新加载配置",
+        "forward_no_settings": "无界面模式没有设置窗口",
+
+        # 报警汇总窗口
+        "digest_title": "磁盘报警汇总（{} 条）",
+        "digest_recheck": "重新检查",
+        "digest_acknowledge": "确认选中项",
+        "compression_saved": "压缩已节省",
+        "reclaim_tmp": "临时文件",
+        "reclaim_pip_cache": "pip 缓存",
+        "reclaim_npm_cache": "npm 缓存",
+        "reclaim_apt_cache": "apt 缓存",
+        "reclaim_journald": "journald 日志",
+        "reclaim_core_dumps": "核心转储",
+        "reclaim_rotated_logs": "轮转日志",
+        "reclaim_trash": "回收站",
+        "reclaim_update_cache": "系统更新缓存",
+
+        # 年龄报告
+        "age_report": "年龄分析",
+        "age_report_title": "文件年龄报告",
+        "age_report_summary": "共 {} 个文件，{:.2f} GB；其中 90 天以上未使用的冷数据 {:.2f} GB ({:.1f}%)",
+        "age_axis_mtime": "修改时间",
+        "age_axis_atime": "访问时间",
+        "age_axis_last_use": "最后使用",
+        "export_csv": "导出CSV",
+        "csv_exported": "已导出到 {}",
+        "category_documents": "文档",
+        "category_images": "图片",
+        "category_video": "视频",
+        "category_audio": "音频",
+        "category_archives": "压缩包",
+        "category_code": "代码",
+        "category_logs": "日志",
+        "category_databases": "数据库",
+        "category_executables": "程序",
+        "category_other": "其他",
+
+        # 容器存储
+        "container_usage": "容器存储",
+        "container_images": "镜像",
+        "container_writable": "容器可写层和日志",
+        "container_volumes": "命名卷",
+        "container_image_detail": "独占 {}，{} 层",
+        "container_detail": "镜像 {}，可写层 {}，日志 {}",
+        "container_driver_unsupported": "暂不支持 {} 存储驱动",
+        "name": "名称",
+        "size": "大小",
+        "detail": "详情",
+        "refresh": "刷新",
+
+        # 响应延迟
+        "latency_title": "磁盘响应缓慢",
+        "latency_message": "磁盘 {} 响应延迟超过阈值:",
+        "latency_line": "  {}: p50 {:.1f} ms, p99 {:.1f} ms, 最大 {:.1f} ms（{} 个样本）",
+        "latency_short": "{} 延迟 p50/p99: {:.1f}/{:.1f} ms",
+
+        # 自动清理
+        "cleanup_title": "自动清理",
+        "cleanup_preview": "磁盘 {} 清理预览（未删除任何文件）:\n将删除 {} 个文件，可回收 {:.2f} GB",
+        "cleanup_confirm": "执行删除",
+        "cleanup_confirm_prompt": "确认后才会删除这些文件。",
+        "cleanup_pending_headless": "如果下一轮检查时计划没有变化，将执行删除。",
+        "cleanup_done": "磁盘 {} 自动清理完成:\n删除 {} 个文件，回收 {:.2f} GB，耗时 {:.1f} 秒，失败 {} 个",
 
         # 警告窗口
         "notice_title": "磁盘空间提示",
@@ -58,10 +147,23 @@ TRANSLATIONS = {
         "critical_message": "严重警告: 磁盘 {} 使用率达到 {:.1f}%！\n\n总空间: {:.2f} GB\n已使用: {:.2f} GB\n剩余空间: {:.2f} GB\n\n请立即清理磁盘空间！",
         "warning_confirm": "是否已经知晓磁盘 {} 详细状态？",
         "clean_confirm": "确定",
+        "top_writers_header": "当前写入最多的进程:",
+        "ballast_released": "已自动释放 {:.2f} GB 压舱文件空间，请尽快清理磁盘。",
+        "top_writer_line": "  {} (PID {}): {:.1f} MB/s",
 
         # 托盘菜单
         "check_now": "立即检查磁盘",
         "settings": "配置设置",
+        "self_usage": "资源占用",
+
+        # 自身资源占用
+        "self_cpu": "CPU",
+        "self_rss": "内存",
+        "self_threads": "线程数",
+        "self_fds": "文件句柄",
+        "self_usage_line": "{}: {}（预算 {}）",
+        "self_level": "降级级别: {}（0 表示正常）",
+        "governor_paused": "监控程序自身资源占用超出预算，已暂停可选的扫描任务。",
         "exit": "退出",
 
         # 错误消息
@@ -90,6 +192,9 @@ TRANSLATIONS = {
         "check_interval": "Check Interval (minutes):",
         "monitor_drives": "Monitor Drives",
         "monitor_all_drives": "Monitor All Drives",
+        "drives_loading": "Discovering drives…",
+        "drive_probing": "loading…",
+        "drive_unavailable": "unavailable",
         "language_settings": "Language Settings / 语言设置",
         "other_options": "Other Options",
         "silent_mode": "Silent Mode (No Popups)",
@@ -113,6 +218,92 @@ TRANSLATIONS = {
         "total_space": "Total Space",
         "used_space": "Used",
         "free_space": "Free Space",
+        "reclaimable_now": "Reclaimable now",
+        "level": "Level",
+        "level_normal": "Normal",
+        "level_notice": "Notice",
+        "level_warning": "Warning",
+        "level_critical": "Critical",
+        "growth_per_hour": "Growth",
+        "latency_p99": "Latency p99",
+        "trend": "Trend",
+        "trend_range": "Trend range:",
+        "trend_no_data": "No history yet",
+        "range_hour": "Last hour",
+        "range_day": "Last day",
+        "range_week": "Last week",
+        "level_latency": "Slow",
+        "tray_tooltip_line": "{} {:.0f}% {}",
+        "tray_tooltip_more": "{} more drives",
+        "sink_alert_line": "Drive {} {}: {:.1f}% used, {:.2f} GB free",
+        "sink_latency_line": "Drive {} is slow: p99 {:.0f} ms",
+        "sink_resolved_line": "Drive {} {} alert resolved, now {:.1f}% used",
+        "forward_check_now": "Check requested",
+        "forward_open_settings": "Settings window requested",
+        "forward_reload": "Configuration reload requested",
+        "forward_no_settings": "There is no settings window in headless mode",
+
+        # Alert digest window
+        "digest_title": "Disk Alerts ({})",
+        "digest_recheck": "Recheck",
+        "digest_acknowledge": "Acknowledge Selected",
+        "compression_saved": "Saved by compression",
+        "reclaim_tmp": "Temp files",
+        "reclaim_pip_cache": "pip cache",
+        "reclaim_npm_cache": "npm cache",
+        "reclaim_apt_cache": "apt cache",
+        "reclaim_journald": "journald logs",
+        "reclaim_core_dumps": "Core dumps",
+        "reclaim_rotated_logs": "Rotated logs",
+        "reclaim_trash": "Trash",
+        "reclaim_update_cache": "Update cache",
+
+        # Age report
+        "age_report": "Age Report",
+        "age_report_title": "File Age Report",
+        "age_report_summary": "{} files, {:.2f} GB; cold data unused for 90+ days: {:.2f} GB ({:.1f}%)",
+        "age_axis_mtime": "Modified",
+        "age_axis_atime": "Accessed",
+        "age_axis_last_use": "Last Used",
+        "export_csv": "Export CSV",
+        "csv_exported": "Exported to {}",
+        "category_documents": "Documents",
+        "category_images": "Images",
+        "category_video": "Video",
+        "category_audio": "Audio",
+        "category_archives": "Archives",
+        "category_code": "Code",
+        "category_logs": "Logs",
+        "category_databases": "Databases",
+        "category_executables": "Executables",
+        "category_other": "Other",
+
+        # Container storage
+        "container_usage": "Container Storage",
+        "container_images": "Images",
+        "container_writable": "Container writable layers and logs",
+        "container_volumes": "Named volumes",
+        "container_image_detail": "{} unique, {} layers",
+        "container_detail": "image {}, writable {}, logs {}",
+        "container_driver_unsupported": "The {} storage driver is not supported",
+        "name": "Name",
+        "size": "Size",
+        "detail": "Details",
+        "refresh": "Refresh",
+
+        # Latency
+        "latency_title": "Slow Disk Response",
+        "latency_message": "Drive {} is responding slower than the threshold:",
+        "latency_line": "  {}: p50 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms ({} samples)",
+        "latency_short": "{} latency p50/p99: {:.1f}/{:.1f} ms",
+
+        # Automatic cleanup
+        "cleanup_title": "Automatic Cleanup",
+        "cleanup_preview": "Cleanup preview for drive {} (nothing deleted):\n{} files would be deleted, freeing {:.2f} GB",
+        "cleanup_confirm": "Delete",
+        "cleanup_confirm_prompt": "Nothing is deleted until you confirm.",
+        "cleanup_pending_headless": "The files will be deleted at the next check if the plan is unchanged.",
+        "cleanup_done": "Cleanup of drive {} finished:\n{} files deleted, {:.2f} GB reclaimed in {:.1f} s, {} failed",
 
         # Alert windows
         "notice_title": "Disk Space Notice",
@@ -123,10 +314,23 @@ TRANSLATIONS = {
         "critical_message": "Critical Warning: Drive {} usage is at {:.1f}%!\n\nTotal: {:.2f} GB\nUsed: {:.2f} GB\nFree: {:.2f} GB\n\nPlease free up disk space immediately!",
         "warning_confirm": "Are you aware of the disk {} status details?",
         "clean_confirm": "Confirm",
+        "top_writers_header": "Top writing processes:",
+        "ballast_released": "Released {:.2f} GB of ballast space automatically. Please free up space soon.",
+        "top_writer_line": "  {} (PID {}): {:.1f} MB/s",
 
         # Tray menu
         "check_now": "Check Disks Now",
         "settings": "Settings",
+        "self_usage": "Resource Usage",
+
+        # Self resource usage
+        "self_cpu": "CPU",
+        "self_rss": "Memory",
+        "self_threads": "Threads",
+        "self_fds": "Open handles",
+        "self_usage_line": "{}: {} (budget {})",
+        "self_level": "Degradation level: {} (0 means normal)",
+        "governor_paused": "The monitor is over its own resource budget; optional scans are paused.",
         "exit": "Exit",
 
         # Error messages
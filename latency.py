@@ -0,0 +1,226 @@
+"""
+文件系统响应延迟统计模块
+
+对每个挂载点的 statvfs 调用以及可选的小文件写入+fsync探测计时，
+记录到固定桶的 HDR 风格直方图中（对数-线性分桶，记录为 O(1)），
+用于计算 p50/p99 等分位数并在延迟超过阈值时报警。
+"""
+
+import os
+import time
+import logging
+import threading
+
+# 每个数量级内的子桶位数：32个子桶，相对误差约3%
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS // 2
+# 可记录的最大值（微秒），约19小时，超出的值记在最后一个桶
+MAX_VALUE_BITS = 36
+BUCKET_COUNT = SUB_BUCKETS + (MAX_VALUE_BITS - SUB_BUCKET_BITS) * HALF_SUB_BUCKETS
+
+PROBE_FILE_NAME = ".disk_monitor_probe"
+
+
+def bucket_index(value):
+    """返回微秒值所在桶的下标"""
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    exponent = value.bit_length() - SUB_BUCKET_BITS
+    index = SUB_BUCKETS + (exponent - 1) * HALF_SUB_BUCKETS + ((value >> exponent) - HALF_SUB_BUCKETS)
+    return min(index, BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index):
+    """返回桶所覆盖的最大微秒值"""
+    if index < SUB_BUCKETS:
+        return index
+    exponent = (index - SUB_BUCKETS) // HALF_SUB_BUCKETS + 1
+    mantissa = (index - SUB_BUCKETS) % HALF_SUB_BUCKETS + HALF_SUB_BUCKETS
+    return ((mantissa + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """固定桶的延迟直方图，单位为微秒"""
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.total = 0
+        self.max_value = 0
+        self.sum = 0
+
+    def record(self, micros):
+        micros = int(micros)
+        self.counts[bucket_index(micros)] += 1
+        self.total += 1
+        self.sum += micros
+        if micros > self.max_value:
+            self.max_value = micros
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            if count:
+                self.counts[i] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.max_value = max(self.max_value, other.max_value)
+
+    def percentile(self, p):
+        """返回第p百分位的延迟（微秒），没有样本时返回None"""
+        if not self.total:
+            return None
+        target = max(1, int(self.total * p / 100.0 + 0.999999))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_upper_bound(i), self.max_value)
+        return self.max_value
+
+
+class WindowedHistogram:
+    """
+    滑动窗口直方图
+
+    保留当前窗口和上一个窗口，分位数基于两者合并计算，
+    因此反映的是最近一到两个窗口的延迟，而不是启动以来的累计值。
+    """
+
+    def __init__(self, window_seconds=300):
+        self.window_seconds = window_seconds
+        self.current = LatencyHistogram()
+        self.previous = LatencyHistogram()
+        self.window_start = time.monotonic()
+
+    def _rotate(self, now):
+        if now - self.window_start >= self.window_seconds:
+            # 超过两个窗口没有样本时上一个窗口也已过期
+            expired = now - self.window_start >= 2 * self.window_seconds
+            self.previous = LatencyHistogram() if expired else self.current
+            self.current = LatencyHistogram()
+            self.window_start = now
+
+    def record(self, micros):
+        self._rotate(time.monotonic())
+        self.current.record(micros)
+
+    def snapshot(self):
+        self._rotate(time.monotonic())
+        merged = LatencyHistogram()
+        merged.merge(self.previous)
+        merged.merge(self.current)
+        return merged
+
+
+class LatencyTracker:
+    """
+    按挂载点和探测类型（statvfs / write）记录延迟
+
+    所有方法都是线程安全的。
+    """
+
+    KINDS = ("statvfs", "write")
+
+    def __init__(self, window_seconds=300):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._errors = {}
+        # 正在进行的写入探测: {drive: 开始时间}
+        self._inflight = {}
+        # 探测失败时调用 on_error(drive, kind, error)，可能在探测线程中调用
+        self.on_error = None
+
+    def record(self, drive, kind, seconds):
+        with self._lock:
+            histogram = self._histograms.get((drive, kind))
+            if histogram is None:
+                histogram = self._histograms[(drive, kind)] = WindowedHistogram(self.window_seconds)
+            histogram.record(seconds * 1_000_000)
+
+    def record_error(self, drive, kind, error=None):
+        with self._lock:
+            self._errors[(drive, kind)] = self._errors.get((drive, kind), 0) + 1
+        if self.on_error:
+            self.on_error(drive, kind, error)
+
+    def errors(self, drive, kind):
+        with self._lock:
+            return self._errors.get((drive, kind), 0)
+
+    def error_counts(self):
+        """返回所有挂载点的累计错误数 {(drive, kind): 次数}"""
+        with self._lock:
+            return dict(self._errors)
+
+    def timed(self, drive, kind, func, *args):
+        """调用func并记录耗时，异常会记为错误后继续抛出"""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as e:
+            self.record_error(drive, kind, e)
+            raise
+        finally:
+            self.record(drive, kind, time.perf_counter() - start)
+
+    def summary(self, drive):
+        """
+        返回挂载点的延迟摘要
+
+        返回:
+            dict: {kind: {"count", "p50_ms", "p99_ms", "max_ms", "errors"}}，没有样本的类型不出现
+        """
+        result = {}
+        with self._lock:
+            items = [(kind, self._histograms.get((drive, kind))) for kind in self.KINDS]
+            snapshots = [(kind, h.snapshot()) for kind, h in items if h is not None]
+        for kind, histogram in snapshots:
+            if not histogram.total:
+                continue
+            result[kind] = {
+                "count": histogram.total,
+                "p50_ms": histogram.percentile(50) / 1000.0,
+                "p99_ms": histogram.percentile(99) / 1000.0,
+                "max_ms": histogram.max_value / 1000.0,
+                "errors": self.errors(drive, kind)
+            }
+        return result
+
+    def probe_write(self, drive, directory):
+        """在目录中写入一个小文件并fsync，记录耗时"""
+        path = os.path.join(directory, PROBE_FILE_NAME)
+        start = time.perf_counter()
+        try:
+            with open(path, "wb") as f:
+                f.write(b"disk monitor probe\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.remove(path)
+        except OSError as e:
+            logging.warning(f"磁盘 {drive} 写入探测失败: {e}")
+            self.record_error(drive, "write", e)
+        finally:
+            self.record(drive, "write", time.perf_counter() - start)
+            with self._lock:
+                self._inflight.pop(drive, None)
+
+    def start_write_probes(self, probe_dirs, timeout=10.0):
+        """
+        为每个配置了探测目录的挂载点启动一次后台写入探测
+
+        挂载点卡死时探测线程可能长时间不返回：此时不再重复启动，
+        而是把已等待的时间作为一个样本记录，使分位数能反映出异常。
+        """
+        now = time.perf_counter()
+        for drive, directory in probe_dirs.items():
+            with self._lock:
+                started = self._inflight.get(drive)
+                if started is None:
+                    self._inflight[drive] = now
+            if started is not None:
+                if now - started >= timeout:
+                    logging.warning(f"磁盘 {drive} 写入探测已等待 {now - started:.1f} 秒")
+                    self.record(drive, "write", now - started)
+                continue
+            threading.Thread(target=self.probe_write, args=(drive, directory), daemon=True).start()
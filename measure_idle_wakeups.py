@@ -0,0 +1,99 @@
+"""
+测量UI队列在空闲时的唤醒次数和任务延迟
+
+对比旧的100毫秒 after() 轮询与事件驱动唤醒（ui_wakeup）：
+空闲若干秒，统计队列处理函数被调用的次数、进程的自愿上下文切换次数和CPU时间；
+然后从后台线程放入一些任务，统计从入队到主线程处理的延迟。
+
+用法:
+    python measure_idle_wakeups.py [--seconds 10] [--tasks 20]
+需要图形界面环境（Tk 需要显示器）。
+"""
+
+import time
+import queue
+import argparse
+import threading
+import tkinter as tk
+
+import psutil
+
+from ui_wakeup import WakeupQueue, attach
+
+
+def measure(mode, seconds, tasks):
+    root = tk.Tk()
+    root.withdraw()
+    ui_queue = WakeupQueue() if mode == "event" else queue.Queue()
+    stats = {"calls": 0, "latencies": []}
+
+    def handler():
+        stats["calls"] += 1
+        while True:
+            try:
+                put_time = ui_queue.get(block=False)
+            except queue.Empty:
+                break
+            stats["latencies"].append(time.perf_counter() - put_time)
+
+    if mode == "event":
+        detach = attach(root, ui_queue, handler)
+    else:
+        def poll():
+            handler()
+            root.after(100, poll)
+        root.after(100, poll)
+        detach = None
+
+    process = psutil.Process()
+
+    def producer():
+        # 先空闲，再以较低频率放入任务
+        time.sleep(seconds)
+        before.update(snapshot())
+        for _ in range(tasks):
+            time.sleep(0.05)
+            ui_queue.put(time.perf_counter())
+        time.sleep(0.5)
+        root.after(0, root.quit)
+
+    def snapshot():
+        cpu = process.cpu_times()
+        return {"calls": stats["calls"], "ctx": process.num_ctx_switches().voluntary,
+                "cpu": cpu.user + cpu.system, "time": time.perf_counter()}
+
+    start = snapshot()
+    before = {}
+    threading.Thread(target=producer, daemon=True).start()
+    root.mainloop()
+    if detach:
+        detach()
+    root.destroy()
+
+    idle = before["time"] - start["time"]
+    latencies = sorted(stats["latencies"])
+    return {
+        "mode": mode,
+        "idle_calls_per_sec": (before["calls"] - start["calls"]) / idle,
+        "idle_ctx_switches_per_sec": (before["ctx"] - start["ctx"]) / idle,
+        "idle_cpu_ms_per_sec": (before["cpu"] - start["cpu"]) * 1000 / idle,
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else None,
+        "latency_max_ms": latencies[-1] * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量UI队列空闲唤醒次数")
+    parser.add_argument("--seconds", type=float, default=10, help="空闲测量时长（秒）")
+    parser.add_argument("--tasks", type=int, default=20, help="空闲后放入的任务数")
+    args = parser.parse_args()
+
+    print(f"{'模式':<8}{'调用/秒':>10}{'上下文切换/秒':>16}{'CPU ms/秒':>12}{'延迟p50 ms':>12}{'延迟max ms':>12}")
+    for mode in ("poll", "event"):
+        r = measure(mode, args.seconds, args.tasks)
+        print(f"{r['mode']:<8}{r['idle_calls_per_sec']:>10.2f}{r['idle_ctx_switches_per_sec']:>16.2f}"
+              f"{r['idle_cpu_ms_per_sec']:>12.3f}{r['latency_p50_ms']:>12.2f}{r['latency_max_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
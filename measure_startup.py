@@ -0,0 +1,112 @@
+"""
+用 python -X importtime 测量启动时的导入耗时
+
+每次测量都在新的子进程中导入模块，取多次运行的中位数；先运行一次预热，
+确保 .pyc 已生成，编译时间不计入结果。
+同时检查导入后是否加载了界面相关的模块（tkinter、PIL、pystray）。
+
+用法:
+    python measure_startup.py [--runs 7] [--top 15] [--baseline REV]
+--baseline 把指定的 git 版本导出到临时目录，在同样的条件下测量，便于对比。
+没有图形界面的环境可以设置 PYSTRAY_BACKEND=dummy。
+"""
+
+import os
+import sys
+import shutil
+import tarfile
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+MODULE = "simple_disk_monitor"
+UI_MODULES = ("tkinter", "PIL", "pystray")
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 的输出
+
+    返回:
+        dict: {模块名: (自身耗时微秒, 累计耗时微秒)}，同名模块只保留第一次
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        times.setdefault(name, (int(parts[0]), int(parts[1])))
+    return times
+
+
+def run_once(cwd, module):
+    """在新进程中导入模块，返回 (导入耗时, 已加载的界面模块)"""
+    code = (f"import sys; import {module}; "
+            f"print(','.join(m for m in {UI_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    ui = [m for m in result.stdout.strip().split(",") if m]
+    return parse_importtime(result.stderr), ui
+
+
+def measure(cwd, module, runs):
+    run_once(cwd, module)  # 预热，生成 .pyc
+    samples = [run_once(cwd, module) for _ in range(runs)]
+    totals = [times[module][1] for times, _ in samples]
+    # 各模块取中位数最接近的那次运行的明细
+    median = statistics.median(totals)
+    times, ui = min(samples, key=lambda s: abs(s[0][module][1] - median))
+    return {"total_ms": median / 1000, "min_ms": min(totals) / 1000, "times": times, "ui": ui}
+
+
+def export_revision(rev, target):
+    """把 git 版本导出到临时目录"""
+    archive = os.path.join(target, "rev.tar")
+    subprocess.run(["git", "archive", "--format=tar", "-o", archive, rev], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    with tarfile.open(archive) as tar:
+        tar.extractall(target)
+    os.remove(archive)
+
+
+def report(label, result, top):
+    print(f"{label}: 导入 {MODULE} 中位数 {result['total_ms']:.1f} ms（最快 {result['min_ms']:.1f} ms），"
+          f"界面模块: {', '.join(result['ui']) or '无'}")
+    ranked = sorted(result["times"].items(), key=lambda kv: kv[1][1], reverse=True)
+    print(f"  {'模块':<40}{'自身 ms':>10}{'累计 ms':>10}")
+    for name, (self_us, cumulative_us) in ranked[:top]:
+        print(f"  {name:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量启动导入耗时")
+    parser.add_argument("--runs", type=int, default=7, help="测量次数，取中位数")
+    parser.add_argument("--top", type=int, default=15, help="列出累计耗时最多的模块数")
+    parser.add_argument("--baseline", help="对比的 git 版本，例如 HEAD~1")
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    current = measure(here, MODULE, args.runs)
+    report("当前版本", current, args.top)
+
+    if args.baseline:
+        tmp = tempfile.mkdtemp(prefix="startup_baseline_")
+        try:
+            export_revision(args.baseline, tmp)
+            baseline = measure(tmp, MODULE, args.runs)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print()
+        report(f"基线 {args.baseline}", baseline, args.top)
+        saved = baseline["total_ms"] - current["total_ms"]
+        print(f"\n导入耗时减少 {saved:.1f} ms（{saved / baseline['total_ms'] * 100:.0f}%）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Prometheus 文本格式的指标端点
+
+监控线程每轮检查结束后发布一条 cycle 记录，MetricsExporter 据此重新生成完整的响应体并原子地替换。
+HTTP 处理线程只返回这份预先生成的字节串：抓取不会触发任何磁盘探测，
+抓取频率再高，每次的成本也只是一次内存拷贝。
+"""
+
+import time
+import logging
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LEVEL_VALUES = {"normal": 0, "notice": 1, "warning": 2, "critical": 3}
+
+# (指标名, 类型, 说明, 使用情况中的字段)
+USAGE_METRICS = (
+    ("disk_monitor_filesystem_size_bytes", "gauge", "Filesystem size in bytes.", "total"),
+    ("disk_monitor_filesystem_used_bytes", "gauge", "Filesystem space used in bytes.", "used"),
+    ("disk_monitor_filesystem_avail_bytes", "gauge", "Filesystem space available to non-root users in bytes.", "free"),
+    ("disk_monitor_filesystem_used_percent", "gauge", "Filesystem space used, as shown in alerts.", "percent"),
+    ("disk_monitor_filesystem_inodes", "gauge", "Total inodes.", "inodes_total"),
+    ("disk_monitor_filesystem_inodes_used", "gauge", "Inodes in use.", "inodes_used"),
+    ("disk_monitor_filesystem_inodes_free", "gauge", "Inodes available to non-root users.", "inodes_free"),
+)
+
+
+def escape_label(value):
+    """按文本格式的规则转义标签值"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value) if value == value else "NaN"
+    return str(value)
+
+
+def render(cycle, error_counts=None):
+    """
+    把一轮检查的结果生成 Prometheus 文本
+
+    参数:
+        cycle (dict): 监控线程发布的 cycle 记录
+        error_counts (dict): {(挂载点, 探测类型): 累计错误数}
+
+    返回:
+        bytes: 完整的响应体
+    """
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        if not samples:
+            return
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels)
+            lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text
+                         else f"{name} {_format_value(value)}")
+
+    drives = cycle.get("drives", [])
+    for name, kind, help_text, field in USAGE_METRICS:
+        family(name, kind, help_text, [((("mount", d["drive"]),), d["usage"][field])
+                                       for d in drives if d["usage"].get(field) is not None])
+    family("disk_monitor_alert_level", "gauge", "Alert level: 0 normal, 1 notice, 2 warning, 3 critical.",
+           [((("mount", d["drive"]),), LEVEL_VALUES.get(d["level"], 0)) for d in drives])
+
+    latency = []
+    counts = []
+    for d in drives:
+        for probe, stats in sorted(d.get("latency", {}).items()):
+            for quantile, key in (("0.5", "p50_ms"), ("0.99", "p99_ms")):
+                latency.append(((("mount", d["drive"]), ("probe", probe), ("quantile", quantile)),
+                                stats[key] / 1000.0))
+            counts.append(((("mount", d["drive"]), ("probe", probe)), stats["count"]))
+    family("disk_monitor_probe_latency_seconds", "gauge",
+           "Probe latency quantiles over the latency window.", latency)
+    family("disk_monitor_probe_samples", "gauge", "Probe samples in the latency window.", counts)
+    family("disk_monitor_probe_errors_total", "counter", "Failed probes since start.",
+           [((("mount", drive), ("probe", probe)), count)
+            for (drive, probe), count in sorted((error_counts or {}).items())])
+
+    thresholds = cycle.get("thresholds", {})
+    family("disk_monitor_threshold_percent", "gauge", "Configured alert thresholds.",
+           [((("level", level),), value) for level, value in sorted(thresholds.items())])
+
+    stats = cycle.get("cycle_stats", {})
+    if stats:
+        lines.append("# HELP disk_monitor_cycle_duration_seconds Time spent in monitor cycles.")
+        lines.append("# TYPE disk_monitor_cycle_duration_seconds summary")
+        lines.append(f"disk_monitor_cycle_duration_seconds_sum {_format_value(float(stats['sum']))}")
+        lines.append(f"disk_monitor_cycle_duration_seconds_count {stats['count']}")
+        family("disk_monitor_last_cycle_duration_seconds", "gauge", "Duration of the most recent cycle.",
+               [((), float(stats["last"]))])
+        family("disk_monitor_last_cycle_timestamp_seconds", "gauge", "Unix time the most recent cycle finished.",
+               [((), float(stats["finished"]))])
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class MetricsExporter:
+    """
+    监控事件的监听器：收到 cycle 记录时重新生成响应体
+
+    参数:
+        error_counts (callable): 返回 {(挂载点, 探测类型): 累计错误数}
+    """
+
+    def __init__(self, error_counts=None):
+        self.error_counts = error_counts
+        # 第一轮检查完成之前只有说明注释
+        self.body = b"# disk monitor: waiting for the first cycle\n"
+        self.updated = None
+
+    def __call__(self, record):
+        if record["type"] != "cycle":
+            return
+        errors = self.error_counts() if self.error_counts else None
+        # 引用赋值是原子的，处理线程总能拿到一份完整的响应体
+        self.body = render(record, errors)
+        self.updated = time.time()
+
+
+def start_server(exporter, host="127.0.0.1", port=9101):
+    """
+    在后台线程中启动 HTTP 服务，GET /metrics 返回预先生成的指标
+
+    返回:
+        ThreadingHTTPServer: 调用 shutdown() 和 server_close() 停止
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = exporter.body
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 默认每次请求都写到标准错误，抓取频繁时没有意义
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logging.info(f"指标端点已启动: http://{host}:{server.server_address[1]}/metrics")
+    return server
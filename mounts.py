@@ -0,0 +1,111 @@
+"""
+挂载点发现和容量读取
+
+只依赖标准库（非 Linux 平台读取分区列表时才导入 psutil），
+供监控核心和一次性检查（quick_check.py）共用同一套过滤规则。
+"""
+
+import os
+import sys
+from collections import namedtuple
+
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+
+# 不是真实存储的伪文件系统目录
+PSEUDO_PREFIXES = ("/proc", "/sys", "/dev", "/run")
+
+# 容器运行时产生的挂载点，监控它们没有意义且数量可能非常多
+CONTAINER_FSTYPES = ("overlay", "aufs", "nsfs")
+CONTAINER_MOUNT_PREFIXES = (
+    "/var/lib/docker/",
+    "/var/lib/containerd/",
+    "/var/lib/kubelet/pods/",
+    "/run/containerd/",
+    "/run/docker/",
+)
+
+
+def is_container_mount(mountpoint, fstype):
+    """判断分区是否为容器运行时创建的挂载点"""
+    # 在容器内运行时根目录本身就是overlay，不能被隐藏
+    if fstype in CONTAINER_FSTYPES and mountpoint != "/":
+        return True
+    return any(mountpoint.startswith(prefix) for prefix in CONTAINER_MOUNT_PREFIXES)
+
+
+def is_monitorable(mountpoint, fstype, hide_container_mounts=True):
+    """判断挂载点是否应该被监控：排除伪文件系统，可选排除容器挂载点"""
+    if not mountpoint:
+        return False
+    if hide_container_mounts and is_container_mount(mountpoint, fstype):
+        return False
+    return not any(mountpoint.startswith(p) for p in PSEUDO_PREFIXES)
+
+
+def _unescape(field):
+    """/proc/self/mounts 中的空格等字符以八进制转义，例如 \\040"""
+    if "\\" not in field:
+        return field
+    out, i = [], 0
+    while i < len(field):
+        if field[i] == "\\" and field[i + 1:i + 4].isdigit():
+            out.append(chr(int(field[i + 1:i + 4], 8)))
+            i += 4
+        else:
+            out.append(field[i])
+            i += 1
+    return "".join(out)
+
+
+def read_partitions():
+    """
+    返回所有分区（相当于 psutil.disk_partitions(all=True)）
+
+    Linux 上直接读取 /proc/self/mounts，不需要导入 psutil。
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/mounts", "r", encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = None
+        if lines is not None:
+            partitions = []
+            for line in lines:
+                fields = line.split()
+                if len(fields) >= 4:
+                    partitions.append(Partition(_unescape(fields[0]), _unescape(fields[1]), fields[2], fields[3]))
+            return partitions
+    import psutil
+    return [Partition(p.device, p.mountpoint, p.fstype, p.opts) for p in psutil.disk_partitions(all=True)]
+
+
+def disk_usage(path):
+    """
+    返回容量和 inode 使用情况
+
+    容量的计算与 psutil.disk_usage 一致；没有 statvfs 的平台（Windows）inode 字段为 None。
+    """
+    if not hasattr(os, "statvfs"):
+        import psutil
+        usage = psutil.disk_usage(path)
+        return {"total": usage.total, "used": usage.used, "free": usage.free, "percent": usage.percent,
+                "inodes_total": None, "inodes_used": None, "inodes_free": None, "inodes_percent": None}
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    # 与 df 一致：普通用户可用的空间作为分母
+    total_user = used + free
+    inodes_used = st.f_files - st.f_ffree
+    inodes_user = inodes_used + st.f_favail
+    return {
+        "total": total,
+        "used": used,
+        "free": free,
+        "percent": round(used / total_user * 100, 1) if total_user else 0.0,
+        "inodes_total": st.f_files,
+        "inodes_used": inodes_used,
+        "inodes_free": st.f_favail,
+        "inodes_percent": round(inodes_used / inodes_user * 100, 1) if inodes_user else 0.0,
+    }
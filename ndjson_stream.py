@@ -0,0 +1,142 @@
+"""
+NDJSON 输出（--watch）
+
+监控线程每轮检查发布一条 sample 记录（每个驱动器一条），级别变化时发布一条 transition 记录。
+WatchStream 按选定的字段裁剪记录，可选只输出发生变化的样本，然后交给 NDJSONWriter。
+
+NDJSONWriter 在独立线程中写出，每行刷新一次。监控线程只把记录放入有界队列，
+下游（日志采集器）读得慢时丢弃最旧的记录，并在恢复后输出一条 dropped 记录说明丢了多少，
+因此写出永远不会阻塞监控线程。
+"""
+
+import os
+import json
+import queue
+import signal
+import logging
+import threading
+
+# --changes-only 且没有指定 --fields 时用于判断样本是否变化的字段
+DEFAULT_CHANGE_FIELDS = ("level", "percent")
+# 判断变化时忽略的字段
+VOLATILE_FIELDS = ("type", "time", "host", "drive")
+
+
+def project(record, fields):
+    """只保留选定的字段；type 和级别变化的 previous 总是保留，便于下游区分记录"""
+    if not fields:
+        return record
+    projected = {key: record[key] for key in ("type", "previous") if key in record}
+    for field in fields:
+        if field in record:
+            projected[field] = record[field]
+    return projected
+
+
+class ChangeFilter:
+    """按驱动器记住上一次输出的样本，只有比较字段变化时才放行"""
+
+    def __init__(self, fields=None):
+        fields = [f for f in (fields or DEFAULT_CHANGE_FIELDS) if f not in VOLATILE_FIELDS]
+        self.fields = fields or list(DEFAULT_CHANGE_FIELDS)
+        self.last = {}
+
+    def should_emit(self, record):
+        key = tuple(record.get(field) for field in self.fields)
+        drive = record.get("drive")
+        if self.last.get(drive) == key:
+            return False
+        self.last[drive] = key
+        return True
+
+
+class NDJSONWriter:
+    """
+    后台线程写出 NDJSON 的有界队列
+
+    参数:
+        stream: 输出流，例如 sys.stdout
+        maxsize (int): 队列容量，满时丢弃最旧的记录
+        on_closed (callable): 下游关闭（例如管道断开）后调用一次
+    """
+
+    def __init__(self, stream, maxsize=1000, on_closed=None):
+        self.stream = stream
+        self.queue = queue.Queue(maxsize)
+        self.on_closed = on_closed
+        self.dropped = 0
+        self.closed = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="ndjson-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        """放入一条记录，不会阻塞"""
+        if self.closed.is_set():
+            return
+        with self._lock:
+            while True:
+                try:
+                    self.queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.stream.flush()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            try:
+                with self._lock:
+                    dropped, self.dropped = self.dropped, 0
+                if dropped:
+                    self._write({"type": "dropped", "count": dropped})
+                self._write(record)
+            except (BrokenPipeError, ValueError, OSError) as e:
+                # 下游已关闭，之后的记录都不再写出
+                logging.warning(f"NDJSON 输出已关闭: {e}")
+                self.closed.set()
+                if self.on_closed:
+                    self.on_closed()
+                return
+
+    def close(self, timeout=2.0):
+        """写完队列中剩余的记录后结束写出线程"""
+        if not self.closed.is_set():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                # 下游一直没有读取，放弃最旧的一条以便结束写出线程
+                self.put(None)
+            self._thread.join(timeout)
+        self.closed.set()
+
+
+class WatchStream:
+    """监控事件的监听器：裁剪字段、过滤未变化的样本，然后交给写出线程"""
+
+    def __init__(self, writer, fields=None, changes_only=False):
+        self.writer = writer
+        self.fields = fields
+        self.filter = ChangeFilter(fields) if changes_only else None
+
+    def __call__(self, record):
+        if record["type"] not in ("sample", "transition"):
+            return
+        if record["type"] == "sample" and self.filter and not self.filter.should_emit(record):
+            return
+        self.writer.put(project(record, self.fields))
+
+
+def stop_process():
+    """下游关闭后让无界面模式的主循环退出（主线程在 sigwait 中等待 SIGTERM）"""
+    os.kill(os.getpid(), signal.SIGTERM)
@@ -0,0 +1,181 @@
+"""
+进程写入归因模块
+
+在磁盘跨越阈值或出现写入突增时，对各进程的累计写入字节数做两次快照，
+用差值找出当前写入最多的进程，并尽可能将其映射到受影响的驱动器。
+稳态下不做任何采样，只有监控线程检测到状态跳变时才会调用。
+"""
+
+import os
+import sys
+import time
+import logging
+
+import psutil
+
+PROC_ROOT = "/proc"
+
+
+def _read_proc_write_bytes():
+    """
+    直接解析 /proc/<pid>/io 读取所有进程的 write_bytes
+
+    返回:
+        dict: {pid: write_bytes}，无权限读取的进程会被跳过
+    """
+    result = {}
+    for entry in os.scandir(PROC_ROOT):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(os.path.join(entry.path, "io"), "rb") as f:
+                for line in f:
+                    if line.startswith(b"write_bytes:"):
+                        result[int(entry.name)] = int(line.split()[1])
+                        break
+        except (OSError, ValueError, IndexError):
+            # 进程已退出或无权限读取
+            continue
+    return result
+
+
+def _read_psutil_write_bytes():
+    """通过 psutil 批量读取所有进程的写入字节数（非 Linux 平台使用）"""
+    result = {}
+    for proc in psutil.process_iter(["io_counters"]):
+        counters = proc.info.get("io_counters")
+        if counters is not None:
+            result[proc.pid] = counters.write_bytes
+    return result
+
+
+def snapshot_write_bytes():
+    """获取所有进程的累计写入字节数快照"""
+    if sys.platform.startswith("linux") and os.path.exists(os.path.join(PROC_ROOT, "self", "io")):
+        return _read_proc_write_bytes()
+    return _read_psutil_write_bytes()
+
+
+def compute_write_deltas(before, after):
+    """
+    计算两次快照之间各进程的写入增量
+
+    参数:
+        before (dict): 第一次快照 {pid: write_bytes}
+        after (dict): 第二次快照 {pid: write_bytes}
+
+    返回:
+        dict: {pid: delta}，只包含增量大于0的进程
+    """
+    deltas = {}
+    for pid, written in after.items():
+        # 新出现的进程没有基准值，无法判断窗口内写入了多少，直接忽略
+        previous = before.get(pid)
+        if previous is None:
+            continue
+        delta = written - previous
+        if delta > 0:
+            deltas[pid] = delta
+    return deltas
+
+
+def match_drive(path, drives):
+    """
+    按最长前缀匹配找出路径所在的驱动器
+
+    返回:
+        str: 匹配到的驱动器挂载点，找不到时返回None
+    """
+    if not path:
+        return None
+    normalized = os.path.normcase(path) + os.sep
+    best = None
+    for drive in drives:
+        prefix = os.path.normcase(drive)
+        if not prefix.endswith(("\\", "/")):
+            prefix += os.sep
+        if normalized.startswith(prefix) and (best is None or len(drive) > len(best)):
+            best = drive
+    return best
+
+
+def _process_drives(pid, drives):
+    """根据进程打开的文件和工作目录推断它正在写入的驱动器"""
+    found = set()
+    try:
+        proc = psutil.Process(pid)
+        paths = [f.path for f in proc.open_files()]
+        try:
+            paths.append(proc.cwd())
+        except (psutil.Error, OSError):
+            pass
+    except (psutil.Error, OSError):
+        return []
+    for path in paths:
+        drive = match_drive(path, drives)
+        if drive:
+            found.add(drive)
+    return sorted(found)
+
+
+def _process_name(pid):
+    """获取进程名，失败时返回空字符串"""
+    try:
+        return psutil.Process(pid).name()
+    except (psutil.Error, OSError):
+        return ""
+
+
+class ProcessWriteSampler:
+    """
+    进程写入采样器
+
+    只在被调用时做一次短时间窗口的采样，不常驻后台线程。
+    """
+
+    def __init__(self, sample_seconds=1.0, top_n=5):
+        self.sample_seconds = sample_seconds
+        self.top_n = top_n
+
+    def sample(self, drives=None):
+        """
+        采样当前写入最多的进程
+
+        参数:
+            drives (list): 用于归因的驱动器挂载点列表
+
+        返回:
+            list: 按写入速率降序排列的字典列表，
+                  包含 pid、name、write_bytes、rate(字节/秒)、drives
+        """
+        drives = drives or []
+        try:
+            start = time.monotonic()
+            before = snapshot_write_bytes()
+            time.sleep(self.sample_seconds)
+            after = snapshot_write_bytes()
+            elapsed = max(time.monotonic() - start, 1e-6)
+        except Exception as e:
+            logging.error(f"采样进程写入量时出错: {e}", exc_info=True)
+            return []
+
+        deltas = compute_write_deltas(before, after)
+        top = sorted(deltas.items(), key=lambda item: item[1], reverse=True)[:self.top_n]
+
+        writers = []
+        for pid, delta in top:
+            writers.append({
+                "pid": pid,
+                "name": _process_name(pid),
+                "write_bytes": delta,
+                "rate": delta / elapsed,
+                "drives": _process_drives(pid, drives)
+            })
+        logging.info(f"写入最多的进程: {[(w['name'], w['pid'], w['write_bytes']) for w in writers]}")
+        return writers
+
+
+def writers_for_drive(writers, drive):
+    """优先返回能归因到指定驱动器的进程，如果没有则返回全部采样结果"""
+    matched = [w for w in writers if drive in w["drives"]]
+    return matched or writers
@@ -0,0 +1,162 @@
+"""
+一次性检查（--check）
+
+读取一次所有监控的驱动器，以JSON输出使用率、级别和 inode，然后按最严重的级别退出:
+    0  正常或提示
+    1  警告
+    2  严重
+    3  有驱动器无法读取（超时或出错），且没有严重级别
+退出码与 Nagios/Icinga 插件的约定一致，可以直接用于 cron、监控代理和命令行提示符。
+
+这条路径会被频繁调用，因此只导入标准库和 mounts.py：不创建托盘、Tk 根窗口，
+不检查单例，不写日志文件，也不会在配置文件不存在时创建它。
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+from mounts import read_partitions, is_monitorable, disk_usage
+
+EXIT_CODES = {"normal": 0, "notice": 0, "warning": 1, "critical": 2}
+EXIT_UNKNOWN = 3
+
+
+def default_config_file():
+    """与监控程序相同的默认配置文件位置"""
+    if sys.platform == "win32":
+        base_dir = os.environ.get("APPDATA") or os.path.expanduser("~")
+        app_data_dir = os.path.join(base_dir, "SimpleDiskMonitor")
+    else:
+        app_data_dir = os.path.expanduser("~/.SimpleDiskMonitor")
+    return os.path.join(app_data_dir, "simple_disk_monitor_config.json")
+
+
+def load_config(path):
+    """只读地加载配置；文件不存在或格式错误时使用默认值"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def level_for(percent, config):
+    """按配置的阈值确定级别，与监控线程的判断一致"""
+    if percent >= config.get("critical_threshold", 90):
+        return "critical"
+    if percent >= config.get("warning_threshold", 75):
+        return "warning"
+    if percent >= config.get("notice_threshold", 60):
+        return "notice"
+    return "normal"
+
+
+def select_drives(config, partitions, requested=None):
+    """
+    返回要检查的 [(挂载点, 文件系统类型)]
+
+    requested 为命令行指定的驱动器，否则使用配置中的 drives_to_monitor，二者都为空时检查所有驱动器。
+    """
+    hide_container_mounts = config.get("hide_container_mounts", True)
+    available = {}
+    for part in partitions:
+        if is_monitorable(part.mountpoint, part.fstype, hide_container_mounts):
+            available.setdefault(part.mountpoint, part.fstype)
+    wanted = requested or config.get("drives_to_monitor", [])
+    if not wanted:
+        return list(available.items())
+    # 命令行指定的路径即使不是挂载点也照样检查
+    if requested:
+        return [(drive, available.get(drive, "")) for drive in wanted]
+    return [(drive, available[drive]) for drive in wanted if drive in available]
+
+
+def probe(drives, timeout):
+    """
+    并行读取各驱动器的容量，超过 timeout 秒仍未返回的驱动器（例如卡死的网络挂载点）记为超时
+
+    返回:
+        dict: {挂载点: 使用情况字典 或 {"error": 原因}}
+    """
+    results = {}
+
+    def worker(drive):
+        try:
+            results[drive] = disk_usage(drive)
+        except OSError as e:
+            results[drive] = {"error": e.strerror or str(e)}
+
+    # 只有一个驱动器时同样放在守护线程中读取，卡死的挂载点也不会让检查超过 timeout
+    threads = [threading.Thread(target=worker, args=(drive,), daemon=True) for drive in drives]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+    # 返回副本，超时后才返回的线程不会再改动结果
+    return {drive: results.get(drive, {"error": "timeout"}) for drive in drives}
+
+
+def run_check(config, requested=None, timeout=5.0):
+    """
+    执行一次检查
+
+    返回:
+        tuple: (报告字典, 退出码)
+    """
+    drives = select_drives(config, read_partitions(), requested)
+    usages = probe([drive for drive, _ in drives], timeout)
+    entries = []
+    worst = 0
+    unknown = False
+    for drive, fstype in drives:
+        usage = usages[drive]
+        entry = {"drive": drive, "fstype": fstype}
+        if "error" in usage:
+            entry.update(level="unknown", error=usage["error"])
+            unknown = True
+        else:
+            level = level_for(usage["percent"], config)
+            entry.update(level=level, **usage)
+            worst = max(worst, EXIT_CODES[level])
+        entries.append(entry)
+    if worst == EXIT_CODES["critical"] or not unknown:
+        code = worst
+    else:
+        code = EXIT_UNKNOWN
+    status = {0: "ok", 1: "warning", 2: "critical", EXIT_UNKNOWN: "unknown"}[code]
+    report = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "status": status,
+        "exit_code": code,
+        "thresholds": {level: config.get(f"{level}_threshold", default)
+                       for level, default in (("critical", 90), ("warning", 75), ("notice", 60))},
+        "drives": entries,
+    }
+    return report, code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="一次性检查磁盘使用情况，以JSON输出并按最严重的级别返回退出码")
+    parser.add_argument("--check", action="store_true", help="一次性检查（默认）")
+    parser.add_argument("--config", help="配置文件路径")
+    parser.add_argument("--drive", action="append", help="只检查指定的驱动器，可重复")
+    parser.add_argument("--timeout", type=float, default=5.0, help="单个驱动器的读取超时（秒）")
+    parser.add_argument("--pretty", action="store_true", help="缩进输出")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config or default_config_file())
+    report, code = run_check(config, args.drive, args.timeout)
+    # 打包为无控制台程序时 stdout 为 None，此时只返回退出码
+    if sys.stdout is not None:
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2 if args.pretty else None) + "\n")
+        sys.stdout.flush()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+可回收空间分析模块
+
+内置常见的可清理位置目录（包管理器缓存、临时目录、journald、
+核心转储、轮转日志和回收站），使用有界线程池并发统计各位置大小，
+按驱动器汇总“当前可回收”空间。结果带TTL缓存，重复打开状态窗口时直接返回。
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from process_io import match_drive
+
+# 轮转日志文件名模式: app.log.1, app.log.2.gz, syslog.old 等
+ROTATED_LOG_PATTERN = re.compile(r".*\.(\d+|old|gz|xz|bz2|zst)$")
+
+
+def _expand(path):
+    """展开用户目录和环境变量，未定义的环境变量视为不可用"""
+    expanded = os.path.expandvars(os.path.expanduser(path))
+    if "%" in expanded or "$" in expanded:
+        return None
+    return expanded
+
+
+def default_catalog(drives=()):
+    """
+    返回当前平台内置的可回收位置目录
+
+    参数:
+        drives (iterable): 已知驱动器，用于生成每个驱动器上的回收站路径
+
+    返回:
+        list: [{"category": 类别, "path": 路径, "pattern": 文件名正则或None}]
+    """
+    if sys.platform == "win32":
+        entries = [
+            ("tmp", "%TEMP%", None),
+            ("tmp", "%SystemRoot%\\Temp", None),
+            ("pip_cache", "%LOCALAPPDATA%\\pip\\Cache", None),
+            ("npm_cache", "%LOCALAPPDATA%\\npm-cache", None),
+            ("npm_cache", "%APPDATA%\\npm-cache", None),
+            ("core_dumps", "%LOCALAPPDATA%\\CrashDumps", None),
+            ("update_cache", "%SystemRoot%\\SoftwareDistribution\\Download", None),
+        ]
+        entries += [("trash", os.path.join(drive, "$Recycle.Bin"), None) for drive in drives]
+    elif sys.platform == "darwin":
+        entries = [
+            ("tmp", "/private/tmp", None),
+            ("pip_cache", "~/Library/Caches/pip", None),
+            ("npm_cache", "~/.npm/_cacache", None),
+            ("core_dumps", "/cores", None),
+            ("rotated_logs", "/private/var/log", ROTATED_LOG_PATTERN),
+            ("trash", "~/.Trash", None),
+        ]
+    else:
+        entries = [
+            ("tmp", "/tmp", None),
+            ("tmp", "/var/tmp", None),
+            ("pip_cache", "~/.cache/pip", None),
+            ("npm_cache", "~/.npm/_cacache", None),
+            ("apt_cache", "/var/cache/apt/archives", None),
+            ("journald", "/var/log/journal", None),
+            ("core_dumps", "/var/lib/systemd/coredump", None),
+            ("core_dumps", "/var/crash", None),
+            ("rotated_logs", "/var/log", ROTATED_LOG_PATTERN),
+            ("trash", "~/.local/share/Trash", None),
+        ]
+
+    catalog = []
+    seen = set()
+    for category, path, pattern in entries:
+        expanded = _expand(path)
+        if not expanded or expanded in seen:
+            continue
+        seen.add(expanded)
+        catalog.append({"category": category, "path": expanded, "pattern": pattern})
+    return catalog
+
+
+def _entry_size(stat_result):
+    """返回文件实际占用的磁盘空间，不支持st_blocks的平台退回到文件大小"""
+    blocks = getattr(stat_result, "st_blocks", None)
+    if blocks is not None:
+        return blocks * 512
+    return stat_result.st_size
+
+
+def walk_size(path, pattern=None, max_entries=200000):
+    """
+    统计目录下所有文件占用的空间
+
+    不跟随符号链接，不跨越权限不足的子目录，也不进入挂载在其下的其他文件系统
+    （与 du -x 相同，绑定挂载等的空间不属于当前驱动器）；访问的条目数超过max_entries时停止，
+    避免在异常庞大的目录上无限制地消耗时间。
+
+    参数:
+        path (str): 目录路径
+        pattern (re.Pattern): 只统计文件名匹配该正则的文件，None表示全部
+        max_entries (int): 最多访问的目录条目数
+
+    返回:
+        int: 字节数
+    """
+    total = 0
+    visited = 0
+    try:
+        root_dev = os.stat(path).st_dev
+    except OSError:
+        return 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    visited += 1
+                    if visited > max_entries:
+                        logging.warning(f"统计 {path} 时条目数超过上限 {max_entries}，结果可能偏小")
+                        return total
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Windows 上 DirEntry.stat() 的 st_dev 总是0，此时不做判断
+                            dev = entry.stat(follow_symlinks=False).st_dev
+                            if not dev or dev == root_dev:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if pattern is None or pattern.match(entry.name):
+                                total += _entry_size(entry.stat(follow_symlinks=False))
+                    except OSError:
+                        continue
+        except OSError:
+            # 无权限或目录已被删除
+            continue
+    return total
+
+
+class ReclaimAnalyzer:
+    """
+    可回收空间分析器
+
+    结果按驱动器列表缓存ttl秒，期间重复调用直接返回缓存。
+    """
+
+    def __init__(self, ttl=600, max_workers=4, max_entries=200000):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def analyze(self, drives, catalog=None):
+        """
+        统计每个驱动器上的可回收空间
+
+        参数:
+            drives (list): 驱动器挂载点列表
+            catalog (list): 自定义位置目录，None表示使用内置目录
+
+        返回:
+            dict: {drive: {"total": 字节数, "items": [{"category", "path", "bytes"}]}}
+        """
+        key = tuple(sorted(drives))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and now - cached[0] < self.ttl:
+                return cached[1]
+
+        if catalog is None:
+            catalog = default_catalog(drives)
+        locations = [loc for loc in catalog if os.path.isdir(loc["path"])]
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            sizes = list(executor.map(
+                lambda loc: walk_size(loc["path"], loc["pattern"], self.max_entries),
+                locations
+            ))
+
+        result = {drive: {"total": 0, "items": []} for drive in drives}
+        for loc, size in zip(locations, sizes):
+            drive = match_drive(loc["path"], drives)
+            if drive is None or size <= 0:
+                continue
+            result[drive]["items"].append({"category": loc["category"], "path": loc["path"], "bytes": size})
+            result[drive]["total"] += size
+        for info in result.values():
+            info["items"].sort(key=lambda item: item["bytes"], reverse=True)
+
+        logging.info(f"可回收空间统计完成，耗时 {time.monotonic() - start:.2f} 秒")
+        with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def invalidate(self):
+        """清空缓存，下次调用时重新统计"""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,339 @@
+"""
+目录扫描快照模块
+
+将一次目录扫描保存为紧凑的快照文件，并比较两个快照找出增长最多的子目录。
+
+快照格式（gzip压缩的UTF-8文本）:
+    第一行为文件头: SDMSNAP<TAB>版本<TAB>扫描根目录<TAB>创建时间戳
+    之后每行一个目录记录: 共享前缀长度<TAB>路径后缀<TAB>子树字节数<TAB>子树文件数
+
+记录按后序（子目录在父目录之前，同级目录按名称排序）排列，路径相对于扫描根目录，
+以"/"分隔，并与上一条记录的路径做前缀差分编码。写入和比较都是流式的：
+扫描时只保留当前路径上的目录栈，比较时对两个文件做一次归并，内存占用与目录总数无关。
+"""
+
+import os
+import sys
+import gzip
+import time
+import heapq
+import logging
+import argparse
+
+MAGIC = "SDMSNAP"
+VERSION = "1"
+
+# 排序键中使用的分隔符和结束符：分隔符小于任何文件名字符，
+# 结束符大于任何文件名字符，从而使子目录排在父目录之前
+_KEY_SEP = "\x00"
+_KEY_END = "\U0010ffff"
+
+
+def order_key(relpath):
+    """返回相对路径在快照中的排序键"""
+    if not relpath:
+        return _KEY_END
+    return relpath.replace("/", _KEY_SEP) + _KEY_SEP + _KEY_END
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _unescape(text):
+    if "\\" not in text:
+        return text
+    out = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            nxt = text[i + 1]
+            out.append({"t": "\t", "n": "\n"}.get(nxt, nxt))
+            i += 2
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def _common_prefix_len(a, b):
+    """二分查找公共前缀长度，比逐字符比较快得多"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _open_text(path, mode):
+    return gzip.open(path, mode + "t", encoding="utf-8", errors="surrogateescape", newline="\n")
+
+
+def _file_size(stat_result):
+    blocks = getattr(stat_result, "st_blocks", None)
+    return blocks * 512 if blocks is not None else stat_result.st_size
+
+
+def _scan_dir(path, one_filesystem, root_dev):
+    """
+    扫描单个目录，返回 (直接包含的文件字节数, 文件数, 排序后的子目录名列表)
+    """
+    size = 0
+    files = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if one_filesystem and entry.stat(follow_symlinks=False).st_dev != root_dev:
+                            continue
+                        subdirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        size += _file_size(entry.stat(follow_symlinks=False))
+                        files += 1
+                except OSError:
+                    continue
+    except OSError as e:
+        logging.debug(f"无法扫描目录 {path}: {e}")
+    subdirs.sort()
+    return size, files, subdirs
+
+
+def iter_scan(root, one_filesystem=True):
+    """
+    按快照顺序（后序）遍历目录树
+
+    生成:
+        tuple: (相对路径, 子树字节数, 子树文件数)
+    """
+    root = os.path.abspath(root)
+    root_dev = os.stat(root).st_dev
+    size, files, subdirs = _scan_dir(root, one_filesystem, root_dev)
+    # 栈帧: [相对路径, 绝对路径, 剩余子目录(逆序), 累计字节数, 累计文件数]
+    stack = [["", root, subdirs[::-1], size, files]]
+    while stack:
+        frame = stack[-1]
+        if frame[2]:
+            name = frame[2].pop()
+            relpath = f"{frame[0]}/{name}" if frame[0] else name
+            abspath = os.path.join(frame[1], name)
+            size, files, subdirs = _scan_dir(abspath, one_filesystem, root_dev)
+            stack.append([relpath, abspath, subdirs[::-1], size, files])
+            continue
+        stack.pop()
+        if stack:
+            stack[-1][3] += frame[3]
+            stack[-1][4] += frame[4]
+        yield frame[0], frame[3], frame[4]
+
+
+def write_snapshot(records, output, root=""):
+    """
+    将按快照顺序排列的记录流式写入快照文件
+
+    参数:
+        records (iterable): (相对路径, 字节数, 文件数) 序列
+        output (str): 快照文件路径
+        root (str): 扫描根目录，仅记录在文件头中
+
+    返回:
+        int: 写入的记录数
+    """
+    count = 0
+    previous = ""
+    with _open_text(output, "w") as f:
+        f.write(f"{MAGIC}\t{VERSION}\t{_escape(root)}\t{int(time.time())}\n")
+        for relpath, size, files in records:
+            shared = _common_prefix_len(previous, relpath)
+            f.write(f"{shared}\t{_escape(relpath[shared:])}\t{size}\t{files}\n")
+            previous = relpath
+            count += 1
+    return count
+
+
+def save_snapshot(root, output, one_filesystem=True):
+    """扫描目录并保存快照，返回写入的目录数"""
+    start = time.monotonic()
+    count = write_snapshot(iter_scan(root, one_filesystem), output, os.path.abspath(root))
+    logging.info(f"已保存 {root} 的扫描快照: {count} 个目录，耗时 {time.monotonic() - start:.2f} 秒")
+    return count
+
+
+def read_header(path):
+    """读取快照文件头，返回 {"root", "created"}"""
+    with _open_text(path, "r") as f:
+        return _parse_header(f.readline(), path)
+
+
+def _parse_header(line, path):
+    parts = line.rstrip("\n").split("\t")
+    if len(parts) != 4 or parts[0] != MAGIC:
+        raise ValueError(f"不是有效的快照文件: {path}")
+    if parts[1] != VERSION:
+        raise ValueError(f"不支持的快照版本 {parts[1]}: {path}")
+    return {"root": _unescape(parts[2]), "created": int(parts[3])}
+
+
+def iter_snapshot(path):
+    """
+    流式读取快照文件
+
+    生成:
+        tuple: (相对路径, 子树字节数, 子树文件数)
+    """
+    with _open_text(path, "r") as f:
+        _parse_header(f.readline(), path)
+        previous = ""
+        for line in f:
+            shared, suffix, size, files = line.rstrip("\n").split("\t")
+            relpath = previous[:int(shared)] + _unescape(suffix)
+            previous = relpath
+            yield relpath, int(size), int(files)
+
+
+def _merge(old_records, new_records):
+    """
+    按快照顺序归并两个记录流
+
+    生成:
+        tuple: (相对路径, 旧字节数, 新字节数)，缺失的一侧为0
+    """
+    old_iter = iter(old_records)
+    new_iter = iter(new_records)
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+    old_key = order_key(old[0]) if old else None
+    new_key = order_key(new[0]) if new else None
+    while old is not None or new is not None:
+        if new is None or (old is not None and old_key < new_key):
+            yield old[0], old[1], 0
+            old = next(old_iter, None)
+            old_key = order_key(old[0]) if old else None
+        elif old is None or new_key < old_key:
+            yield new[0], 0, new[1]
+            new = next(new_iter, None)
+            new_key = order_key(new[0]) if new else None
+        else:
+            yield old[0], old[1], new[1]
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+            old_key = order_key(old[0]) if old else None
+            new_key = order_key(new[0]) if new else None
+
+
+def diff_records(old_records, new_records, top_n=20, min_bytes=1024 * 1024, dominant_ratio=0.9):
+    """
+    比较两个记录流，找出绝对增长和相对增长最多的子目录
+
+    如果某个目录的增长几乎全部（不低于dominant_ratio）来自它的某一个子目录，
+    则只报告那个子目录，避免结果被根目录和沿途祖先目录占满。
+
+    参数:
+        top_n (int): 每个排行返回的条目数
+        min_bytes (int): 参与相对增长排行的最小旧大小，过滤掉从几KB涨到几MB的小目录；
+                         新出现的目录只参与绝对增长排行
+        dominant_ratio (float): 判定增长由单个子目录主导的比例
+
+    返回:
+        dict: {"absolute": [...], "relative": [...], "old_total", "new_total", "compared"}
+              每个条目包含 path、old_bytes、new_bytes、delta、ratio
+    """
+    absolute = []
+    relative = []
+    # 按深度记录尚未被父目录消费的子目录最大增长
+    child_max = {}
+    old_total = new_total = compared = 0
+    counter = 0
+
+    for relpath, old_bytes, new_bytes in _merge(old_records, new_records):
+        compared += 1
+        depth = relpath.count("/") + 1 if relpath else 0
+        delta = new_bytes - old_bytes
+        largest_child = child_max.pop(depth + 1, 0)
+        child_max[depth] = max(child_max.get(depth, 0), delta)
+
+        if depth == 0:
+            old_total, new_total = old_bytes, new_bytes
+        if delta <= 0 or largest_child >= dominant_ratio * delta:
+            continue
+
+        ratio = delta / old_bytes if old_bytes else float("inf")
+        entry = (relpath, old_bytes, new_bytes, delta, ratio)
+        counter += 1
+        heapq.heappush(absolute, (delta, counter, entry))
+        if len(absolute) > top_n:
+            heapq.heappop(absolute)
+        if old_bytes and old_bytes >= min_bytes:
+            heapq.heappush(relative, (ratio, counter, entry))
+            if len(relative) > top_n:
+                heapq.heappop(relative)
+
+    def to_list(heap):
+        return [
+            {"path": e[0] or ".", "old_bytes": e[1], "new_bytes": e[2], "delta": e[3], "ratio": e[4]}
+            for _, _, e in sorted(heap, reverse=True)
+        ]
+
+    return {
+        "absolute": to_list(absolute),
+        "relative": to_list(relative),
+        "old_total": old_total,
+        "new_total": new_total,
+        "compared": compared
+    }
+
+
+def diff_snapshots(old_path, new_path, top_n=20, min_bytes=1024 * 1024, dominant_ratio=0.9):
+    """比较两个快照文件，参数和返回值同 diff_records"""
+    return diff_records(iter_snapshot(old_path), iter_snapshot(new_path), top_n, min_bytes, dominant_ratio)
+
+
+def _format_bytes(value):
+    value = float(value)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="目录扫描快照与增长比较")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = sub.add_parser("save", help="扫描目录并保存快照")
+    save_parser.add_argument("root", help="要扫描的目录")
+    save_parser.add_argument("output", help="快照文件路径")
+    save_parser.add_argument("--cross-filesystems", action="store_true", help="扫描时进入其他文件系统的挂载点")
+
+    diff_parser = sub.add_parser("diff", help="比较两个快照")
+    diff_parser.add_argument("old", help="旧快照")
+    diff_parser.add_argument("new", help="新快照")
+    diff_parser.add_argument("--top", type=int, default=20, help="每个排行显示的条目数")
+
+    args = parser.parse_args(argv)
+    if args.command == "save":
+        count = save_snapshot(args.root, args.output, not args.cross_filesystems)
+        print(f"{count} directories -> {args.output}")
+        return 0
+
+    result = diff_snapshots(args.old, args.new, args.top)
+    print(f"total: {_format_bytes(result['old_total'])} -> {_format_bytes(result['new_total'])} "
+          f"({result['compared']} directories compared)")
+    print("\nlargest absolute growth:")
+    for item in result["absolute"]:
+        print(f"  +{_format_bytes(item['delta']):>10}  {item['path']}")
+    print("\nlargest relative growth:")
+    for item in result["relative"]:
+        print(f"  {item['ratio'] * 100:>8.1f}%  +{_format_bytes(item['delta']):>10}  {item['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
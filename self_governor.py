@@ -0,0 +1,118 @@
+"""
+监控程序自身资源管控模块
+
+周期性采样监控进程自身的CPU时间、常驻内存、线程数和打开的文件句柄数，
+超出预算时逐级降低可选工作的强度，恢复后逐级还原：
+    级别0  正常
+    级别1  延长检查间隔
+    级别2  暂停可选的扫描任务（可回收空间统计、年龄报告、容器统计、压缩、写入探测）
+    级别3  进一步延长间隔并清空缓存
+"""
+
+import time
+import logging
+import threading
+
+import psutil
+
+MAX_LEVEL = 3
+# 各降级级别对应的检查间隔倍数
+INTERVAL_MULTIPLIERS = {0: 1, 1: 2, 2: 2, 3: 4}
+# 连续多少次采样都在预算的该比例以内才降低一级，避免来回抖动
+RECOVER_RATIO = 0.8
+RECOVER_SAMPLES = 3
+
+
+class SelfGovernor:
+    """
+    自身资源预算管控
+
+    预算为0或None的指标不参与判断。
+    """
+
+    def __init__(self, cpu_percent=5.0, rss_mb=150, threads=50, fds=256, check_seconds=30):
+        self.budgets = {"cpu_percent": cpu_percent, "rss_mb": rss_mb, "threads": threads, "fds": fds}
+        self.check_seconds = check_seconds
+        self.level = 0
+        self.usage = {}
+        self._process = psutil.Process()
+        self._last_cpu = self._cpu_seconds()
+        self._last_time = time.monotonic()
+        self._last_check = self._last_time
+        self._calm_samples = 0
+        self._lock = threading.Lock()
+
+    def _cpu_seconds(self):
+        times = self._process.cpu_times()
+        return times.user + times.system
+
+    def _open_handles(self):
+        try:
+            if hasattr(self._process, "num_fds"):
+                return self._process.num_fds()
+            return self._process.num_handles()
+        except (psutil.Error, OSError):
+            return 0
+
+    def due(self):
+        """距离上次采样是否已超过采样周期"""
+        with self._lock:
+            return time.monotonic() - self._last_check >= self.check_seconds
+
+    def sample(self):
+        """
+        采样一次自身资源占用并调整降级级别
+
+        返回:
+            tuple: (旧级别, 新级别)
+        """
+        # 整个采样在锁内进行：两个线程同时采样时，CPU差值不会按错误的时间窗口计算
+        with self._lock:
+            now = time.monotonic()
+            cpu = self._cpu_seconds()
+            elapsed = max(now - self._last_time, 1e-6)
+            usage = {
+                "cpu_percent": (cpu - self._last_cpu) / elapsed * 100,
+                "rss_mb": self._process.memory_info().rss / (1024 * 1024),
+                "threads": self._process.num_threads(),
+                "fds": self._open_handles()
+            }
+            self._last_cpu = cpu
+            self._last_time = now
+            self._last_check = now
+
+            over = [name for name, value in usage.items() if self.budgets.get(name) and value > self.budgets[name]]
+            calm = all(not self.budgets.get(name) or value <= self.budgets[name] * RECOVER_RATIO
+                       for name, value in usage.items())
+
+            old_level = self.level
+            self.usage = usage
+            if over:
+                self._calm_samples = 0
+                self.level = min(self.level + 1, MAX_LEVEL)
+            elif calm and self.level > 0:
+                self._calm_samples += 1
+                if self._calm_samples >= RECOVER_SAMPLES:
+                    self._calm_samples = 0
+                    self.level -= 1
+            else:
+                self._calm_samples = 0
+            new_level = self.level
+
+        if new_level != old_level:
+            logging.warning(f"自身资源降级级别 {old_level} -> {new_level}，超出预算: {over}，当前占用: {usage}")
+        return old_level, new_level
+
+    def interval_multiplier(self):
+        with self._lock:
+            return INTERVAL_MULTIPLIERS[self.level]
+
+    def allows_optional_work(self):
+        """是否允许执行可选的扫描任务"""
+        with self._lock:
+            return self.level < 2
+
+    def status(self):
+        """返回最近一次采样的占用、预算和降级级别，还没有采样过时 usage 为空"""
+        with self._lock:
+            return {"level": self.level, "usage": dict(self.usage), "budgets": dict(self.budgets)}
@@ -1,448 +1,71 @@
+import sys
+
+# 一次性检查会被脚本频繁调用，在导入 psutil 和监控核心之前就分派出去，见 quick_check.py
+if __name__ == "__main__" and "--check" in sys.argv[1:]:
+    from quick_check import main as _quick_check
+    sys.exit(_quick_check(sys.argv[1:]))
+
+# 转发给运行中实例的命令同样不需要加载监控核心，见 single_instance.py
+if __name__ == "__main__" and any(arg in ("--check-now", "--open-settings", "--reload") for arg in sys.argv[1:]):
+    from single_instance import main as _forward_command
+    sys.exit(_forward_command(sys.argv[1:]))
+
 import psutil
-import tkinter as tk
-from tkinter import messagebox, ttk
 import time
 import json
 import os
-import sys
 import logging
 import argparse
 import threading
 import queue
-from PIL import Image, ImageDraw
-import pystray
+import socket
 from language import get_text, TRANSLATIONS
-
-# 添加单例检查所需的模块
-import ctypes
-import tempfile
+from process_io import ProcessWriteSampler, writers_for_drive
+from reclaim import ReclaimAnalyzer
+from age_report import scan_volume, CATEGORIES, AGE_BUCKET_LABELS, AXES
+from container_usage import ContainerUsageAnalyzer, DEFAULT_DOCKER_ROOT
+from mounts import is_monitorable, disk_usage
+from cleanup import CleanupEngine, policies_for_drive
+from compressor import CompressionWorker, roots_for_drive
+from ballast import BallastManager, default_ballast_path
+from latency import LatencyTracker
+from self_governor import SelfGovernor
+from history import UsageHistory
+from ui_wakeup import WakeupQueue, attach as attach_ui_queue
+from tray_icon import IconCache, bucket_for, tooltip_text, worst_drive
+from alert_sinks import AlertRouter, build_sinks
+from single_instance import SingleInstance
 import weakref
 
-class SingleInstance:
-    """
-    单例模式实现，确保程序只有一个实例在运行
-    """
-    def __init__(self, app_name):
-        self.app_name = app_name
-        self.mutex_name = f'Global\\{app_name}'
-        self.mutex = None
-        
-    def check(self):
-        """
-        检查是否已有实例在运行
-        返回：True表示这是唯一实例，False表示已有实例在运行
-        """
-        try:
-            # 尝试创建命名互斥体
-            self.mutex = ctypes.windll.kernel32.CreateMutexW(None, False, self.mutex_name)
-            last_error = ctypes.windll.kernel32.GetLastError()
-            
-            # 如果互斥体已存在，说明已有实例在运行
-            if last_error == 183:  # ERROR_ALREADY_EXISTS
-                logging.warning("程序已经在运行中，拒绝启动新实例")
-                return False
-            return True
-        except Exception as e:
-            logging.error(f"检查单例时发生错误: {e}", exc_info=True)
-            # 出错时允许程序继续运行
-            return True
-            
-    def release(self):
-        """释放互斥体"""
-        if self.mutex:
-            try:
-                ctypes.windll.kernel32.ReleaseMutex(self.mutex)
-                ctypes.windll.kernel32.CloseHandle(self.mutex)
-                self.mutex = None
-            except Exception as e:
-                logging.error(f"释放互斥体时发生错误: {e}", exc_info=True)
-
-class ConfigWindow(tk.Toplevel):
-    def __init__(self, monitor, parent=None):
-        try:
-            super().__init__(parent)
-            logging.info("配置窗口初始化")
-            self.title(monitor._("settings_title"))
-            self.geometry("600x800")  # 增加窗口尺寸，确保所有内容可见
-            self.minsize(600, 800)    # 添加最小窗口大小限制
-            self.resizable(True, True)  # 允许调整大小
-            self.monitor = monitor
-            self.config = monitor.config
-            # 记录当前语言，用于检测变化
-            self.current_language = self.config.get("language", "zh_CN")
-            # 预先初始化列表，确保toggle_drive_selection方法总是有效
-            self.drive_checkbuttons = []
-            self.drive_vars = {}
-            self.create_widgets()
-            # 窗口居中
-            self.update_idletasks()
-            width = self.winfo_width()
-            height = self.winfo_height()
-            x = (self.winfo_screenwidth() // 2) - (width // 2)
-            y = (self.winfo_screenheight() // 2) - (height // 2)
-            self.geometry(f'{width}x{height}+{x}+{y}')
-            self.focus_set()
-            logging.info("配置窗口创建成功")
-        except Exception as e:
-            logging.error(f"配置窗口初始化失败: {e}", exc_info=True)
-            raise
-    
-    def create_widgets(self):
-        # 创建一个包含所有内容的主框架，该框架可滚动
-        # 这样可以确保内容过多时，按钮始终可见
-        main_container = tk.Frame(self)
-        main_container.pack(fill=tk.BOTH, expand=True)
-        
-        # 创建内容部分的画布，可滚动
-        canvas = tk.Canvas(main_container)
-        scrollbar = ttk.Scrollbar(main_container, orient=tk.VERTICAL, command=canvas.yview)
-        
-        # 创建将放置所有控件的可滚动框架
-        main_frame = tk.Frame(canvas)
-        
-        # 配置画布滚动区域
-        main_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        # 设置画布的初始大小和滚动性能参数
-        canvas.configure(width=430, height=550)  # 设置合适的初始大小
-        
-        # 创建画布窗口并放置框架
-        canvas_window = canvas.create_window((0, 0), window=main_frame, anchor="nw")
-        
-        # 当主容器调整大小时，调整画布窗口大小
-        def on_canvas_configure(event):
-            canvas.itemconfig(canvas_window, width=event.width)
-        canvas.bind('<Configure>', on_canvas_configure)
-        
-        # 绑定鼠标滚轮事件
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        
-        # 绑定鼠标滚轮事件到画布
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        # 当离开窗口时解绑鼠标滚轮事件，避免影响其他窗口
-        def _unbind_mousewheel(e):
-            canvas.unbind_all("<MouseWheel>")
-        
-        # 当进入窗口时重新绑定鼠标滚轮事件
-        def _bind_mousewheel(e):
-            canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        # 绑定鼠标进入离开事件
-        #canvas.bind("<Enter>", _bind_mousewheel)
-        #canvas.bind("<Leave>", _unbind_mousewheel)
-        
-        # 绑定鼠标滚轮事件到整个窗口和其子组件
-        self.bind_all("<MouseWheel>", _on_mousewheel)
-
-        # 当窗口关闭时解绑鼠标滚轮事件
-        self.bind("<Destroy>", lambda e: self.unbind_all("<MouseWheel>"))
-
-        # 配置画布和滚动条的关联
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # 放置画布和滚动条
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+# 界面相关的模块（tkinter、PIL、pystray 以及各个窗口）在第一次用到时才导入，
+# 启动时只加载监控核心，见 _load_tk() 和 measure_startup.py
+tk = ttk = messagebox = filedialog = None
 
-        # 阈值设置区域
-        threshold_frame = tk.LabelFrame(main_frame, text=self.monitor._("threshold_settings"), padx=10, pady=10)
-        threshold_frame.pack(fill=tk.X, pady=5)
 
-        # 严重警告阈值
-        tk.Label(threshold_frame, text=self.monitor._("critical_threshold")).grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.critical_threshold = tk.Entry(threshold_frame, width=10)
-        self.critical_threshold.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
-        self.critical_threshold.insert(0, str(self.config.get("critical_threshold", 90)))
-        
-        # 警告阈值
-        tk.Label(threshold_frame, text=self.monitor._("warning_threshold")).grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-        self.warning_threshold = tk.Entry(threshold_frame, width=10)
-        self.warning_threshold.grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
-        self.warning_threshold.insert(0, str(self.config.get("warning_threshold", 75)))
-        
-        # 提示阈值
-        tk.Label(threshold_frame, text=self.monitor._("notice_threshold")).grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-        self.notice_threshold = tk.Entry(threshold_frame, width=10)
-        self.notice_threshold.grid(row=2, column=1, padx=5, pady=5, sticky=tk.W)
-        self.notice_threshold.insert(0, str(self.config.get("notice_threshold", 60)))
-        
-        # 时间设置区域
-        time_frame = tk.LabelFrame(main_frame, text=self.monitor._("time_settings"), padx=10, pady=10)
-        time_frame.pack(fill=tk.X, pady=5)
-        
-        # 检查间隔
-        tk.Label(time_frame, text=self.monitor._("check_interval")).grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.check_interval = tk.Entry(time_frame)
-        self.check_interval.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W+tk.E)
-        self.check_interval.insert(0, str(self.config.get("check_interval", 5)))
-
-        # 驱动器选择区域
-        drives_frame = tk.LabelFrame(main_frame, text=self.monitor._("monitor_drives"), padx=10, pady=10)
-        drives_frame.pack(fill=tk.X, pady=5)
-        
-        # 获取所有可用驱动器
-        self.available_drives = self.monitor.get_available_drives()
-        self.drive_vars = {}
-        
-        # 驱动器复选框 - 监控所有驱动器选项
-        self.all_drives_var = tk.BooleanVar()
-        self.all_drives_var.set(not self.config.get("drives_to_monitor", []))
-        self.all_drives_cb = tk.Checkbutton(drives_frame, text=self.monitor._("monitor_all_drives"), 
-                                          variable=self.all_drives_var, 
-                                          command=self.toggle_drive_selection)
-        self.all_drives_cb.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        # 单独的滚动框架，专门用于显示驱动器列表
-        drive_list_frame = tk.Frame(drives_frame)
-        drive_list_frame.grid(row=1, column=0, sticky=tk.W+tk.E, padx=5, pady=5)
-        
-        # 添加每个驱动器的复选框
-        self.drive_checkbuttons = []  # 保存复选框引用
-        for i, drive in enumerate(self.available_drives):
-            var = tk.BooleanVar()
-            var.set(drive in self.config.get("drives_to_monitor", []))
-            self.drive_vars[drive] = var
-            cb = tk.Checkbutton(drive_list_frame, text=drive, variable=var)
-            cb.grid(row=i, column=0, sticky=tk.W, padx=20, pady=2)
-            self.drive_checkbuttons.append(cb)  # 保存引用
-        
-        # 语言设置区域
-        language_frame = tk.LabelFrame(main_frame, text=self.monitor._("language_settings"), padx=10, pady=10)
-        language_frame.pack(fill=tk.X, pady=5)
-
-        self.language_var = tk.StringVar(value=self.config.get("language", "zh_CN"))
-        tk.Radiobutton(language_frame, text="简体中文", variable=self.language_var, value="zh_CN").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        tk.Radiobutton(language_frame, text="English", variable=self.language_var, value="en_US").grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
-
-        # 其他选项区域
-        options_frame = tk.LabelFrame(main_frame, text=self.monitor._("other_options"), padx=10, pady=10)
-        options_frame.pack(fill=tk.X, pady=5)
-        
-        self.silent_mode_var = tk.BooleanVar()
-        self.silent_mode_var.set(self.config.get("silent_mode", False))
-        self.silent_mode_cb = tk.Checkbutton(options_frame, text=self.monitor._("silent_mode"), 
-                                           variable=self.silent_mode_var)
-        self.silent_mode_cb.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        self.startup_var = tk.BooleanVar()
-        self.startup_var.set(self.config.get("run_at_startup", False))
-        self.startup_cb = tk.Checkbutton(options_frame, text=self.monitor._("run_at_startup"), 
-                                       variable=self.startup_var)
-        self.startup_cb.grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-        
-        # 按钮区域 - 使用单独的框架确保按钮总是可见
-        button_container = tk.Frame(self)  # 此框架不在滚动区域内，确保始终可见
-        button_container.pack(fill='both', expand=True)
-        button_container.pack_propagate(False)
-        button_container.grid_propagate(False)  # 确保grid布局也不会改变容器大小
-
-        
-        # 分隔线
-        separator = ttk.Separator(button_container, orient='horizontal')
-        separator.pack(fill=tk.X, pady=5)
-        
-        # 按钮区域
-        button_frame = tk.Frame(button_container)
-        button_frame.pack(fill='both', expand=True)
-
-        # 配置button_frame的列权重，确保按钮均匀分布
-        button_frame.columnconfigure(0, weight=1)  # 左边按钮区域
-        button_frame.columnconfigure(1, weight=1)  # 中间间隔
-        button_frame.columnconfigure(2, weight=1)  # 取消按钮区域
-        button_frame.columnconfigure(3, weight=1)  # 保存按钮区域
-        
-        button_frame.rowconfigure(0, weight=1)  # 确保按钮垂直居中
-        # 创建按钮，确保它们足够大并且具有鲜明的颜色
-        apply_button = tk.Button(button_frame, text=self.monitor._("apply"), command=self.apply_config, 
-                       width=15, height=2, bg="#4CAF50", fg="white", 
-                       relief=tk.RAISED, bd=3, font=("Arial", 10, "bold"))
-        apply_button.grid(row=0, column=0, padx=10, pady=5, sticky="ew")
-
-        cancel_button = tk.Button(button_frame, text=self.monitor._("cancel"), command=self.destroy, 
-                        width=15, height=2, font=("Arial", 10, "bold"))
-        cancel_button.grid(row=0, column=2, padx=10, pady=5, sticky="ew")
-
-        save_button = tk.Button(button_frame, text=self.monitor._("save_and_close"), command=self.save_config, 
-                      width=15, height=2, bg="#2196F3", fg="white", 
-                      relief=tk.RAISED, bd=3, font=("Arial", 10, "bold"))
-        save_button.grid(row=0, column=3, padx=10, pady=5, sticky="ew")
-        
-        # 立即更新驱动器选择状态
-        self.toggle_drive_selection()
+def _load_tk():
+    """导入 tkinter 并设置模块级的 tk / ttk / messagebox / filedialog"""
+    global tk, ttk, messagebox, filedialog
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as _messagebox, ttk as _ttk, filedialog as _filedialog
+        tk, ttk, messagebox, filedialog = tkinter, _ttk, _messagebox, _filedialog
+    return tk
 
-
-    def toggle_drive_selection(self):
-        """切换所有驱动器选择状态"""
-        all_selected = self.all_drives_var.get()
-        for drive, var in self.drive_vars.items():
-            if all_selected:
-                # 当选择"监控所有驱动器"时，重置所有驱动器的选择状态为未选中
-                var.set(False)
-        
-        for cb in self.drive_checkbuttons:
-            if all_selected:
-                cb.config(state=tk.DISABLED)
-            else:
-                cb.config(state=tk.NORMAL)
-    
-    def apply_config(self):
-        """应用设置但不关闭窗口"""
-        try:
-            # 验证并保存设置
-            if not self._validate_and_save_config():
-                return
-            
-            # 检查语言是否变更，若变更则刷新界面
-            if self.current_language != self.language_var.get():
-                self.refresh_ui()
-                
-            messagebox.showinfo(self.monitor._("success"), self.monitor._("config_applied"))
-            logging.info("用户应用了配置")
-        except Exception as e:
-            logging.error(f"应用配置时出错: {e}")
-            messagebox.showerror(self.monitor._("error"), self.monitor._("error_occurred").format(e))
-        
-    def save_config(self):
-        """验证、保存设置并关闭窗口"""
-        try:
-            # 验证并保存设置
-            if not self._validate_and_save_config():
-                return
-                
-            messagebox.showinfo(self.monitor._("success"), self.monitor._("config_saved"))
-            logging.info("用户保存了配置")
-            self.destroy()
-        except Exception as e:
-            logging.error(f"保存配置时出错: {e}")
-            messagebox.showerror(self.monitor._("error"), self.monitor._("error_occurred").format(e))
-            
-    def refresh_ui(self):
-        """在语言切换后刷新UI"""
-        # 保存当前配置值
-        configs = {
-            'critical': self.critical_threshold.get(),
-            'warning': self.warning_threshold.get(),
-            'notice': self.notice_threshold.get(),
-            'interval': self.check_interval.get(),
-            'all_drives': self.all_drives_var.get(),
-            'silent': self.silent_mode_var.get(),
-            'startup': self.startup_var.get(),
-            'language': self.language_var.get()
-        }
-        
-        # 清除当前界面内容
-        for widget in self.winfo_children():
-            widget.destroy()
-        
-        # 更新当前语言
-        self.current_language = configs['language']
-        
-        # 重新创建界面组件
-        self.create_widgets()
-        
-        # 恢复配置值
-        self.critical_threshold.delete(0, tk.END)
-        self.critical_threshold.insert(0, configs['critical'])
-        
-        self.warning_threshold.delete(0, tk.END)
-        self.warning_threshold.insert(0, configs['warning'])
-        
-        self.notice_threshold.delete(0, tk.END)
-        self.notice_threshold.insert(0, configs['notice'])
-        
-        self.check_interval.delete(0, tk.END)
-        self.check_interval.insert(0, configs['interval'])
-        
-        self.all_drives_var.set(configs['all_drives'])
-        self.silent_mode_var.set(configs['silent'])
-        self.startup_var.set(configs['startup'])
-        self.language_var.set(configs['language'])
-        
-        # 更新窗口标题
-        self.title(self.monitor._("settings_title"))
-        
-        # 更新驱动器选择状态
-        self.toggle_drive_selection()
-            
-    def _validate_and_save_config(self):
-        """验证输入并保存配置"""
-        try:
-            # 验证输入值，增强对非数字输入的处理
-            try:
-                # 处理可能的空白字符串或非数字输入
-                critical_str = self.critical_threshold.get().strip()
-                warning_str = self.warning_threshold.get().strip()
-                notice_str = self.notice_threshold.get().strip()
-                
-                if not critical_str or not warning_str or not notice_str:
-                    raise ValueError(self.monitor._("threshold_empty"))
-                
-                critical = int(critical_str)
-                warning = int(warning_str)
-                notice = int(notice_str)
-                
-                if not (0 < notice < warning < critical <= 100):
-                    raise ValueError(self.monitor._("threshold_invalid"))
-                
-                check_interval_str = self.check_interval.get().strip()
-                
-                if not check_interval_str:
-                    raise ValueError(self.monitor._("interval_empty"))
-                
-                try:
-                    check_interval = float(check_interval_str)
-                except ValueError:
-                    raise ValueError(self.monitor._("invalid_number"))
-                
-                if check_interval <= 0:
-                    raise ValueError(self.monitor._("interval_too_small"))
-                
-            except ValueError as e:
-                messagebox.showerror(self.monitor._("input_error"), str(e))
-                return False
-            
-            # 收集配置
-            new_config = {
-                "critical_threshold": critical,
-                "warning_threshold": warning,
-                "notice_threshold": notice,
-                "check_interval": check_interval,  # 以分钟为单位
-                "silent_mode": self.silent_mode_var.get(),
-                "run_at_startup": self.startup_var.get(),
-                "language": self.language_var.get()
-            }
-            
-            # 收集驱动器选择
-            if not self.all_drives_var.get():
-                selected_drives = [drive for drive, var in self.drive_vars.items() if var.get()]
-                new_config["drives_to_monitor"] = selected_drives
-            else:
-                new_config["drives_to_monitor"] = []
-            
-            # 保存到配置文件
-            with open(self.monitor.config_file, 'w', encoding='utf-8') as f:
-                json.dump(new_config, f, indent=4, ensure_ascii=False)
-            
-            # 更新监视器配置
-            self.monitor.config = new_config
-            self.monitor.apply_config()
-            
-            return True
-        except Exception as e:
-            logging.error(f"验证和保存配置时出错: {e}")
-            messagebox.showerror(self.monitor._("error"), self.monitor._("config_error"))
-            return False
+# 报警级别的严重程度顺序，用于检测级别跳变
+LEVEL_ORDER = {"normal": 0, "notice": 1, "warning": 2, "critical": 3}
 
 class SimpleDiskMonitor:
-    def __init__(self, config_file=None):
+    def __init__(self, config_file=None, headless=False):
+        # 无界面模式：不导入任何界面模块，报警通过 alert_sinks 输出
+        self.headless = headless
+        
         # 初始化单例检查
         self.single_instance = SingleInstance("SimpleDiskMonitor")
         if not self.single_instance.check():
+            if headless:
+                print("磁盘监控器已经在运行中，请勿重复启动。", file=sys.stderr)
+                sys.exit(1)
+            _load_tk()
             messagebox.showwarning("程序已在运行", "磁盘监控器已经在运行中，请勿重复启动。")
             sys.exit(0)
         
@@ -453,14 +76,21 @@ class SimpleDiskMonitor:
         # 确保目录存在
         os.makedirs(self.app_data_dir, exist_ok=True)
         
-        # 日志保存在程序所在目录
-        log_file = os.path.join(self.program_dir, "disk_monitor.log")
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            encoding='utf-8'
-        )
+        # 日志保存在程序所在目录；无界面模式写到标准错误，由 journald 等收集并加时间戳
+        if headless:
+            logging.basicConfig(
+                stream=sys.stderr,
+                level=logging.INFO,
+                format="%(levelname)s - %(message)s"
+            )
+        else:
+            log_file = os.path.join(self.program_dir, "disk_monitor.log")
+            logging.basicConfig(
+                filename=log_file,
+                level=logging.INFO,
+                format="%(asctime)s - %(levelname)s - %(message)s",
+                encoding='utf-8'
+            )
         logging.info("磁盘监控器启动")
         logging.info(f"应用数据目录: {self.app_data_dir}")
         logging.info(f"日志文件目录: {self.program_dir}")
@@ -480,7 +110,49 @@ class SimpleDiskMonitor:
             "drives_to_monitor": [],   # 要监控的驱动器，空列表表示监控所有驱动器
             "silent_mode": False,      # 静默模式
             "run_at_startup": False,   # 开机自启动
-            "language": "zh_CN"        # 默认语言为简体中文
+            "language": "zh_CN",       # 默认语言为简体中文
+            "top_writers_enabled": True,       # 级别跳变时采样写入最多的进程
+            "top_writers_count": 5,            # 报警中显示的进程数量
+            "top_writers_sample_seconds": 1.0, # 进程写入采样窗口（秒）
+            "burst_write_mb_per_sec": 50,      # 已用空间增长超过该速率视为写入突增，0表示禁用
+            "reclaim_analysis_enabled": True,  # 在状态窗口中显示可回收空间
+            "reclaim_cache_ttl": 600,          # 可回收空间统计结果缓存时间（秒）
+            "reclaim_max_workers": 4,          # 统计可回收空间的并发线程数
+            "hide_container_mounts": True,     # 不列出容器运行时创建的overlay等挂载点
+            "docker_root": DEFAULT_DOCKER_ROOT, # Docker 数据目录，用于容器存储分析
+            "cleanup_policies": [],            # 自动清理策略列表，见 cleanup.py
+            "cleanup_trigger_level": "warning",# 达到该级别时触发自动清理
+            "cleanup_dry_run": True,           # 只生成清理预览，不真正删除文件
+            "cleanup_max_iops": 100,           # 清理时每秒最多删除的文件数
+            "cleanup_max_mb_per_sec": 50,      # 清理时每秒最多释放的空间（MB），0表示不限
+            "cleanup_workers": 4,              # 并行删除的线程数
+            "compression_enabled": False,      # 接近警告阈值时后台压缩冷文件
+            "compression_paths": [],           # 允许压缩的目录列表
+            "compression_codec": "gzip",       # 压缩算法: gzip / lzma / zstd（需安装zstandard）
+            "compression_min_age_days": 90,    # 超过该天数未修改的文件才会被压缩
+            "compression_min_size_mb": 1,      # 小于该大小的文件不压缩
+            "compression_workers": 1,          # 压缩进程数（CPU预算）
+            "compression_max_mb_per_sec": 20,  # 每秒最多读取的数据量（I/O预算），0表示不限
+            "compression_trigger_margin": 5,   # 使用率达到 警告阈值-该值 时开始压缩
+            "ballast_files": {},               # 应急压舱文件: {驱动器: {"size_mb": 大小, "path": 可选路径}}
+            "latency_p99_threshold_ms": 1000,  # p99延迟超过该值时报警，0表示禁用
+            "latency_min_samples": 5,          # 样本数达到该值后才判断延迟报警
+            "latency_window_seconds": 900,     # 延迟分位数的统计窗口（秒）
+            "latency_probe_dirs": {},          # 写入探测目录: {驱动器: 目录}，为空表示不做写入探测
+            "self_cpu_percent_budget": 5,      # 监控程序自身CPU占用预算（%），0表示不限
+            "self_rss_mb_budget": 150,         # 自身常驻内存预算（MB）
+            "self_threads_budget": 50,         # 自身线程数预算
+            "self_fds_budget": 256,            # 自身打开文件句柄数预算
+            "self_check_seconds": 30,          # 自身资源采样周期（秒）
+            "alert_digest_min_alerts": 3,      # 同一批报警达到该数量时合并到汇总窗口，0表示总是逐个弹窗
+            "alert_digest_seconds": 2,         # 合并报警的等待时间（秒）
+            "alert_sinks": [{"type": "log"}],  # 无界面模式的报警输出，见 alert_sinks.py
+            "alert_repeat_minutes": 60,        # 无界面模式下级别不变的报警重复发出的间隔（分钟），0表示只在级别变化时发出
+            "metrics_port": 0,                 # Prometheus 指标端点的端口，0表示不启动
+            "metrics_host": "127.0.0.1",       # 指标端点监听的地址
+            "api_port": 0,                     # 网页接口和仪表盘的端口，0表示不启动
+            "api_host": "127.0.0.1",           # 网页接口监听的地址
+            "event_socket": ""                 # 事件订阅的 Unix 套接字路径，为空表示不启动
         }
         
         # 加载配置
@@ -495,22 +167,113 @@ class SimpleDiskMonitor:
             self.silent_mode = False  # 增加静默模式变量的显式初始化
             
             # 添加磁盘报警状态字典，用于防止重复弹窗
-            # 格式: {drive_path: {"critical": False, "warning": False, "notice": False}}
+            # 格式: {drive_path: {"critical": False, "warning": False, "notice": False, "latency": False}}
             self.alert_states = {}
             # 添加弹窗实例字典，用于跟踪当前打开的弹窗
             # 格式: {drive_path: {"critical": window_instance, "warning": window_instance, "notice": window_instance}}
             self.alert_windows = {}
+            # 每个驱动器上一轮的报警级别和已用空间，用于检测级别跳变和写入突增
+            # 格式: {drive_path: "critical"/"warning"/"notice"/"normal"}
+            self.drive_levels = {}
+            # 格式: {drive_path: (monotonic_time, used_bytes)}
+            self.last_usage = {}
             
         self.monitor_thread = None
+        # 立即检查的请求（--check-now），唤醒监控线程的等待
+        self.check_requested = threading.Event()
+        
+        # 可回收空间分析器，结果带TTL缓存
+        self.reclaim_analyzer = ReclaimAnalyzer(
+            ttl=self.config.get("reclaim_cache_ttl", 600),
+            max_workers=self.config.get("reclaim_max_workers", 4)
+        )
+        
+        # 正在进行年龄报告扫描的驱动器，避免重复扫描同一个卷
+        self.age_scans = set()
+        
+        # 容器存储分析器，镜像层大小按层ID缓存到应用数据目录
+        self.container_analyzer = ContainerUsageAnalyzer(
+            docker_root=self.config.get("docker_root", DEFAULT_DOCKER_ROOT),
+            cache_file=os.path.join(self.app_data_dir, "container_layer_cache.json")
+        )
+        self.container_scan_running = False
+        
+        # 正在执行自动清理的驱动器
+        self.cleanup_running = set()
+        # 无界面模式下已报告预览、等待下一轮检查确认的清理计划: {drive: (plan_id, policies)}
+        self.cleanup_pending = {}
+        
+        # 应急压舱文件
+        self.ballast = BallastManager()
+        
+        # 各挂载点的响应延迟直方图
+        self.latency = LatencyTracker(window_seconds=self.config.get("latency_window_seconds", 900))
+        self.latency.on_error = self._publish_probe_error
+        
+        # 报警汇总窗口和等待合并的报警，只在UI线程中访问
+        self.alert_digest = None
+        self.pending_alerts = []
+        self.alert_flush_scheduled = False
+        
+        # 无界面模式的报警去重和输出
+        self.alert_router = None
+        if headless:
+            self.alert_router = AlertRouter(build_sinks(self.config.get("alert_sinks", [])),
+                                            repeat_seconds=self.config.get("alert_repeat_minutes", 60) * 60)
+        
+        # 监控事件的监听器（--watch 等），在监控线程中调用，必须立即返回
+        self.listeners = []
+        # 每轮检查的耗时统计，随 cycle 记录发布
+        self.cycle_stats = {"count": 0, "sum": 0.0, "last": 0.0, "finished": 0.0}
+        # Prometheus 指标端点
+        self.metrics_server = None
+        self.metrics_exporter = None
+        # 网页接口和仪表盘
+        self.api_server = None
+        self.api_state = None
+        # Unix 套接字上的事件订阅
+        self.event_bus = None
+        
+        # 已用空间历史，用于计算增长速度
+        self.history = UsageHistory()
+        
+        # 实时磁盘状态窗口，打开时监控线程每次检查后推送新样本
+        self.status_view = None
+        self.status_view_open = False
+        
+        # 自身资源预算管控，超出预算时降低可选工作的强度
+        self.governor = SelfGovernor(
+            cpu_percent=self.config.get("self_cpu_percent_budget", 5),
+            rss_mb=self.config.get("self_rss_mb_budget", 150),
+            threads=self.config.get("self_threads_budget", 50),
+            fds=self.config.get("self_fds_budget", 256),
+            check_seconds=self.config.get("self_check_seconds", 30)
+        )
+        
+        # 冷文件后台压缩，进度保存在应用数据目录中，重启后继续
+        self.compressor = CompressionWorker(
+            state_file=os.path.join(self.app_data_dir, "compression_state.json"),
+            workers=self.config.get("compression_workers", 1),
+            max_bytes_per_sec=self.config.get("compression_max_mb_per_sec", 20) * 1024 * 1024,
+            codec=self.config.get("compression_codec", "gzip"),
+            min_age_days=self.config.get("compression_min_age_days", 90),
+            min_size=int(self.config.get("compression_min_size_mb", 1) * 1024 * 1024)
+        )
         
         # UI通信队列
-        self.ui_queue = queue.Queue()
+        # 放入任务时唤醒Tk主线程，空闲时主线程不再轮询
+        self.ui_queue = WakeupQueue()
+        self.detach_ui_queue = None
         
         # Tkinter根窗口（隐藏）
         self.root = None
         
-        # 初始化托盘图标
-        self.setup_tray_icon()
+        # 托盘图标按 (使用率分桶, 级别) 缓存，图像在 setup_tray_icon() 中预先绘制
+        self.icon_cache = IconCache()
+        self.icon = None
+        self.tray_state = None
+        self.tray_tooltip = None
+        self.tray_drives = []
     
     def _get_program_dir(self):
         """获取程序所在目录，用于存放日志文件"""
@@ -564,8 +327,12 @@ class SimpleDiskMonitor:
             # 保存当前语言，用于下次检测变更
             self.last_language = current_language
             
-            # 处理开机自启动
-            self.set_autostart(self.config.get("run_at_startup", False))
+            # 处理开机自启动；无界面模式由 systemd 等服务管理器负责
+            if not self.headless:
+                self.set_autostart(self.config.get("run_at_startup", False))
+            
+            # 更新可回收空间缓存时间
+            self.reclaim_analyzer.ttl = self.config.get("reclaim_cache_ttl", 600)
             
             # 更新静默模式状态
             with self.lock:
@@ -574,6 +341,29 @@ class SimpleDiskMonitor:
         except Exception as e:
             logging.error(f"应用配置时出错: {e}", exc_info=True)
     
+    def reload_config(self):
+        """重新读取配置文件并应用（无界面模式收到 SIGHUP 时调用）"""
+        config = self.load_config()
+        with self.lock:
+            metrics_changed = any(config.get(key) != self.config.get(key) for key in ("metrics_port", "metrics_host"))
+            api_changed = any(config.get(key) != self.config.get(key) for key in ("api_port", "api_host"))
+            events_changed = config.get("event_socket") != self.config.get("event_socket")
+            self.config = config
+        if metrics_changed:
+            self.stop_metrics_server()
+            self.start_metrics_server()
+        if api_changed:
+            self.stop_api_server()
+            self.start_api_server()
+        if events_changed:
+            self.stop_event_bus()
+            self.start_event_bus()
+        self.apply_config()
+        if self.alert_router:
+            self.alert_router.sinks = build_sinks(config.get("alert_sinks", []))
+            self.alert_router.repeat_seconds = config.get("alert_repeat_minutes", 60) * 60
+        logging.info(f"已重新加载配置文件: {self.config_file}")
+    
     def set_autostart(self, enable):
         """设置开机自启动"""
         try:
@@ -644,32 +434,34 @@ class SimpleDiskMonitor:
     
     def get_available_drives(self):
         """获取所有可用的驱动器 - 使用更全面的实现方式"""
-        drives = []
-        
+        drives = list(self.iter_available_drives())
+        logging.info(f"最终检测到的可用驱动器: {drives}")
+        return drives
+    
+    def iter_available_drives(self):
+        """逐个生成可用的驱动器，供配置窗口在后台线程中增量显示"""
         try:
             # 输出更详细的日志，帮助诊断
             all_partitions = psutil.disk_partitions(all=True)
             logging.info(f"系统发现的所有分区: {[p.mountpoint for p in all_partitions]}")
             
+            with self.lock:
+                hide_container_mounts = self.config.get("hide_container_mounts", True)
+            
             for part in all_partitions:
                 try:
                     # 放宽检测条件，确保能检测到所有物理驱动器
-                    # 排除一些典型的非物理驱动器路径
-                    if (part.mountpoint and 
-                        not any(part.mountpoint.startswith(p) for p in ["/proc", "/sys", "/dev", "/run"])):
-                        drives.append(part.mountpoint)
+                    # 排除一些典型的非物理驱动器路径；容器运行时的overlay挂载点数量可能非常多，由容器存储视图统一展示
+                    if is_monitorable(part.mountpoint, part.fstype, hide_container_mounts):
                         logging.info(f"添加驱动器: {part.mountpoint} (类型: {part.fstype}, 选项: {part.opts})")
+                        yield part.mountpoint
                     else:
                         logging.debug(f"忽略分区: {part.mountpoint} (类型: {part.fstype}, 选项: {part.opts})")
                 except Exception as e:
                     logging.error(f"处理分区 {part.mountpoint} 时出错: {e}")
                     continue
-                    
-            logging.info(f"最终检测到的可用驱动器: {drives}")
         except Exception as e:
             logging.error(f"获取驱动器列表时出错: {e}", exc_info=True)
-                
-        return drives
     
     def get_drives_to_monitor(self):
         """获取需要监控的驱动器列表"""
@@ -687,13 +479,9 @@ class SimpleDiskMonitor:
     def get_disk_usage(self, drive):
         """获取指定驱动器的使用情况"""
         try:
-            usage = psutil.disk_usage(drive)
-            return {
-                "total": usage.total,
-                "used": usage.used,
-                "free": usage.free,
-                "percent": usage.percent
-            }
+            # 记录每次statvfs调用的耗时，用于发现响应缓慢的挂载点
+            # 除容量外还包含 inode 使用情况（Windows 上为 None）
+            return self.latency.timed(drive, "statvfs", disk_usage, drive)
         except Exception as e:
             logging.error(f"获取驱动器 {drive} 使用情况失败: {e}")
             return None
@@ -709,6 +497,7 @@ class SimpleDiskMonitor:
             critical_drives = []  # 严重级别
             warning_drives = []   # 警告级别
             notice_drives = []    # 提示级别
+            normal_drives = []    # 未达到任何阈值
             
             for drive in self.get_drives_to_monitor():
                 try:
@@ -718,6 +507,7 @@ class SimpleDiskMonitor:
                     
                     percent = usage["percent"]
                     logging.info(f"磁盘 {drive} 使用率: {percent:.1f}%")
+                    self.history.record(drive, usage["used"], usage["total"])
                     
                     # 使用统一的逻辑进行分类
                     if percent >= critical_threshold:
@@ -738,23 +528,403 @@ class SimpleDiskMonitor:
                             "usage": usage,
                             "level": "notice"
                         })
+                    else:
+                        normal_drives.append({
+                            "drive": drive,
+                            "usage": usage,
+                            "level": "normal"
+                        })
                 except Exception as e:
                     logging.error(f"检查驱动器 {drive} 时出错: {e}")
                     # 继续检查下一个驱动器，而不是中断整个过程
                     continue
             
-            # 返回所有需要提醒的驱动器
+            # 返回所有需要提醒的驱动器，以及未达到阈值的驱动器（用于检测级别跳变）
             return {
                 "critical": critical_drives,
                 "warning": warning_drives,
-                "notice": notice_drives
+                "notice": notice_drives,
+                "normal": normal_drives
             }
         except Exception as e:
             logging.error(f"检查磁盘使用情况时出错: {e}", exc_info=True)
-            return {"critical": [], "warning": [], "notice": []}
+            return {"critical": [], "warning": [], "notice": [], "normal": []}
+    
+    def _detect_transitions(self, disk_status):
+        """
+        与上一轮检查结果比较，找出报警级别升高或出现写入突增的驱动器
+        
+        返回:
+            list: 发生跳变的驱动器信息列表
+        """
+        now = time.monotonic()
+        with self.lock:
+            burst_rate = self.config.get("burst_write_mb_per_sec", 50) * 1024 * 1024
+        
+        transitions = []
+        for level in ("critical", "warning", "notice", "normal"):
+            for drive_info in disk_status.get(level, []):
+                drive = drive_info["drive"]
+                used = drive_info["usage"]["used"]
+                with self.lock:
+                    previous = self.drive_levels.get(drive, "normal")
+                    self.drive_levels[drive] = level
+                    last = self.last_usage.get(drive)
+                    self.last_usage[drive] = (now, used)
+                
+                burst = False
+                if last and burst_rate > 0 and now > last[0]:
+                    burst = (used - last[1]) / (now - last[0]) >= burst_rate
+                
+                if level != previous and self.listeners:
+                    self._publish(self._event_record("transition", drive_info, previous=previous))
+                
+                if LEVEL_ORDER[level] > LEVEL_ORDER[previous]:
+                    logging.info(f"磁盘 {drive} 报警级别从 {previous} 升至 {level}")
+                    transitions.append(drive_info)
+                elif burst:
+                    logging.info(f"磁盘 {drive} 检测到写入突增")
+                    transitions.append(drive_info)
+        return transitions
+    
+    def add_listener(self, listener):
+        """注册监控事件的监听器：listener(record)，record["type"] 为 sample、transition、error 或 cycle"""
+        self.listeners.append(listener)
+    
+    def _publish(self, record):
+        for listener in list(self.listeners):
+            try:
+                listener(record)
+            except Exception as e:
+                logging.error(f"监控事件监听器出错: {e}", exc_info=True)
+    
+    def _event_record(self, kind, drive_info, **extra):
+        """生成发布给监听器的记录"""
+        usage = drive_info["usage"]
+        record = {
+            "type": kind,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": socket.gethostname(),
+            "drive": drive_info["drive"],
+            "level": drive_info["level"],
+            "percent": usage["percent"],
+            "total": usage["total"],
+            "used": usage["used"],
+            "free": usage["free"],
+        }
+        record.update(extra)
+        return record
+    
+    def _publish_samples(self, disk_status):
+        """每个驱动器发布一条 sample 记录"""
+        for level in ("critical", "warning", "notice", "normal"):
+            for drive_info in disk_status.get(level, []):
+                self._publish(self._event_record("sample", drive_info))
+    
+    def _publish_probe_error(self, drive, kind, error):
+        """探测失败时发布 error 记录；写入探测失败时在探测线程中调用"""
+        if not self.listeners:
+            return
+        self._publish({
+            "type": "error",
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": socket.gethostname(),
+            "drive": drive,
+            "probe": kind,
+            "message": str(error) if error is not None else "",
+            "errors": self.latency.errors(drive, kind),
+        })
+    
+    def _publish_cycle(self, disk_status, duration):
+        """一轮检查结束后发布 cycle 记录：所有驱动器的使用情况、级别、探测延迟和本轮耗时"""
+        stats = self.cycle_stats
+        stats["count"] += 1
+        stats["sum"] += duration
+        stats["last"] = duration
+        stats["finished"] = time.time()
+        with self.lock:
+            thresholds = {level: self.config.get(f"{level}_threshold", default)
+                          for level, default in (("critical", 90), ("warning", 75), ("notice", 60))}
+        drives = [{"drive": d["drive"], "level": d["level"], "usage": d["usage"],
+                   "latency": self.latency.summary(d["drive"])}
+                  for level in ("critical", "warning", "notice", "normal") for d in disk_status.get(level, [])]
+        self._publish({"type": "cycle", "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "drives": drives,
+                       "thresholds": thresholds, "cycle_stats": dict(stats)})
+    
+    def start_metrics_server(self):
+        """配置了 metrics_port 时启动 Prometheus 指标端点"""
+        with self.lock:
+            port = self.config.get("metrics_port", 0)
+            host = self.config.get("metrics_host", "127.0.0.1")
+        if not port or self.metrics_server:
+            return
+        from metrics import MetricsExporter, start_server
+        exporter = MetricsExporter(self.latency.error_counts)
+        try:
+            self.metrics_server = start_server(exporter, host, port)
+        except OSError as e:
+            logging.error(f"无法启动指标端点 {host}:{port}: {e}")
+            return
+        self.metrics_exporter = exporter
+        self.add_listener(exporter)
+    
+    def stop_metrics_server(self):
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+        if self.metrics_exporter in self.listeners:
+            self.listeners.remove(self.metrics_exporter)
+        self.metrics_exporter = None
+    
+    def start_api_server(self):
+        """配置了 api_port 时启动网页接口和仪表盘"""
+        with self.lock:
+            port = self.config.get("api_port", 0)
+            host = self.config.get("api_host", "127.0.0.1")
+        if not port or self.api_server:
+            return
+        from web_api import ApiState, start_server
+        state = ApiState(self.history)
+        try:
+            self.api_server = start_server(state, host, port)
+        except OSError as e:
+            logging.error(f"无法启动网页接口 {host}:{port}: {e}")
+            return
+        self.api_state = state
+        self.add_listener(state)
+    
+    def stop_api_server(self):
+        if self.api_server:
+            self.api_server.shutdown()
+            self.api_server.server_close()
+            self.api_server = None
+        if self.api_state in self.listeners:
+            self.listeners.remove(self.api_state)
+        self.api_state = None
+    
+    def start_event_bus(self):
+        """配置了 event_socket 时开始在 Unix 套接字上接受事件订阅"""
+        with self.lock:
+            path = self.config.get("event_socket", "")
+        if not path or self.event_bus:
+            return
+        from event_bus import EventBus
+        bus = EventBus(os.path.expanduser(os.path.expandvars(path)))
+        try:
+            bus.start()
+        except OSError as e:
+            logging.error(f"无法启动事件订阅套接字 {path}: {e}")
+            return
+        self.event_bus = bus
+        self.add_listener(bus)
+    
+    def stop_event_bus(self):
+        if self.event_bus in self.listeners:
+            self.listeners.remove(self.event_bus)
+        if self.event_bus:
+            self.event_bus.stop()
+            self.event_bus = None
+    
+    def _attach_top_writers(self, transitions, drives):
+        """对发生跳变的驱动器采样写入最多的进程，结果附加到驱动器信息中"""
+        with self.lock:
+            enabled = self.config.get("top_writers_enabled", True)
+            top_n = self.config.get("top_writers_count", 5)
+            sample_seconds = self.config.get("top_writers_sample_seconds", 1.0)
+        
+        # 只有会弹出报警的驱动器才需要归因
+        targets = [d for d in transitions if d["level"] != "normal"]
+        if not enabled or not targets:
+            return
+        
+        # 同一轮内多个驱动器跳变时只采样一次
+        writers = ProcessWriteSampler(sample_seconds, top_n).sample(drives)
+        for drive_info in targets:
+            drive_info["top_writers"] = writers_for_drive(writers, drive_info["drive"])
+    
+    def _cleanup_engine(self):
+        with self.lock:
+            return CleanupEngine(
+                max_iops=self.config.get("cleanup_max_iops", 100),
+                max_bytes_per_sec=self.config.get("cleanup_max_mb_per_sec", 50) * 1024 * 1024,
+                workers=self.config.get("cleanup_workers", 4)
+            )
+    
+    def _trigger_cleanup(self, transitions, drives):
+        """对达到触发级别且配置了清理策略的驱动器，在后台线程中执行清理"""
+        with self.lock:
+            policies = self.config.get("cleanup_policies", [])
+            trigger_level = self.config.get("cleanup_trigger_level", "warning")
+            dry_run = self.config.get("cleanup_dry_run", True)
+        if not policies:
+            return
+        
+        for drive_info in transitions:
+            drive = drive_info["drive"]
+            if LEVEL_ORDER[drive_info["level"]] < LEVEL_ORDER.get(trigger_level, LEVEL_ORDER["warning"]):
+                continue
+            drive_policies = policies_for_drive(policies, drive, drives)
+            if drive_policies:
+                self._start_cleanup(drive, drive_policies, dry_run)
+    
+    def _start_cleanup(self, drive, policies, dry_run, approved_plan=None):
+        """
+        在后台线程中执行清理，同一驱动器同时只运行一个清理任务
+
+        关闭 dry_run 时只有 approved_plan 与当前计划一致才会删除，否则只生成预览等待确认，见 cleanup.py
+        """
+        with self.lock:
+            if drive in self.cleanup_running:
+                logging.info(f"磁盘 {drive} 的清理任务正在执行，跳过")
+                return
+            self.cleanup_running.add(drive)
+        threading.Thread(target=self._cleanup_worker, args=(drive, policies, dry_run, approved_plan),
+                         daemon=True).start()
+    
+    def _confirm_pending_cleanups(self, disk_status):
+        """无界面模式：上一轮已报告预览且仍处于触发级别的驱动器，计划不变时执行删除"""
+        with self.lock:
+            if not self.cleanup_pending:
+                return
+            pending = dict(self.cleanup_pending)
+            self.cleanup_pending.clear()
+            trigger_level = self.config.get("cleanup_trigger_level", "warning")
+            dry_run = self.config.get("cleanup_dry_run", True)
+        if dry_run:
+            return
+        levels = {d["drive"]: d["level"] for level in disk_status.values() for d in level}
+        for drive, (approved_plan, policies) in pending.items():
+            level = levels.get(drive)
+            if level is None or LEVEL_ORDER[level] < LEVEL_ORDER.get(trigger_level, LEVEL_ORDER["warning"]):
+                logging.info(f"磁盘 {drive} 已低于清理触发级别，放弃待确认的清理计划")
+                continue
+            self._start_cleanup(drive, policies, False, approved_plan)
+    
+    def _manage_ballast(self, disk_status, transitions):
+        """在严重级别跳变时释放压舱文件，使用率回落到警告阈值以下后重新创建"""
+        with self.lock:
+            ballast_files = self.config.get("ballast_files", {})
+            warning_threshold = self.config.get("warning_threshold", 75)
+        if not ballast_files:
+            return
+        
+        for drive_info in transitions:
+            settings = ballast_files.get(drive_info["drive"])
+            if settings and drive_info["level"] == "critical":
+                path = settings.get("path") or default_ballast_path(drive_info["drive"])
+                drive_info["ballast_released"] = self.ballast.release(drive_info["drive"], path)
+        
+        for level in ("warning", "notice", "normal"):
+            for drive_info in disk_status.get(level, []):
+                settings = ballast_files.get(drive_info["drive"])
+                if not settings:
+                    continue
+                path = settings.get("path") or default_ballast_path(drive_info["drive"])
+                size = int(settings.get("size_mb", 1024) * 1024 * 1024)
+                self.ballast.ensure(drive_info["drive"], path, size, drive_info["usage"], warning_threshold)
+    
+    def _sample_self_usage(self):
+        """采样自身资源占用，并在降级级别升高时暂停可选工作、清空缓存"""
+        try:
+            old_level, new_level = self.governor.sample()
+        except Exception as e:
+            logging.error(f"采样自身资源占用时出错: {e}", exc_info=True)
+            return
+        if new_level > old_level:
+            if new_level >= 2:
+                self.compressor.stop()
+            if new_level >= 3:
+                self.reclaim_analyzer.invalidate()
+    
+    def _check_latency(self, disk_status):
+        """启动写入探测，并对p99延迟超过阈值的挂载点发出报警"""
+        with self.lock:
+            probe_dirs = self.config.get("latency_probe_dirs", {})
+            threshold_ms = self.config.get("latency_p99_threshold_ms", 1000)
+            min_samples = self.config.get("latency_min_samples", 5)
+        
+        if probe_dirs and self.governor.allows_optional_work():
+            self.latency.start_write_probes(probe_dirs)
+        if threshold_ms <= 0:
+            return
+        
+        for level in ("critical", "warning", "notice", "normal"):
+            for drive_info in disk_status.get(level, []):
+                summary = self.latency.summary(drive_info["drive"])
+                slow = {kind: stats for kind, stats in summary.items()
+                        if stats["count"] >= min_samples and stats["p99_ms"] >= threshold_ms}
+                if slow:
+                    logging.warning(f"磁盘 {drive_info['drive']} 响应缓慢: {slow}")
+                    self.show_alert({
+                        "drive": drive_info["drive"],
+                        "usage": drive_info["usage"],
+                        "level": "latency",
+                        "latency": slow
+                    })
+    
+    def _maybe_start_compression(self, disk_status):
+        """使用率接近警告阈值且配置了压缩目录的驱动器，启动一轮后台压缩"""
+        with self.lock:
+            enabled = self.config.get("compression_enabled", False)
+            paths = self.config.get("compression_paths", [])
+            start_percent = self.config.get("warning_threshold", 75) - self.config.get("compression_trigger_margin", 5)
+        if not enabled or not paths or not self.governor.allows_optional_work():
+            return
+        
+        drive_infos = [d for level in disk_status.values() for d in level]
+        drives = [d["drive"] for d in drive_infos]
+        for drive_info in drive_infos:
+            drive = drive_info["drive"]
+            if drive_info["usage"]["percent"] < start_percent or self.compressor.is_running(drive):
+                continue
+            roots = roots_for_drive(paths, drive, drives)
+            if roots:
+                self.compressor.start(drive, roots)
+    
+    def _cleanup_worker(self, drive, policies, dry_run, approved_plan=None):
+        """执行清理并把结果报告给UI"""
+        try:
+            logging.info(f"开始清理磁盘 {drive}: {len(policies)} 条策略，{'预览模式' if dry_run else '执行删除'}")
+            report = self._cleanup_engine().run(policies, dry_run=dry_run, approved_plan=approved_plan)
+            with self.lock:
+                silent = self.silent_mode
+                if report["approval_required"] and self.headless:
+                    # 预览已写入日志，下一轮检查时计划不变才执行删除
+                    self.cleanup_pending[drive] = (report["plan_id"], policies)
+            if self.headless:
+                logging.info(self._format_cleanup_report(drive, report))
+            elif not silent:
+                # 需要确认的预览在静默模式下不显示，因此也不会删除
+                self.ui_queue.put(("show_cleanup_report", drive, report, policies))
+        except Exception as e:
+            logging.error(f"清理磁盘 {drive} 时出错: {e}", exc_info=True)
+        finally:
+            with self.lock:
+                self.cleanup_running.discard(drive)
+    
+    def _format_alert_details(self, drive_info):
+        """生成附加在报警消息后面的详细信息"""
+        lines = []
+        if drive_info.get("ballast_released"):
+            lines.append(self._("ballast_released", drive_info["ballast_released"] / (1024**3)))
+        
+        writers = drive_info.get("top_writers")
+        if writers:
+            if lines:
+                lines.append("")
+            lines.append(self._("top_writers_header"))
+            for writer in writers:
+                lines.append(self._("top_writer_line", writer["name"] or "?", writer["pid"],
+                                    writer["rate"] / (1024**2)))
+        
+        return "\n\n" + "\n".join(lines) if lines else ""
     
     def show_alert(self, drive_info):
         """显示磁盘警告窗口"""
+        if self.headless:
+            self._emit_headless_alert(drive_info)
+            return
         with self.lock:
             drive = drive_info["drive"]
             level = drive_info["level"]
@@ -765,10 +935,10 @@ class SimpleDiskMonitor:
             
             # 检查该磁盘是否初始化了状态
             if drive not in self.alert_states:
-                self.alert_states[drive] = {"critical": False, "warning": False, "notice": False}
+                self.alert_states[drive] = {"critical": False, "warning": False, "notice": False, "latency": False}
             
             if drive not in self.alert_windows:
-                self.alert_windows[drive] = {"critical": None, "warning": None, "notice": None}
+                self.alert_windows[drive] = {"critical": None, "warning": None, "notice": None, "latency": None}
             
             # 检查当前是否已经有相同类型的弹窗
             if self.alert_states[drive][level]:
@@ -788,6 +958,85 @@ class SimpleDiskMonitor:
         
         # 将警告放入队列，由主线程处理
         self.ui_queue.put(("show_alert", drive_info))
+    
+    def _emit_headless_alert(self, drive_info):
+        """无界面模式：级别变化或超过重复间隔时把报警发给各个输出"""
+        if not self.alert_router.should_emit(drive_info):
+            return
+        drive = drive_info["drive"]
+        level = drive_info["level"]
+        usage = drive_info["usage"]
+        if level == "latency":
+            p99 = max(stats["p99_ms"] for stats in drive_info["latency"].values())
+            message = self._("sink_latency_line", drive, p99)
+        else:
+            message = self._("sink_alert_line", drive, self._("level_" + level), usage["percent"],
+                             usage["free"] / (1024**3))
+        # 报警详情压缩为一行
+        details = [line.strip() for line in self._format_alert_details(drive_info).splitlines() if line.strip()]
+        if details:
+            message += " | " + "; ".join(details)
+        event = {
+            "event": "alert",
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": socket.gethostname(),
+            "drive": drive,
+            "level": level,
+            "percent": usage["percent"],
+            "used": usage["used"],
+            "total": usage["total"],
+            "free": usage["free"],
+            "message": message,
+        }
+        for key in ("latency", "top_writers", "ballast_released"):
+            if drive_info.get(key):
+                event[key] = drive_info[key]
+        self.alert_router.emit(event)
+    
+    def _resolve_headless_alerts(self, disk_status):
+        """无界面模式：本轮不再报警的驱动器发出 resolved 事件"""
+        usage_by_drive = {d["drive"]: d["usage"] for level in disk_status.values() for d in level}
+        for drive, level in self.alert_router.end_cycle(set(usage_by_drive)):
+            usage = usage_by_drive[drive]
+            self.alert_router.emit({
+                "event": "resolved",
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "host": socket.gethostname(),
+                "drive": drive,
+                "level": level,
+                "percent": usage["percent"],
+                "used": usage["used"],
+                "total": usage["total"],
+                "free": usage["free"],
+                "message": self._("sink_resolved_line", drive, self._("level_" + level), usage["percent"]),
+            })
+
+    def handle_forwarded_command(self, command):
+        """
+        执行其他进程转发来的命令，在命令端点的线程中调用
+
+        返回:
+            str: 回复给转发进程的说明；命令在当前模式下无法执行时抛出 ValueError
+        """
+        if command == "check-now":
+            self.check_requested.set()
+            return self._("forward_check_now")
+        if command == "open-settings":
+            if self.headless:
+                raise ValueError(self._("forward_no_settings"))
+            self.ui_queue.put(("open_config",))
+            return self._("forward_open_settings")
+        if command == "reload":
+            if self.headless:
+                # 交给 headless.serve() 的主线程，与 SIGHUP 触发的重新加载串行执行
+                import headless
+                if not headless.request_reload():
+                    self.reload_config()
+            else:
+                # 重新加载会刷新托盘图标，交给主线程执行
+                self.ui_queue.put(("reload_config",))
+            return self._("forward_reload")
+        raise ValueError(command)
 
     def start_monitoring(self):
         """开始监控磁盘使用情况"""
@@ -798,6 +1047,13 @@ class SimpleDiskMonitor:
             
             self.running = True
         
+        # 接受之后启动的 --check-now / --open-settings / --reload 转发来的命令；
+        # 在这里而不是 __init__ 中启动，无界面模式下线程在 headless.serve() 屏蔽信号之后才创建
+        self.single_instance.serve(self.handle_forwarded_command)
+        self.start_metrics_server()
+        self.start_api_server()
+        self.start_event_bus()
+        
         self.monitor_thread = threading.Thread(target=self._monitor_thread)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -833,8 +1089,32 @@ class SimpleDiskMonitor:
                         break
                 
                 try:
+                    cycle_start = time.perf_counter()
                     # 检查磁盘使用情况
                     disk_status = self.check_disk_usage()
+                    self._update_tray_status(disk_status)
+                    if self.listeners:
+                        self._publish_samples(disk_status)
+                    if self.headless:
+                        self.alert_router.begin_cycle()
+                    
+                    # 仅在级别跳变或写入突增时采样进程写入，稳态下没有额外开销
+                    transitions = self._detect_transitions(disk_status)
+                    
+                    # 压舱文件：进入严重级别立即释放，必须在弹窗和采样之前完成
+                    self._manage_ballast(disk_status, transitions)
+                    if transitions:
+                        all_drives = [d["drive"] for level in disk_status.values() for d in level]
+                        self._attach_top_writers(transitions, all_drives)
+                        self._trigger_cleanup(transitions, all_drives)
+                    if self.headless:
+                        self._confirm_pending_cleanups(disk_status)
+                    
+                    # 接近警告阈值的驱动器启动后台压缩
+                    self._maybe_start_compression(disk_status)
+                    
+                    # 写入探测和延迟报警
+                    self._check_latency(disk_status)
                     
                     # 处理严重级别的警告 - 直接显示警告，不考虑上次提醒时间
                     for drive_info in disk_status["critical"]:
@@ -847,6 +1127,19 @@ class SimpleDiskMonitor:
                     # 处理提示级别
                     for drive_info in disk_status["notice"]:
                         self.show_alert(drive_info)
+                    
+                    if self.headless:
+                        self._resolve_headless_alerts(disk_status)
+                    
+                    # 状态窗口打开时推送新样本，窗口只更新变化的单元格
+                    with self.lock:
+                        status_view_open = self.status_view_open
+                    if status_view_open:
+                        live_drives = self._decorate_drive_infos(disk_status)
+                        self.ui_queue.put(("update_disk_status", live_drives))
+                    
+                    if self.listeners:
+                        self._publish_cycle(disk_status, time.perf_counter() - cycle_start)
                 except Exception as e:
                     logging.error(f"监控过程中处理磁盘状态时出错: {e}", exc_info=True)
                 
@@ -854,6 +1147,8 @@ class SimpleDiskMonitor:
                     # 获取检查间隔（分钟转换为秒）
                     with self.lock:
                         check_interval = int(self.config.get("check_interval", 5) * 60)
+                    # 自身资源超出预算时延长检查间隔
+                    check_interval *= self.governor.interval_multiplier()
                     logging.info(f"磁盘检查完成，下次检查将在 {check_interval/60:.1f} 分钟后进行...")
                     
                     # 分段睡眠，使得在停止监控时能更快响应
@@ -863,7 +1158,12 @@ class SimpleDiskMonitor:
                             if not self.running:
                                 logging.info("睡眠过程中收到停止信号，提前退出")
                                 break
-                        time.sleep(1)
+                        if self.governor.due():
+                            self._sample_self_usage()
+                        if self.check_requested.wait(1):
+                            self.check_requested.clear()
+                            logging.info("收到立即检查的请求")
+                            break
                 except Exception as e:
                     logging.error(f"监控线程等待时出错: {e}", exc_info=True)
                     # 如果出错，等待短时间后继续
@@ -877,6 +1177,7 @@ class SimpleDiskMonitor:
     
     def create_disk_icon(self):
         """创建磁盘图标"""
+        from PIL import Image, ImageDraw
         img = Image.new('RGBA', (64, 64), color=(0, 0, 0, 0))
         d = ImageDraw.Draw(img)
         
@@ -892,8 +1193,11 @@ class SimpleDiskMonitor:
 
     def setup_tray_icon(self):
         """设置系统托盘图标 - 确保线程安全"""
-        # 创建图标图像
-        icon_image = self.create_disk_icon()
+        self.icon_cache.prerender()
+        # 创建图标图像；监控线程已经完成第一次检查时直接显示对应的状态图标
+        with self.lock:
+            state = self.tray_state
+        icon_image = self.icon_cache.get(*state) if state else self.create_disk_icon()
         
         # 保存当前语言，用于检测变更
         self.last_language = self.config.get("language", "zh_CN")
@@ -901,12 +1205,19 @@ class SimpleDiskMonitor:
         # 创建托盘图标
         self.create_tray_icon(icon_image)
         
+        # 创建图标期间状态又发生了变化
+        with self.lock:
+            latest = self.tray_state
+        if latest and latest != state:
+            self.icon.icon = self.icon_cache.get(*latest)
+        
         # 在单独的线程中运行图标
         logging.info("启动系统托盘图标")
         threading.Thread(target=self.icon.run, daemon=True).start()
     
     def create_tray_icon(self, icon_image):
         """创建托盘图标 - 封装为方法便于更新"""
+        import pystray
         # 创建菜单项 - 确保所有UI操作都通过队列处理
         def open_config_window():
             # 线程安全：通过队列将UI操作传递到主线程
@@ -921,17 +1232,26 @@ class SimpleDiskMonitor:
                 # 不要直接在非主线程启动新线程，而是通过队列请求
                 self.ui_queue.put(("run_disk_check",))
         
+        def show_self_usage():
+            logging.info("用户查看了资源占用")
+            with self.lock:
+                self.ui_queue.put(("show_self_usage",))
+        
         def safe_exit():
             # 线程安全：通过队列请求退出程序
             logging.info("用户通过托盘菜单请求退出")
             with self.lock:  # 加锁确保线程安全
                 self.ui_queue.put(("exit_app",))
         
-        # 创建托盘图标菜单，使用翻译后的文本
+        # 创建托盘图标菜单；文本在每次显示菜单时按当前语言和状态生成，
+        # 语言或状态变化后调用 icon.update_menu() 即可刷新，不需要重建图标
         menu = pystray.Menu(
-            pystray.MenuItem(self._("check_now"), check_now),
-            pystray.MenuItem(self._("settings"), open_config_window),
-            pystray.MenuItem(self._("exit"), safe_exit)
+            pystray.MenuItem(lambda item: self._tray_status_line(), None, enabled=False,
+                             visible=lambda item: bool(self._tray_status_line())),
+            pystray.MenuItem(lambda item: self._("check_now"), check_now),
+            pystray.MenuItem(lambda item: self._("settings"), open_config_window),
+            pystray.MenuItem(lambda item: self._("self_usage"), show_self_usage),
+            pystray.MenuItem(lambda item: self._("exit"), safe_exit)
         )
         
         # 创建托盘图标
@@ -942,26 +1262,66 @@ class SimpleDiskMonitor:
             menu
         )
     
+    def _tray_status_line(self):
+        """托盘菜单第一行：最严重驱动器的状态，还没有检查结果时为空"""
+        with self.lock:
+            worst = worst_drive(self.tray_drives)
+        if worst is None:
+            return ""
+        return self._("tray_tooltip_line", worst["drive"], worst["usage"]["percent"], self._("level_" + worst["level"]))
+    
+    def _update_tray_status(self, disk_status):
+        """
+        让托盘图标显示最严重驱动器的使用率和级别，并更新悬停提示
+
+        图标取自缓存，只有分桶或级别变化时才替换；提示文本变化时才更新。
+        """
+        if self.headless:
+            return
+        drive_infos = [d for level in ("critical", "warning", "notice", "normal") for d in disk_status.get(level, [])]
+        worst = worst_drive(drive_infos)
+        if worst is None:
+            return
+        state = (bucket_for(worst["usage"]["percent"]), worst["level"])
+        tooltip = tooltip_text(self._("app_name"), drive_infos, self._)
+        
+        status_line = self._tray_status_line()
+        with self.lock:
+            self.tray_drives = drive_infos
+            icon_changed = state != self.tray_state
+            tooltip_changed = tooltip != self.tray_tooltip
+            self.tray_state = state
+            self.tray_tooltip = tooltip
+        
+        icon = self.icon
+        if icon is None:
+            return
+        try:
+            if icon_changed:
+                icon.icon = self.icon_cache.get(*state)
+                logging.info(f"托盘图标更新为: 磁盘 {worst['drive']} 分桶 {state[0]} 级别 {state[1]}")
+            if tooltip_changed:
+                icon.title = tooltip
+            # 菜单中的状态行变化时原地刷新菜单
+            if self._tray_status_line() != status_line:
+                icon.update_menu()
+        except Exception as e:
+            logging.error(f"更新托盘图标状态时出错: {e}", exc_info=True)
+    
     def update_tray_icon(self):
-        """在语言变更后更新托盘图标"""
+        """在语言变更后原地刷新托盘菜单和提示文本，不重启托盘图标"""
         try:
-            # 先停止现有托盘图标
-            if hasattr(self, 'icon') and self.icon:
-                try:
-                    self.icon.stop()
-                    # 等待托盘图标完全停止
-                    time.sleep(0.5)
-                    logging.info("已停止旧托盘图标")
-                except Exception as e:
-                    logging.error(f"停止旧托盘图标时出错: {e}", exc_info=True)
-            
-            # 创建新图标
-            icon_image = self.create_disk_icon()
-            self.create_tray_icon(icon_image)
-            
-            # 重新启动托盘图标
-            threading.Thread(target=self.icon.run, daemon=True).start()
-            logging.info("托盘图标已更新为新语言")
+            icon = self.icon
+            if icon is None:
+                return
+            with self.lock:
+                drive_infos = list(self.tray_drives)
+            tooltip = tooltip_text(self._("app_name"), drive_infos, self._) if drive_infos else self._("app_name")
+            with self.lock:
+                self.tray_tooltip = tooltip
+            icon.title = tooltip
+            icon.update_menu()
+            logging.info("托盘菜单已更新为新语言")
         except Exception as e:
             logging.error(f"更新托盘图标时出错: {e}", exc_info=True)
     
@@ -970,20 +1330,21 @@ class SimpleDiskMonitor:
         try:
             logging.info("开始执行磁盘检查")
             disk_status = self.check_disk_usage()
+            self._update_tray_status(disk_status)
             
-            # 收集所有驱动器的状态
-            all_drives = []
-            all_drives.extend(disk_status["critical"])
-            all_drives.extend(disk_status["warning"])
-            all_drives.extend(disk_status["notice"])
+            # 状态窗口可以排序，因此显示所有驱动器，而不只是达到阈值的驱动器
+            all_drives = self._decorate_drive_infos(disk_status)
             
-            if not all_drives:
-                # 如果没有达到任何阈值的驱动器，显示所有驱动器的状态
-                drives = self.get_drives_to_monitor()
-                for drive in drives:
-                    usage = self.get_disk_usage(drive)
-                    if usage:
-                        all_drives.append({"drive": drive, "usage": usage, "level": "normal"})
+            # 统计可回收空间（在后台线程中执行，结果有缓存）
+            with self.lock:
+                reclaim_enabled = self.config.get("reclaim_analysis_enabled", True)
+            if reclaim_enabled and all_drives and self.governor.allows_optional_work():
+                try:
+                    reclaimable = self.reclaim_analyzer.analyze([d["drive"] for d in all_drives])
+                    for drive_info in all_drives:
+                        drive_info["reclaimable"] = reclaimable.get(drive_info["drive"])
+                except Exception as e:
+                    logging.error(f"统计可回收空间时出错: {e}", exc_info=True)
             
             # 将结果放入队列供主线程处理
             self.ui_queue.put(("show_disk_status", all_drives))
@@ -994,6 +1355,18 @@ class SimpleDiskMonitor:
             # 通知UI线程显示错误
             self.ui_queue.put(("show_error", str(e)))
     
+    def _decorate_drive_infos(self, disk_status):
+        """汇总所有级别的驱动器，并附加增长速度、压缩节省的空间和响应延迟"""
+        all_drives = []
+        for level in ("critical", "warning", "notice", "normal"):
+            all_drives.extend(disk_status.get(level, []))
+        for drive_info in all_drives:
+            drive = drive_info["drive"]
+            drive_info["growth"] = self.history.growth_rate(drive)
+            drive_info["compression_saved"] = self.compressor.state.saved_bytes(drive)
+            drive_info["latency"] = self.latency.summary(drive)
+        return all_drives
+    
     def check_queue(self):
         """检查UI队列，处理UI事件 - 增强错误处理和添加新任务类型"""
         try:
@@ -1010,15 +1383,39 @@ class SimpleDiskMonitor:
                         elif task[0] == "show_disk_status":
                             # 显示磁盘状态窗口
                             self._show_disk_status_window(task[1])
+                        elif task[0] == "update_disk_status":
+                            # 实时更新已打开的磁盘状态窗口
+                            self._update_disk_status_window(task[1])
+                        elif task[0] == "config_drive_event":
+                            # 配置窗口后台枚举驱动器的结果
+                            task[1].on_drive_event(*task[2:])
+                        elif task[0] == "digest_recheck_result":
+                            # 汇总窗口后台复查的结果
+                            task[1].apply_recheck(*task[2:])
                         elif task[0] == "show_error":
                             # 显示错误消息
                             self._show_error_dialog(task[1])
                         elif task[0] == "show_alert":
-                            # 显示磁盘警告
-                            self._show_alert_window(task[1])
+                            # 显示磁盘警告（可能合并到汇总窗口）
+                            self._queue_alert_window(task[1])
+                        elif task[0] == "reload_config":
+                            # 转发来的 --reload
+                            self.reload_config()
                         elif task[0] == "run_disk_check":
                             # 处理磁盘检查请求
                             self._handle_disk_check_request()
+                        elif task[0] == "show_age_report":
+                            # 显示文件年龄报告
+                            self._show_age_report_window(task[1])
+                        elif task[0] == "show_container_usage":
+                            # 显示容器存储占用
+                            self._show_container_usage_window(task[1])
+                        elif task[0] == "show_cleanup_report":
+                            # 显示自动清理结果或预览
+                            self._show_cleanup_report_window(task[1], task[2], task[3])
+                        elif task[0] == "show_self_usage":
+                            # 显示监控程序自身资源占用
+                            self._show_self_usage_window()
                         elif task[0] == "exit_app":
                             # 处理退出请求
                             self._handle_exit_request()
@@ -1034,16 +1431,12 @@ class SimpleDiskMonitor:
                     # 队列为空，跳出循环
                     break
                 except Exception as e:
+                    # 出错的任务已经取出；队列只在放入任务时唤醒主线程，
+                    # 这里跳出的话剩下的任务要等到下一次放入任务时才会处理
                     logging.error(f"处理队列时出错: {e}", exc_info=True)
-                    break
+                    continue
         except Exception as e:
             logging.error(f"检查队列过程出错: {e}", exc_info=True)
-        
-        # 安排下一次检查，如果root窗口仍然存在
-        if self.root and self.root.winfo_exists():
-            self.root.after(100, self.check_queue)
-        else:
-            logging.warning("根窗口不存在，停止队列检查")
     
     # 添加一个新方法处理托盘菜单中的磁盘检查请求
     def _handle_disk_check_request(self):
@@ -1060,6 +1453,7 @@ class SimpleDiskMonitor:
         """在主线程中创建配置窗口"""
         try:
             logging.info("创建配置窗口")
+            from config_window import ConfigWindow
             config_window = ConfigWindow(self, self.root)
             # 不调用mainloop()，因为这已经由主Tk实例处理
             logging.info("配置窗口创建成功")
@@ -1075,6 +1469,11 @@ class SimpleDiskMonitor:
             logging.error(f"显示磁盘状态窗口失败: {e}", exc_info=True)
             self._show_error_dialog(self._("config_window_error").format(e))
     
+    def _update_disk_status_window(self, drives_info):
+        """在主线程中把新样本应用到已打开的状态窗口"""
+        if self.status_view and self.status_view.exists():
+            self.status_view.update(drives_info)
+    
     def _show_error_dialog(self, error_message):
         """显示错误对话框"""
         try:
@@ -1082,6 +1481,74 @@ class SimpleDiskMonitor:
         except Exception as e:
             logging.error(f"显示错误对话框时出错: {e}", exc_info=True)
     
+    def _queue_alert_window(self, drive_info):
+        """
+        汇总模式下先暂存报警，等待一小段时间后批量显示
+
+        汇总窗口已打开时直接更新它；一批报警数量达到阈值时合并到汇总窗口，
+        否则仍然逐个弹窗。
+        """
+        with self.lock:
+            min_alerts = self.config.get("alert_digest_min_alerts", 3)
+            delay = self.config.get("alert_digest_seconds", 2)
+        
+        if min_alerts <= 0:
+            self._show_alert_window(drive_info)
+            return
+        if self.alert_digest and self.alert_digest.exists():
+            self._show_alert_digest([drive_info])
+            return
+        
+        self.pending_alerts.append(drive_info)
+        if not self.alert_flush_scheduled:
+            self.alert_flush_scheduled = True
+            self.root.after(int(delay * 1000), self._flush_alert_batch)
+    
+    def _flush_alert_batch(self):
+        """显示暂存的一批报警"""
+        self.alert_flush_scheduled = False
+        batch, self.pending_alerts = self.pending_alerts, []
+        with self.lock:
+            min_alerts = self.config.get("alert_digest_min_alerts", 3)
+        
+        if len(batch) >= min_alerts or (self.alert_digest and self.alert_digest.exists()):
+            logging.info(f"合并显示 {len(batch)} 条报警")
+            self._show_alert_digest(batch)
+        else:
+            for drive_info in batch:
+                self._show_alert_window(drive_info)
+    
+    def _show_alert_digest(self, drive_infos):
+        """把报警加入汇总窗口，窗口不存在时创建"""
+        try:
+            if self.alert_digest is None or not self.alert_digest.exists():
+                from alert_digest import AlertDigestWindow
+                self.alert_digest = AlertDigestWindow(self, self.root, self._on_digest_dismiss)
+            self.alert_digest.add(drive_infos)
+            
+            # 汇总窗口承担这些报警，已存在窗口的判断与单个弹窗一致
+            digest_ref = weakref.ref(self.alert_digest.window)
+            with self.lock:
+                for drive_info in drive_infos:
+                    drive, level = drive_info["drive"], drive_info["level"]
+                    self.alert_states.setdefault(drive, {"critical": False, "warning": False, "notice": False, "latency": False})
+                    self.alert_windows.setdefault(drive, {"critical": None, "warning": None, "notice": None, "latency": None})
+                    self.alert_states[drive][level] = True
+                    self.alert_windows[drive][level] = digest_ref
+        except Exception as e:
+            logging.error(f"显示报警汇总窗口时出错: {e}", exc_info=True)
+            self._on_digest_dismiss(drive_infos)
+    
+    def _on_digest_dismiss(self, drive_infos):
+        """汇总窗口中的报警被确认、解除或窗口关闭时重置报警状态"""
+        with self.lock:
+            for drive_info in drive_infos:
+                drive, level = drive_info["drive"], drive_info["level"]
+                if drive in self.alert_states:
+                    self.alert_states[drive][level] = False
+                    self.alert_windows[drive][level] = None
+        logging.info(f"报警汇总窗口中 {len(drive_infos)} 条报警已解除")
+    
     def _show_alert_window(self, drive_info):
         """根据报警级别显示不同的弹窗"""
         try:
@@ -1092,9 +1559,9 @@ class SimpleDiskMonitor:
             # 确保字典已初始化
             with self.lock:
                 if drive not in self.alert_states:
-                    self.alert_states[drive] = {"critical": False, "warning": False, "notice": False}
+                    self.alert_states[drive] = {"critical": False, "warning": False, "notice": False, "latency": False}
                 if drive not in self.alert_windows:
-                    self.alert_windows[drive] = {"critical": None, "warning": None, "notice": None}
+                    self.alert_windows[drive] = {"critical": None, "warning": None, "notice": None, "latency": None}
                 
                 # 再次检查是否需要显示弹窗 (防止队列处理延迟导致的重复弹窗)
                 if self.alert_states[drive][level]:
@@ -1108,12 +1575,16 @@ class SimpleDiskMonitor:
             used_gb = usage["used"] / (1024**3)
             free_gb = usage["free"] / (1024**3)
 
+            details = self._format_alert_details(drive_info)
+
             if level == "critical":
-                self._show_critical_alert(drive, percent, total_gb, used_gb, free_gb)
+                self._show_critical_alert(drive, percent, total_gb, used_gb, free_gb, details)
             elif level == "warning":
-                self._show_warning_alert(drive, percent, total_gb, used_gb, free_gb)
+                self._show_warning_alert(drive, percent, total_gb, used_gb, free_gb, details)
             elif level == "notice":
-                self._show_notice_alert(drive, percent, total_gb, used_gb, free_gb)
+                self._show_notice_alert(drive, percent, total_gb, used_gb, free_gb, details)
+            elif level == "latency":
+                self._show_latency_alert(drive, drive_info["latency"])
         except Exception as e:
             logging.error(f"显示警告窗口时出错: {e}", exc_info=True)
             # 出错时也要重置状态，避免卡死
@@ -1123,15 +1594,15 @@ class SimpleDiskMonitor:
                 if drive in self.alert_windows and level in self.alert_windows[drive]:
                     self.alert_windows[drive][level] = None
 
-    def _show_notice_alert(self, drive, percent, total_gb, used_gb, free_gb):
+    def _show_notice_alert(self, drive, percent, total_gb, used_gb, free_gb, details=""):
         """提示级别的弹窗"""
         title = self._("notice_title")
-        message = self._("notice_message", drive, percent, total_gb, used_gb, free_gb)
+        message = self._("notice_message", drive, percent, total_gb, used_gb, free_gb) + details
         
         # 创建信息窗口而不是使用messagebox，这样可以更好地控制窗口事件
         notice_window = tk.Toplevel(self.root)
         notice_window.title(title)
-        notice_window.geometry("400x200")
+        notice_window.geometry("400x320" if details else "400x200")
         
         # 窗口居中
         notice_window.update_idletasks()
@@ -1164,15 +1635,40 @@ class SimpleDiskMonitor:
         
         logging.info(f"显示提示: 磁盘 {drive} 使用率 {percent:.1f}%")
 
-    def _show_warning_alert(self, drive, percent, total_gb, used_gb, free_gb):
+    def _show_latency_alert(self, drive, latency):
+        """挂载点响应缓慢的弹窗"""
+        lines = [self._("latency_message", drive)]
+        for kind, stats in latency.items():
+            lines.append(self._("latency_line", kind, stats["p50_ms"], stats["p99_ms"], stats["max_ms"], stats["count"]))
+        
+        latency_window = tk.Toplevel(self.root)
+        latency_window.title(self._("latency_title"))
+        tk.Label(latency_window, text="\n".join(lines), wraplength=380, justify=tk.LEFT).pack(pady=20, padx=10)
+        
+        def on_close():
+            with self.lock:
+                if drive in self.alert_states:
+                    self.alert_states[drive]["latency"] = False
+                    self.alert_windows[drive]["latency"] = None
+            latency_window.destroy()
+        
+        tk.Button(latency_window, text=self._("close"), command=on_close, width=10).pack(pady=10)
+        latency_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        with self.lock:
+            self.alert_windows[drive]["latency"] = weakref.ref(latency_window)
+        
+        logging.warning(f"显示延迟警告: 磁盘 {drive} {latency}")
+
+    def _show_warning_alert(self, drive, percent, total_gb, used_gb, free_gb, details=""):
         """警告级别的弹窗"""
         title = self._("warning_title")
-        message = self._("warning_message", drive, percent, total_gb, used_gb, free_gb)
+        message = self._("warning_message", drive, percent, total_gb, used_gb, free_gb) + details
 
         # 创建警告窗口
         warning_window = tk.Toplevel(self.root)
         warning_window.title(title)
-        warning_window.geometry("400x200")
+        warning_window.geometry("400x320" if details else "400x200")
         
         # 窗口居中
         warning_window.update_idletasks()
@@ -1235,10 +1731,10 @@ class SimpleDiskMonitor:
             
         logging.info(f"显示警告: 磁盘 {drive} 使用率 {percent:.1f}%")
 
-    def _show_critical_alert(self, drive, percent, total_gb, used_gb, free_gb):
+    def _show_critical_alert(self, drive, percent, total_gb, used_gb, free_gb, details=""):
         """严重级别的弹窗"""
         title = self._("critical_title")
-        message = self._("critical_message", drive, percent, total_gb, used_gb, free_gb)
+        message = self._("critical_message", drive, percent, total_gb, used_gb, free_gb) + details
 
         # 创建非模态窗口
         critical_window = tk.Toplevel(self.root)
@@ -1248,7 +1744,7 @@ class SimpleDiskMonitor:
         screen_width = critical_window.winfo_screenwidth()
         screen_height = critical_window.winfo_screenheight()
         window_width = 400
-        window_height = 250
+        window_height = 370 if details else 250
         x_position = screen_width - window_width - 20
         y_position = screen_height - window_height - 50
         critical_window.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
@@ -1315,7 +1811,7 @@ class SimpleDiskMonitor:
                 for d in list(self.alert_states.keys()):
                     # 检查并关闭所有窗口
                     if d in self.alert_windows:
-                        for lvl in ["critical", "warning", "notice"]:
+                        for lvl in ["critical", "warning", "notice", "latency"]:
                             window_ref = self.alert_windows[d][lvl]
                             if window_ref and window_ref() and window_ref().winfo_exists():
                                 try:
@@ -1331,7 +1827,7 @@ class SimpleDiskMonitor:
                 if level is None:
                     # 重置指定驱动器的所有级别报警状态
                     if drive in self.alert_windows:
-                        for lvl in ["critical", "warning", "notice"]:
+                        for lvl in ["critical", "warning", "notice", "latency"]:
                             window_ref = self.alert_windows[drive][lvl]
                             if window_ref and window_ref() and window_ref().winfo_exists():
                                 try:
@@ -1339,8 +1835,8 @@ class SimpleDiskMonitor:
                                     logging.debug(f"重置状态时关闭磁盘 {drive} 的 {lvl} 窗口")
                                 except Exception as e:
                                     logging.error(f"关闭窗口时出错: {e}")
-                    self.alert_states[drive] = {"critical": False, "warning": False, "notice": False}
-                    self.alert_windows[drive] = {"critical": None, "warning": None, "notice": None}
+                    self.alert_states[drive] = {"critical": False, "warning": False, "notice": False, "latency": False}
+                    self.alert_windows[drive] = {"critical": None, "warning": None, "notice": None, "latency": None}
                     logging.debug(f"重置磁盘 {drive} 的所有报警状态")
                 else:
                     # 重置指定驱动器的指定级别报警状态
@@ -1358,89 +1854,251 @@ class SimpleDiskMonitor:
                         logging.debug(f"重置磁盘 {drive} 的 {level} 报警状态")
 
     def show_disk_status_window(self, drives_info):
-        """显示所有监控的驱动器状态"""
-        # 创建顶级窗口而不是根窗口
-        disk_window = tk.Toplevel(self.root)
-        disk_window.title(self._("disk_status"))
-        disk_window.geometry("500x400")
-        
-        # 窗口居中
-        disk_window.update_idletasks()
-        width = disk_window.winfo_width()
-        height = disk_window.winfo_height()
-        x = (disk_window.winfo_screenwidth() // 2) - (width // 2)
-        y = (disk_window.winfo_screenheight() // 2) - (height // 2)
-        disk_window.geometry(f'{width}x{height}+{x}+{y}')
-        
-        # 创建一个带有滚动条的框架
-        main_frame = tk.Frame(disk_window)
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        canvas = tk.Canvas(main_frame)
-        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
+        """显示所有监控的驱动器状态，窗口已打开时原地更新并提到前台"""
+        if self.status_view is None or not self.status_view.exists():
+            from status_view import DiskStatusWindow
+            self.status_view = DiskStatusWindow(self, self.root)
+            
+            def on_destroy(event):
+                if event.widget is event.widget.winfo_toplevel():
+                    with self.lock:
+                        self.status_view_open = False
+            
+            self.status_view.window.bind("<Destroy>", on_destroy, add="+")
+            with self.lock:
+                self.status_view_open = True
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.status_view.update(drives_info)
+        self.status_view.window.deiconify()
+        self.status_view.window.lift()
+    
+    def start_age_report(self, drive):
+        """在后台线程中扫描驱动器，完成后通过队列显示年龄报告"""
+        if not self.governor.allows_optional_work():
+            logging.warning("自身资源占用超出预算，暂停年龄报告扫描")
+            self._show_error_dialog(self._("governor_paused"))
+            return
+        with self.lock:
+            if drive in self.age_scans:
+                logging.info(f"磁盘 {drive} 的年龄报告正在生成，跳过")
+                return
+            self.age_scans.add(drive)
         
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        def worker():
+            try:
+                report = scan_volume(drive)
+                self.ui_queue.put(("show_age_report", report))
+            except Exception as e:
+                logging.error(f"生成年龄报告时出错: {e}", exc_info=True)
+                self.ui_queue.put(("show_error", str(e)))
+            finally:
+                with self.lock:
+                    self.age_scans.discard(drive)
         
-        # 显示每个驱动器的状态
-        row = 0
-        for drive_info in drives_info:
-            drive = drive_info["drive"]
-            usage = drive_info["usage"]
-            level = drive_info.get("level", "normal")
-            
-            percent = usage["percent"]
-            total_gb = usage["total"] / (1024**3)
-            used_gb = usage["used"] / (1024**3)
-            free_gb = usage["free"] / (1024**3)
-            
-            # 创建驱动器状态框架
-            drive_frame = tk.LabelFrame(scrollable_frame, text=f"{self._('drive')} {drive}")
-            drive_frame.grid(row=row, column=0, padx=5, pady=5, sticky=tk.W+tk.E)
-            
-            # 设置颜色
-            if level == "critical":
-                bg_color = "#FFCCCC"  # 浅红色
-            elif level == "warning":
-                bg_color = "#FFFFCC"  # 浅黄色
-            elif level == "notice":
-                bg_color = "#CCE5FF"  # 浅蓝色
-            else:
-                bg_color = "#E8E8E8"  # 浅灰色
-            
-            drive_frame.configure(bg=bg_color)
-            
-            # 使用率进度条
-            tk.Label(drive_frame, text=f"{self._('usage')}: {percent:.1f}%", bg=bg_color).grid(row=0, column=0, sticky=tk.W, padx=10, pady=2)
-            progress = ttk.Progressbar(drive_frame, length=300, value=percent)
-            progress.grid(row=0, column=1, padx=10, pady=2)
-            
-            # 空间信息
-            tk.Label(drive_frame, text=f"{self._('total_space')}: {total_gb:.2f} GB", bg=bg_color).grid(row=1, column=0, sticky=tk.W, padx=10, pady=2)
-            tk.Label(drive_frame, text=f"{self._('used_space')}: {used_gb:.2f} GB", bg=bg_color).grid(row=1, column=1, sticky=tk.W, padx=10, pady=2)
-            tk.Label(drive_frame, text=f"{self._('free_space')}: {free_gb:.2f} GB", bg=bg_color).grid(row=2, column=0, sticky=tk.W, padx=10, pady=2)
-            
-            row += 1
+        logging.info(f"开始生成磁盘 {drive} 的年龄报告")
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _show_age_report_window(self, report):
+        """以热力图形式显示文件年龄/类型报告"""
+        window = tk.Toplevel(self.root)
+        window.title(f"{self._('age_report_title')} - {report.root}")
+        
+        total_gb = report.total_bytes / (1024**3)
+        cold = report.cold_bytes(90)
+        cold_percent = cold / report.total_bytes * 100 if report.total_bytes else 0
+        tk.Label(window, text=self._("age_report_summary", report.total_files, total_gb,
+                                     cold / (1024**3), cold_percent),
+                 justify=tk.LEFT).pack(anchor=tk.W, padx=10, pady=5)
+        
+        axis_var = tk.StringVar(value="last_use")
+        axis_frame = tk.Frame(window)
+        axis_frame.pack(anchor=tk.W, padx=10)
+        
+        cell_w, cell_h, label_w = 90, 26, 110
+        canvas = tk.Canvas(window, width=label_w + cell_w * len(AGE_BUCKET_LABELS) + 10,
+                           height=cell_h * (len(CATEGORIES) + 1) + 10, bg="white")
+        canvas.pack(padx=10, pady=5)
+        
+        def draw():
+            canvas.delete("all")
+            rows = report.rows(axis_var.get())
+            peak = max((value for _, values in rows for value in values), default=0) or 1
+            for j, label in enumerate(AGE_BUCKET_LABELS):
+                canvas.create_text(label_w + j * cell_w + cell_w / 2, cell_h / 2, text=label)
+            for i, (category, values) in enumerate(rows):
+                y = (i + 1) * cell_h
+                canvas.create_text(label_w - 5, y + cell_h / 2, text=self._("category_" + category), anchor=tk.E)
+                for j, value in enumerate(values):
+                    # 颜色从白色到红色，按该格字节数占最大格的比例着色
+                    shade = int(255 * (1 - value / peak))
+                    x = label_w + j * cell_w
+                    canvas.create_rectangle(x, y, x + cell_w, y + cell_h,
+                                            fill=f"#ff{shade:02x}{shade:02x}", outline="#cccccc")
+                    if value:
+                        canvas.create_text(x + cell_w / 2, y + cell_h / 2, text=f"{value / (1024**3):.2f} GB")
+        
+        for axis in AXES:
+            tk.Radiobutton(axis_frame, text=self._("age_axis_" + axis), variable=axis_var,
+                           value=axis, command=draw).pack(side=tk.LEFT)
+        draw()
+        
+        def export_csv():
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=".csv",
+                                                filetypes=[("CSV", "*.csv")])
+            if not path:
+                return
+            try:
+                report.to_csv(path)
+                logging.info(f"年龄报告已导出: {path}")
+                messagebox.showinfo(self._("success"), self._("csv_exported").format(path), parent=window)
+            except Exception as e:
+                logging.error(f"导出年龄报告失败: {e}", exc_info=True)
+                messagebox.showerror(self._("error"), self._("error_occurred").format(e), parent=window)
         
-        # 添加关闭按钮
-        button_frame = tk.Frame(disk_window)
+        button_frame = tk.Frame(window)
         button_frame.pack(fill=tk.X, pady=10)
+        tk.Button(button_frame, text=self._("close"), command=window.destroy, width=10).pack(side=tk.RIGHT, padx=10)
+        tk.Button(button_frame, text=self._("export_csv"), command=export_csv, width=10).pack(side=tk.RIGHT, padx=10)
+    
+    def _show_self_usage_window(self):
+        """显示监控程序自身的资源占用、预算和降级级别"""
+        # 只显示监控线程最近一次采样的结果：在UI线程中采样会与监控线程竞争，
+        # 也会用很短的时间窗口计算CPU占用并影响降级判断
+        status = self.governor.status()
+        usage, budgets = status["usage"], status["budgets"]
+        
+        def value(name, fmt):
+            return fmt.format(usage[name]) if name in usage else "-"
+        
+        window = tk.Toplevel(self.root)
+        window.title(self._("self_usage"))
+        lines = [
+            self._("self_usage_line", self._("self_cpu"), value("cpu_percent", "{:.1f}%"), f"{budgets['cpu_percent']}%"),
+            self._("self_usage_line", self._("self_rss"), value("rss_mb", "{:.1f} MB"), f"{budgets['rss_mb']} MB"),
+            self._("self_usage_line", self._("self_threads"), value("threads", "{}"), budgets["threads"]),
+            self._("self_usage_line", self._("self_fds"), value("fds", "{}"), budgets["fds"]),
+            "",
+            self._("self_level", status["level"])
+        ]
+        tk.Label(window, text="\n".join(lines), justify=tk.LEFT).pack(padx=20, pady=15)
+        tk.Button(window, text=self._("close"), command=window.destroy, width=10).pack(pady=10)
+    
+    def _format_cleanup_report(self, drive, report):
+        """生成自动清理预览或执行结果的文本"""
+        planned_gb = report["planned_bytes"] / (1024**3)
+        if report["dry_run"]:
+            message = self._("cleanup_preview", drive, report["planned_files"], planned_gb)
+            if report["preview"]:
+                message += "\n\n" + "\n".join(path for path, _ in report["preview"][:10])
+            if report.get("approval_required"):
+                message += "\n\n" + self._("cleanup_pending_headless" if self.headless else "cleanup_confirm_prompt")
+        else:
+            message = self._("cleanup_done", drive, report["deleted_files"],
+                             report["reclaimed_bytes"] / (1024**3), report["duration"], report["errors"])
+        return message
+    
+    def _show_cleanup_report_window(self, drive, report, policies):
+        """显示自动清理的预览或执行结果；需要确认的预览带有执行删除按钮"""
+        window = tk.Toplevel(self.root)
+        window.title(self._("cleanup_title"))
+        message = self._format_cleanup_report(drive, report)
+        
+        tk.Label(window, text=message, wraplength=480, justify=tk.LEFT).pack(padx=10, pady=10)
+        button_frame = tk.Frame(window)
+        button_frame.pack(pady=10)
+        if report.get("approval_required"):
+            def on_confirm():
+                window.destroy()
+                # 只删除这份预览中的计划；计划已变化时会重新显示预览
+                self._start_cleanup(drive, policies, False, report["plan_id"])
+            tk.Button(button_frame, text=self._("cleanup_confirm"), command=on_confirm,
+                      width=10).pack(side=tk.LEFT, padx=10)
+        tk.Button(button_frame, text=self._("close"), command=window.destroy, width=10).pack(side=tk.LEFT, padx=10)
+    
+    def start_container_usage(self):
+        """在后台线程中统计容器存储占用，完成后通过队列显示"""
+        if not self.governor.allows_optional_work():
+            logging.warning("自身资源占用超出预算，暂停容器存储统计")
+            self._show_error_dialog(self._("governor_paused"))
+            return
+        with self.lock:
+            if self.container_scan_running:
+                logging.info("容器存储统计正在进行，跳过")
+                return
+            self.container_scan_running = True
+        
+        def worker():
+            try:
+                result = self.container_analyzer.analyze()
+                self.ui_queue.put(("show_container_usage", result))
+            except Exception as e:
+                logging.error(f"统计容器存储占用时出错: {e}", exc_info=True)
+                self.ui_queue.put(("show_error", str(e)))
+            finally:
+                with self.lock:
+                    self.container_scan_running = False
         
-        close_button = tk.Button(button_frame, text=self._("close"), command=disk_window.destroy, width=10)
-        close_button.pack(side=tk.RIGHT, padx=10)
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _show_container_usage_window(self, result):
+        """以树形表格显示镜像、容器可写层和命名卷的空间占用"""
+        window = tk.Toplevel(self.root)
+        window.title(self._("container_usage"))
+        window.geometry("640x480")
+        
+        if not result["supported"]:
+            tk.Label(window, text=self._("container_driver_unsupported").format(result["driver"])).pack(padx=10, pady=20)
+            tk.Button(window, text=self._("close"), command=window.destroy, width=10).pack(pady=10)
+            return
+        
+        def gb(value):
+            return f"{value / (1024**3):.2f} GB"
+        
+        frame = tk.Frame(window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        tree = ttk.Treeview(frame, columns=("size", "detail"), show="tree headings")
+        tree.heading("#0", text=self._("name"))
+        tree.heading("size", text=self._("size"))
+        tree.heading("detail", text=self._("detail"))
+        tree.column("size", width=100, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # 不需要调用mainloop，因为主Tk实例已经运行了事件循环
+        totals = result["totals"]
+        images = tree.insert("", tk.END, text=self._("container_images"), values=(gb(totals["images"]), ""), open=True)
+        for image in result["images"]:
+            name = ", ".join(image["tags"]) or image["id"][7:19]
+            tree.insert(images, tk.END, text=name, values=(
+                gb(image["size"]), self._("container_image_detail").format(gb(image["unique_size"]), image["layers"])))
+        
+        containers = tree.insert("", tk.END, text=self._("container_writable"),
+                                 values=(gb(totals["containers"] + totals["logs"]), ""), open=True)
+        for container in result["containers"]:
+            tree.insert(containers, tk.END, text=container["name"] or container["id"][:12], values=(
+                gb(container["writable"] + container["logs"]),
+                self._("container_detail").format(container["image"], gb(container["writable"]), gb(container["logs"]))))
+        
+        volumes = tree.insert("", tk.END, text=self._("container_volumes"), values=(gb(totals["volumes"]), ""), open=True)
+        for volume in result["volumes"]:
+            tree.insert(volumes, tk.END, text=volume["name"], values=(gb(volume["size"]), ""))
+        
+        button_frame = tk.Frame(window)
+        button_frame.pack(fill=tk.X, pady=10)
+        tk.Button(button_frame, text=self._("close"), command=window.destroy, width=10).pack(side=tk.RIGHT, padx=10)
+        tk.Button(button_frame, text=self._("refresh"), command=lambda: (window.destroy(), self.start_container_usage()),
+                  width=10).pack(side=tk.RIGHT, padx=10)
+    
+    def shutdown(self):
+        """无界面模式下退出：停止监控和后台压缩，释放单例锁"""
+        self.stop_monitoring()
+        self.stop_metrics_server()
+        self.stop_api_server()
+        self.stop_event_bus()
+        self.compressor.stop()
+        self.single_instance.release()
+        logging.info("程序退出")
     
     def exit_app(self):
         """退出应用程序"""
@@ -1449,6 +2107,13 @@ class SimpleDiskMonitor:
             # 停止监控线程
             self.stop_monitoring()
             
+            # 停止后台压缩，进度已保存在状态文件中
+            self.compressor.stop()
+            
+            self.stop_metrics_server()
+            self.stop_api_server()
+            self.stop_event_bus()
+            
             # 重置所有报警状态 - 会关闭所有弹窗
             self.reset_alert_state()
             
@@ -1470,6 +2135,11 @@ class SimpleDiskMonitor:
             except Exception as e:
                 logging.error(f"清空队列时出错: {e}")
             
+            # 注销队列唤醒
+            if self.detach_ui_queue:
+                self.detach_ui_queue()
+                self.detach_ui_queue = None
+            
             # 销毁Tkinter根窗口
             if self.root:
                 try:
@@ -1493,6 +2163,7 @@ class SimpleDiskMonitor:
     def run(self):
         """运行主事件循环"""
         try:
+            _load_tk()
             # 创建Tkinter根窗口（隐藏）
             self.root = tk.Tk()
             self.root.withdraw()  # 隐藏窗口
@@ -1501,8 +2172,11 @@ class SimpleDiskMonitor:
             # 设置窗口关闭事件 - 改为调用exit_app方法
             self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
             
-            # 首次启动队列检查
-            self.root.after(100, self.check_queue)
+            # 有任务入队时才唤醒主线程处理队列
+            self.detach_ui_queue = attach_ui_queue(self.root, self.ui_queue, self.check_queue)
+            
+            # 监控线程已经启动，最后才创建托盘图标
+            self.setup_tray_icon()
             
             logging.info("启动Tkinter主循环")
             # 启动Tkinter主循环
@@ -1525,15 +2199,35 @@ def parse_args():
     parser.add_argument("--silent", action="store_true", help="静默模式，不显示弹窗提示")
     parser.add_argument("--autostart", action="store_true", help="设置开机自启动")
     parser.add_argument("--no-autostart", action="store_true", help="禁用开机自启动")
+    parser.add_argument("--check", action="store_true",
+                        help="一次性检查：以JSON输出各驱动器的使用率、级别和inode后退出，退出码 0正常 1警告 2严重 3无法读取；"
+                             "可配合 --config、--drive、--timeout、--pretty 使用")
+    parser.add_argument("--watch", action="store_true",
+                        help="无界面运行，每次检查的样本和级别变化以 NDJSON 逐行输出到标准输出")
+    parser.add_argument("--fields", help="--watch 输出的字段，逗号分隔，例如 drive,level,percent")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="--watch 只输出选定字段（默认 level 和 percent）发生变化的样本")
+    # 以下三个参数在导入监控核心之前就转发给运行中的实例，见 single_instance.py
+    parser.add_argument("--check-now", action="store_true", help="让运行中的实例立即检查一次")
+    parser.add_argument("--open-settings", action="store_true", help="让运行中的实例打开设置窗口")
+    parser.add_argument("--reload", action="store_true", help="让运行中的实例重新加载配置文件")
+    parser.add_argument("--headless", action="store_true",
+                        help="无界面模式：不创建托盘和窗口，报警通过配置的 alert_sinks 输出，SIGTERM 停止，SIGHUP 重新加载配置")
     return parser.parse_args()
 
 # 修改程序入口点
 if __name__ == "__main__":
+    # 打包为exe后使用进程池需要此调用
+    import multiprocessing
+    multiprocessing.freeze_support()
     try:
         args = parse_args()
         
+        # --watch 同样不需要界面
+        args.headless = args.headless or args.watch
+        
         # 创建监控器实例
-        monitor = SimpleDiskMonitor(args.config)
+        monitor = SimpleDiskMonitor(args.config, headless=args.headless)
         
         # 应用命令行参数
         if args.silent:
@@ -1550,6 +2244,30 @@ if __name__ == "__main__":
         # 应用配置
         monitor.apply_config()
         
+        if args.watch:
+            # NDJSON 写出线程；下游关闭时停止监控
+            import headless
+            from ndjson_stream import NDJSONWriter, WatchStream, stop_process
+            if any(spec.get("type") == "stdout" for spec in monitor.config.get("alert_sinks", [])):
+                logging.warning("--watch 使用标准输出输出 NDJSON，配置中的 stdout 报警输出会混入其中")
+            writer = NDJSONWriter(sys.stdout, on_closed=stop_process)
+            fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+            monitor.add_listener(WatchStream(writer, fields, args.changes_only))
+            headless.serve(monitor)
+            writer.close()
+            try:
+                sys.stdout.flush()
+            except BrokenPipeError:
+                # 管道已断开，避免解释器退出时再次报错
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(0)
+        
+        if args.headless:
+            # 启动监控并等待停止信号
+            import headless
+            headless.serve(monitor)
+            sys.exit(0)
+        
         # 启动监控
         monitor.start_monitoring()
         
@@ -1567,7 +2285,10 @@ if __name__ == "__main__":
         if 'monitor' in locals() and hasattr(monitor, 'single_instance'):
             monitor.single_instance.release()
         # 在程序出错时显示错误窗口
+        if 'args' in locals() and args.headless:
+            sys.exit(1)
         try:
+            _load_tk()
             root = tk.Tk()
             root.withdraw()
             messagebox.showerror("磁盘监控器错误", f"程序发生错误: {e}")
@@ -0,0 +1,65 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import age_report
+from age_report import AgeReport, CATEGORIES, AGE_BUCKET_LABELS, age_bucket, categorize, scan_volume, DAY
+
+
+class TestAgeReport(unittest.TestCase):
+
+    def test_categorize(self):
+        self.assertEqual(CATEGORIES[categorize("movie.MKV")], "video")
+        self.assertEqual(CATEGORIES[categorize("app.log.3")], "logs")
+        self.assertEqual(CATEGORIES[categorize(".bashrc")], "other")
+        self.assertEqual(CATEGORIES[categorize("noext")], "other")
+        self.assertEqual(CATEGORIES[categorize("recording.ts")], "video")
+
+    def test_extensions_are_unique(self):
+        seen = [ext for exts in age_report._EXTENSIONS.values() for ext in exts]
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_age_bucket(self):
+        self.assertEqual(age_bucket(DAY), 0)
+        self.assertEqual(age_bucket(95 * DAY), 3)
+        self.assertEqual(age_bucket(1000 * DAY), len(AGE_BUCKET_LABELS) - 1)
+
+    def test_cold_bytes_uses_most_recent_timestamp(self):
+        now = time.time()
+        report = AgeReport(now=now)
+        report.add("old.zip", 1000, now - 200 * DAY, now - 200 * DAY)
+        report.add("read.pdf", 500, now - 200 * DAY, now - DAY)
+        self.assertEqual(report.cold_bytes(90), 1000)
+        self.assertEqual(report.cold_bytes(90, axis="mtime"), 1500)
+        self.assertEqual(report.total_files, 2)
+
+    def test_scan_and_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sub", "data.csv")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+            old = time.time() - 400 * DAY
+            os.utime(path, (old, old))
+
+            report = scan_volume(tmp)
+            self.assertEqual(report.total_files, 1)
+            self.assertEqual(report.cold_bytes(90), 100)
+
+            output = os.path.join(tmp, "report.csv")
+            report.to_csv(output)
+            with open(output, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 3 * len(CATEGORIES) * len(AGE_BUCKET_LABELS))
+            hits = [r for r in rows if r["bytes"] != "0"]
+            self.assertEqual({r["axis"] for r in hits}, {"mtime", "atime", "last_use"})
+            self.assertTrue(all(r["category"] == "documents" and r["age_bucket"] == ">365d" for r in hits))
+
+
+if __name__ == '__main__':
+    unittest.main()
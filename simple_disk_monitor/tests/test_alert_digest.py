@@ -0,0 +1,68 @@
+import os
+import sys
+import queue
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from alert_digest import AlertDigestWindow, count_levels, entry_key, format_entry, sort_entries
+
+GB = 1024 ** 3
+
+
+def make_alert(drive, level, percent):
+    return {"drive": drive, "level": level,
+            "usage": {"percent": percent, "free": 10 * GB, "used": 90 * GB, "total": 100 * GB}}
+
+
+class TestAlertDigest(unittest.TestCase):
+
+    def test_sorted_by_severity_then_usage(self):
+        alerts = [make_alert("/a", "notice", 65), make_alert("/b", "critical", 91),
+                  make_alert("/c", "critical", 99), make_alert("/d", "warning", 80)]
+        self.assertEqual([a["drive"] for a in sort_entries(alerts)], ["/c", "/b", "/d", "/a"])
+        self.assertEqual(list(count_levels(alerts).items()), [("critical", 2), ("warning", 1), ("notice", 1)])
+
+    def test_same_drive_and_level_share_a_row(self):
+        self.assertEqual(entry_key(make_alert("/a", "warning", 80)), entry_key(make_alert("/a", "warning", 85)))
+        self.assertNotEqual(entry_key(make_alert("/a", "warning", 80)), entry_key(make_alert("/a", "critical", 95)))
+
+    def test_format_entry(self):
+        self.assertEqual(format_entry(make_alert("/a", "warning", 80), lambda key: key),
+                         ("level_warning", "/a", "80.0%", "10.00 GB"))
+        latency = dict(make_alert("/a", "latency", 50), latency={"statvfs": {"p99_ms": 1500.0}})
+        self.assertEqual(format_entry(latency, lambda key: key)[2], "p99 1500 ms")
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.config = {"warning_threshold": 75}
+        self.ui_queue = queue.Queue()
+        self.probe_threads = []
+
+    def get_disk_usage(self, drive):
+        self.probe_threads.append(threading.current_thread())
+        return make_alert(drive, "warning", 50)["usage"]
+
+
+class TestAlertDigestRecheck(unittest.TestCase):
+
+    def test_recheck_probes_off_the_ui_thread(self):
+        # 不创建Tk窗口，只检查复查流程
+        window = AlertDigestWindow.__new__(AlertDigestWindow)
+        window.monitor = FakeMonitor()
+        window.recheck_button = mock.Mock()
+        window.entries = {entry_key(a): a for a in (make_alert("/a", "warning", 80), make_alert("/b", "latency", 80))}
+        window.recheck()
+        task = window.monitor.ui_queue.get(timeout=5)
+        self.assertEqual(task[0], "digest_recheck_result")
+        self.assertIs(task[1], window)
+        self.assertEqual(set(task[3]), {"/a"})
+        self.assertNotIn(threading.current_thread(), window.monitor.probe_threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
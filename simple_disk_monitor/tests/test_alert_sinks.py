@@ -0,0 +1,120 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from alert_sinks import AlertRouter, FileSink, LogSink, StreamSink, build_sinks
+
+
+def make_info(drive, level, percent=80.0):
+    return {"drive": drive, "level": level, "usage": {"percent": percent}}
+
+
+def make_event(level, event="alert"):
+    return {"event": event, "drive": "/data", "level": level, "percent": 80.0, "message": "m"}
+
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+
+    def accepts(self, event):
+        return True
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class TestAlertRouter(unittest.TestCase):
+
+    def test_emits_only_on_level_change(self):
+        router = AlertRouter([], repeat_seconds=0)
+        router.begin_cycle()
+        self.assertTrue(router.should_emit(make_info("/data", "warning"), now=0))
+        router.end_cycle({"/data"})
+        router.begin_cycle()
+        self.assertFalse(router.should_emit(make_info("/data", "warning"), now=10))
+        self.assertTrue(router.should_emit(make_info("/data", "critical"), now=20))
+
+    def test_repeat_interval(self):
+        router = AlertRouter([], repeat_seconds=60)
+        self.assertTrue(router.should_emit(make_info("/data", "warning"), now=0))
+        self.assertFalse(router.should_emit(make_info("/data", "warning"), now=59))
+        self.assertTrue(router.should_emit(make_info("/data", "warning"), now=61))
+
+    def test_latency_tracked_separately(self):
+        router = AlertRouter([], repeat_seconds=0)
+        self.assertTrue(router.should_emit(make_info("/data", "warning"), now=0))
+        self.assertTrue(router.should_emit(make_info("/data", "latency"), now=0))
+        self.assertFalse(router.should_emit(make_info("/data", "warning"), now=1))
+
+    def test_resolved_when_not_seen(self):
+        router = AlertRouter([], repeat_seconds=0)
+        router.begin_cycle()
+        router.should_emit(make_info("/data", "warning"), now=0)
+        router.should_emit(make_info("/logs", "notice"), now=0)
+        self.assertEqual(router.end_cycle({"/data", "/logs"}), [])
+
+        router.begin_cycle()
+        router.should_emit(make_info("/data", "warning"), now=1)
+        # /logs 回落到正常；/mnt 本轮没有检查到，保持原状态
+        self.assertEqual(router.end_cycle({"/data", "/logs"}), [("/logs", "notice")])
+        router.begin_cycle()
+        self.assertEqual(router.end_cycle({"/logs"}), [])
+        self.assertIn(("/data", "usage"), router.active)
+
+    def test_failing_sink_does_not_block_others(self):
+        class Broken(RecordingSink):
+            def emit(self, event):
+                raise OSError("boom")
+        recorder = RecordingSink()
+        router = AlertRouter([Broken(), recorder])
+        with self.assertLogs(level="ERROR"):
+            router.emit(make_event("warning"))
+        self.assertEqual(len(recorder.events), 1)
+
+
+class TestSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_min_level(self):
+        sink = LogSink(min_level="warning")
+        self.assertFalse(sink.accepts(make_event("notice")))
+        self.assertTrue(sink.accepts(make_event("latency")))
+        self.assertTrue(sink.accepts(make_event("critical")))
+
+    def test_stream_and_file_write_json_lines(self):
+        stream = io.StringIO()
+        StreamSink(stream=stream).emit(make_event("warning"))
+        path = os.path.join(self.tmp, "alerts.jsonl")
+        sink = FileSink(path)
+        sink.emit(make_event("warning"))
+        sink.emit(make_event("warning", event="resolved"))
+        self.assertEqual(json.loads(stream.getvalue())["level"], "warning")
+        with open(path, encoding="utf-8") as f:
+            events = [json.loads(line)["event"] for line in f]
+        self.assertEqual(events, ["alert", "resolved"])
+
+    def test_build_sinks_skips_invalid(self):
+        with self.assertLogs(level="WARNING"):
+            sinks = build_sinks([{"type": "log"}, {"type": "pager"}, {"type": "file"}])
+        self.assertEqual([type(s) for s in sinks], [LogSink])
+
+    def test_build_sinks_passes_options(self):
+        sinks = build_sinks([{"type": "file", "path": "/tmp/x.jsonl", "min_level": "critical"}])
+        self.assertEqual(sinks[0].path, "/tmp/x.jsonl")
+        self.assertFalse(sinks[0].accepts(make_event("warning")))
+
+
+if __name__ == "__main__":
+    unittest.main()
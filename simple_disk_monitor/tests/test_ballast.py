@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import ballast
+from ballast import RETRY_AFTER_CHECKS, BallastManager, allocate_file, default_ballast_path
+
+
+class TestBallast(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = default_ballast_path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_allocate_is_not_sparse(self):
+        size = 8 * 1024 * 1024
+        allocate_file(self.path, size)
+        st = os.stat(self.path)
+        self.assertEqual(st.st_size, size)
+        if hasattr(st, "st_blocks"):
+            self.assertGreaterEqual(st.st_blocks * 512, size)
+
+    def test_release(self):
+        allocate_file(self.path, 1024 * 1024)
+        manager = BallastManager()
+        self.assertEqual(manager.release("d", self.path), 1024 * 1024)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(manager.release("d", self.path), 0)
+
+    def test_should_create_respects_warning_threshold(self):
+        manager = BallastManager()
+        usage = {"total": 1000, "used": 600, "free": 400}
+        self.assertTrue(manager.should_create(usage, 100, 75))
+        self.assertFalse(manager.should_create(usage, 200, 75))
+
+    def test_ensure_creates_in_background(self):
+        manager = BallastManager()
+        usage = {"total": 10**12, "used": 0, "free": 10**12}
+        self.assertTrue(manager.ensure("d", self.path, 4096, usage, 75))
+        deadline = time.time() + 5
+        while not os.path.exists(self.path) and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(manager.ensure("d", self.path, 4096, usage, 75))
+
+    def test_failed_creation_backs_off(self):
+        manager = BallastManager()
+        usage = {"total": 10**12, "used": 0, "free": 10**12}
+
+        def wait_idle():
+            deadline = time.time() + 5
+            while manager._creating and time.time() < deadline:
+                time.sleep(0.01)
+
+        with mock.patch.object(ballast, "allocate_file", side_effect=OSError(28, "No space left")) as allocate, \
+                self.assertLogs(level="ERROR"):
+            self.assertTrue(manager.ensure("d", self.path, 4096, usage, 75))
+            wait_idle()
+            for _ in range(RETRY_AFTER_CHECKS):
+                self.assertFalse(manager.ensure("d", self.path, 4096, usage, 75))
+            self.assertTrue(manager.ensure("d", self.path, 4096, usage, 75))
+            wait_idle()
+            self.assertEqual(allocate.call_count, 2)
+            # 大小配置改变或压舱文件被释放后立即重试
+            self.assertTrue(manager.ensure("d", self.path, 8192, usage, 75))
+            wait_idle()
+            manager.release("d", self.path)
+            self.assertTrue(manager.ensure("d", self.path, 8192, usage, 75))
+            wait_idle()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from cleanup import CleanupEngine, TokenBucket, policies_for_drive, validate_policy, DAY
+
+
+class TestCleanup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logs = os.path.join(self.tmp.name, "logs")
+        os.makedirs(self.logs)
+        now = time.time()
+        for i in range(6):
+            path = os.path.join(self.logs, f"app.log.{i}")
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+            age = now - i * DAY
+            os.utime(path, (age, age))
+        with open(os.path.join(self.logs, "keep.txt"), "wb") as f:
+            f.write(b"x")
+        os.utime(os.path.join(self.logs, "keep.txt"), (now - 100 * DAY, now - 100 * DAY))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_validate_policy(self):
+        with self.assertRaises(ValueError):
+            validate_policy({"action": "older_than", "path": self.logs})
+        with self.assertRaises(ValueError):
+            validate_policy({"action": "keep_newest", "path": "relative", "keep": 1})
+        with self.assertRaises(ValueError):
+            validate_policy({"action": "older_than", "path": os.path.abspath(os.sep), "days": 1})
+        policy = validate_policy({"action": "keep_newest", "path": self.logs, "keep": 2})
+        self.assertEqual(policy["pattern"], "*")
+
+    def test_dry_run_deletes_nothing(self):
+        policy = validate_policy({"action": "older_than", "path": self.logs, "days": 2.5, "pattern": "app.log.*"})
+        report = CleanupEngine().run([policy], dry_run=True)
+        self.assertEqual(report["planned_files"], 3)
+        self.assertEqual(report["planned_bytes"], 300)
+        self.assertEqual(report["deleted_files"], 0)
+        self.assertEqual(len(os.listdir(self.logs)), 7)
+
+    def test_keep_newest_deletes_in_parallel_batches(self):
+        policy = validate_policy({"action": "keep_newest", "path": self.logs, "keep": 2, "pattern": "app.log.*"})
+        engine = CleanupEngine(max_iops=0, workers=2, batch_size=1)
+        preview = engine.run([policy])
+        report = engine.run([policy], dry_run=False, approved_plan=preview["plan_id"])
+        self.assertEqual(report["deleted_files"], 4)
+        self.assertEqual(report["reclaimed_bytes"], 400)
+        self.assertEqual(sorted(os.listdir(self.logs)), ["app.log.0", "app.log.1", "keep.txt"])
+
+    def test_delete_requires_unchanged_preview(self):
+        policy = validate_policy({"action": "older_than", "path": self.logs, "days": 2.5, "pattern": "app.log.*"})
+        engine = CleanupEngine(max_iops=0)
+        # 没有确认过预览时只生成预览
+        report = engine.run([policy], dry_run=False)
+        self.assertTrue(report["approval_required"])
+        self.assertTrue(report["dry_run"])
+        self.assertEqual(len(os.listdir(self.logs)), 7)
+        # 预览之后计划发生变化，之前的确认失效
+        age = time.time() - 3 * DAY
+        os.utime(os.path.join(self.logs, "app.log.2"), (age, age))
+        with self.assertLogs(level="WARNING"):
+            changed = engine.run([policy], dry_run=False, approved_plan=report["plan_id"])
+        self.assertTrue(changed["approval_required"])
+        self.assertNotEqual(changed["plan_id"], report["plan_id"])
+        self.assertEqual(len(os.listdir(self.logs)), 7)
+        done = engine.run([policy], dry_run=False, approved_plan=changed["plan_id"])
+        self.assertFalse(done["approval_required"])
+        self.assertEqual(done["deleted_files"], 4)
+
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_token_bucket_charges_requests_larger_than_capacity(self):
+        # 每次请求都超过桶容量，仍然按全部字节数计费
+        rate, size = 2000, 200
+        bucket = TokenBucket(rate=rate, capacity=1)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire(size)
+        self.assertGreaterEqual(time.monotonic() - start, (3 * size - 1) / rate)
+
+    def test_policies_for_drive(self):
+        policies = [
+            {"action": "older_than", "path": self.logs, "days": 1},
+            {"action": "older_than", "path": "/elsewhere/logs", "days": 1, "drive": "/elsewhere"},
+            {"action": "bogus", "path": self.logs},
+        ]
+        selected = policies_for_drive(policies, self.tmp.name, [self.tmp.name, "/elsewhere"])
+        self.assertEqual([p["path"] for p in selected], [self.logs])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import compressor
+from cleanup import TokenBucket
+from compressor import CompressionWorker, CompressionState, compress_file, find_cold_files, TMP_SUFFIX, DAY
+
+
+def _write_old(path, data, days=200):
+    with open(path, "wb") as f:
+        f.write(data)
+    old = time.time() - days * DAY
+    os.utime(path, (old, old))
+
+
+class TestCompressor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compress_file_replaces_original(self):
+        path = os.path.join(self.root, "data.log")
+        payload = b"hello world\n" * 10000
+        _write_old(path, payload)
+        _, original, compressed, status = compress_file(path, "gzip")
+        self.assertEqual(status, "ok")
+        self.assertFalse(os.path.exists(path))
+        self.assertLess(compressed, original)
+        with gzip.open(path + ".gz", "rb") as f:
+            self.assertEqual(f.read(), payload)
+        # 保留原文件的修改时间
+        self.assertLess(os.path.getmtime(path + ".gz"), time.time() - 100 * DAY)
+
+    def test_incompressible_file_is_kept(self):
+        path = os.path.join(self.root, "random.bin")
+        _write_old(path, os.urandom(64 * 1024))
+        status = compress_file(path, "lzma")[3]
+        self.assertEqual(status, "not_smaller")
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(os.listdir(self.root), ["random.bin"])
+
+    def test_find_cold_files_filters_and_removes_stale_tmp(self):
+        _write_old(os.path.join(self.root, "cold.log"), b"x" * 2048)
+        _write_old(os.path.join(self.root, "hot.log"), b"x" * 2048, days=1)
+        _write_old(os.path.join(self.root, "small.log"), b"x")
+        _write_old(os.path.join(self.root, "done.log.gz"), b"x" * 2048)
+        _write_old(os.path.join(self.root, "half.log.gz" + TMP_SUFFIX), b"x")
+        found = [os.path.basename(p) for p, _ in find_cold_files(self.root, 90, 1024)]
+        self.assertEqual(found, ["cold.log"])
+        self.assertNotIn("half.log.gz" + TMP_SUFFIX, os.listdir(self.root))
+
+    def test_compress_file_meters_reads(self):
+        path = os.path.join(self.root, "big.log")
+        _write_old(path, os.urandom(300 * 1024))
+        # 容量很小的桶：读取的每个字节都要按速率等待
+        bucket = TokenBucket(1024 * 1024, capacity=1)
+        start = time.monotonic()
+        status = compress_file(path, "gzip", bucket=bucket)[3]
+        self.assertEqual(status, "not_smaller")
+        self.assertGreaterEqual(time.monotonic() - start, 0.3 * 0.95)
+
+    def test_failed_entries_pruned_and_capped(self):
+        paths = [os.path.join(self.root, f"f{i}.bin") for i in range(4)]
+        for path in paths:
+            _write_old(path, b"x")
+        state = CompressionState(os.path.join(self.root, "state.json"), max_failed=3)
+        for path in paths:
+            state.record_failure(path)
+        # 超出上限时淘汰最早的记录
+        self.assertEqual(state.failed(), set(paths[1:]))
+        state.save()
+        with open(paths[1], "ab") as f:
+            f.write(b"more")
+        os.remove(paths[2])
+        self.assertEqual(CompressionState(state.path).failed(), {paths[3]})
+
+    def test_legacy_failed_list_is_dropped(self):
+        state_file = os.path.join(self.root, "state.json")
+        with open(state_file, "w", encoding="utf-8") as f:
+            f.write('{"failed": ["/old/path"]}')
+        self.assertEqual(CompressionState(state_file).failed(), set())
+
+    def test_stop_skips_remaining_roots(self):
+        worker = CompressionWorker(max_bytes_per_sec=0, min_size=1024)
+        stop_event = threading.Event()
+        walked = []
+
+        def fake_find(root, *args):
+            walked.append(root)
+            stop_event.set()
+            return iter([(os.path.join(root, "a"), 1), (os.path.join(root, "b"), 1)])
+
+        with mock.patch.object(compressor, "find_cold_files", side_effect=fake_find):
+            worker._run("drive", ["/r1", "/r2", "/r3"], stop_event)
+        self.assertEqual(walked, ["/r1"])
+
+    def test_start_does_not_cancel_other_stop(self):
+        worker = CompressionWorker(max_bytes_per_sec=0)
+        stopping = threading.Event()
+        # 模拟另一个驱动器上正在运行的轮次
+        worker._running["/a"] = stopping
+        worker.stop()
+        self.assertTrue(worker.start("/b", []))
+        self.assertTrue(stopping.is_set())
+
+    def test_worker_records_progress(self):
+        for i in range(3):
+            _write_old(os.path.join(self.root, f"f{i}.txt"), b"abc" * 10000)
+        state_file = os.path.join(self.root, "state.json")
+        worker = CompressionWorker(state_file=state_file, max_bytes_per_sec=0, min_size=1024)
+        worker._run("drive", [self.root])
+        self.assertEqual(sorted(n for n in os.listdir(self.root) if n.endswith(".gz")),
+                         ["f0.txt.gz", "f1.txt.gz", "f2.txt.gz"])
+        state = CompressionState(state_file)
+        self.assertEqual(state.data["compressed_files"]["drive"], 3)
+        self.assertGreater(state.saved_bytes("drive"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from container_usage import ContainerUsageAnalyzer, chain_ids
+from mounts import is_container_mount
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(path, mode) as f:
+        f.write(data)
+
+
+class TestContainerUsage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        image_root = os.path.join(self.root, "image", "overlay2")
+        diff_ids = ["sha256:" + "a" * 64, "sha256:" + "b" * 64]
+        self.layers = chain_ids(diff_ids)
+        for layer, size in zip(self.layers, (1000, 2000)):
+            _write(os.path.join(image_root, "layerdb", "sha256", layer[7:], "size"), str(size))
+        # 第二个镜像与第一个共享底层
+        other = chain_ids([diff_ids[0], "sha256:" + "c" * 64])
+        _write(os.path.join(image_root, "layerdb", "sha256", other[1][7:], "cache-id"), "cacheX")
+        _write(os.path.join(self.root, "overlay2", "cacheX", "diff", "f"), b"x" * 4096)
+
+        content = os.path.join(image_root, "imagedb", "content", "sha256")
+        _write(os.path.join(content, "1" * 64), json.dumps({"rootfs": {"diff_ids": diff_ids}}))
+        _write(os.path.join(content, "2" * 64), json.dumps({"rootfs": {"diff_ids": [diff_ids[0], "sha256:" + "c" * 64]}}))
+        _write(os.path.join(image_root, "repositories.json"),
+               json.dumps({"Repositories": {"app": {"app:latest": "sha256:" + "1" * 64}}}))
+
+        _write(os.path.join(image_root, "layerdb", "mounts", "cid", "mount-id"), "mnt1")
+        _write(os.path.join(self.root, "overlay2", "mnt1", "diff", "data"), b"x" * 8192)
+        _write(os.path.join(self.root, "containers", "cid", "config.v2.json"),
+               json.dumps({"Name": "/web", "Config": {"Image": "app:latest"}}))
+        _write(os.path.join(self.root, "volumes", "pgdata", "_data", "db"), b"x" * 4096)
+
+        self.cache_file = os.path.join(self.root, "cache.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_is_container_mount(self):
+        self.assertTrue(is_container_mount("/var/lib/docker/overlay2/x/merged", "overlay"))
+        self.assertTrue(is_container_mount("/var/lib/kubelet/pods/x/volumes", "tmpfs"))
+        self.assertFalse(is_container_mount("/", "overlay"))
+        self.assertFalse(is_container_mount("/home", "ext4"))
+
+    def test_analyze(self):
+        result = ContainerUsageAnalyzer(self.root, self.cache_file).analyze()
+        self.assertTrue(result["supported"])
+        images = {tuple(image["tags"]): image for image in result["images"]}
+        app = images[("app:latest",)]
+        self.assertEqual(app["size"], 3000)
+        self.assertEqual(app["unique_size"], 2000)
+        self.assertEqual(result["containers"][0]["name"], "web")
+        self.assertGreaterEqual(result["containers"][0]["writable"], 8192)
+        self.assertEqual(result["volumes"][0]["name"], "pgdata")
+        self.assertGreaterEqual(result["totals"]["images"], 3000 + 4096)
+
+    def test_layer_sizes_are_cached_by_layer_id(self):
+        ContainerUsageAnalyzer(self.root, self.cache_file).analyze()
+        with open(self.cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+        self.assertEqual(cached[self.layers[1][7:]], 2000)
+
+        # 层不可变：即使磁盘上的记录变化，也使用缓存值
+        _write(os.path.join(self.root, "image", "overlay2", "layerdb", "sha256", self.layers[1][7:], "size"), "999999")
+        result = ContainerUsageAnalyzer(self.root, self.cache_file).analyze()
+        app = [image for image in result["images"] if image["tags"] == ["app:latest"]][0]
+        self.assertEqual(app["size"], 3000)
+
+
+if __name__ == '__main__':
+    unittest.main()
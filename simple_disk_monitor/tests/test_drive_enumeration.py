@@ -0,0 +1,49 @@
+import os
+import sys
+import threading
+import unittest
+from collections import namedtuple
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+# 测试环境没有图形界面，使用 pystray 自带的 dummy 后端
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+import simple_disk_monitor
+from simple_disk_monitor import SimpleDiskMonitor
+
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.config = {"hide_container_mounts": True}
+
+    iter_available_drives = SimpleDiskMonitor.iter_available_drives
+    get_available_drives = SimpleDiskMonitor.get_available_drives
+
+
+class TestDriveEnumeration(unittest.TestCase):
+
+    def test_filters_and_yields_incrementally(self):
+        partitions = [
+            Partition("/dev/sda1", "/", "ext4", "rw"),
+            Partition("proc", "/proc", "proc", "rw"),
+            Partition("overlay", "/var/lib/docker/overlay2/abc/merged", "overlay", "rw"),
+            Partition("server:/export", "/mnt/nfs", "nfs4", "rw"),
+        ]
+        with mock.patch.object(simple_disk_monitor.psutil, "disk_partitions", return_value=partitions):
+            monitor = FakeMonitor()
+            drives = monitor.iter_available_drives()
+            self.assertEqual(next(drives), "/")
+            self.assertEqual(list(drives), ["/mnt/nfs"])
+            self.assertEqual(monitor.get_available_drives(), ["/", "/mnt/nfs"])
+
+    def test_enumeration_error_yields_nothing(self):
+        with mock.patch.object(simple_disk_monitor.psutil, "disk_partitions", side_effect=OSError("boom")):
+            self.assertEqual(FakeMonitor().get_available_drives(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from event_bus import EventBus, Subscription
+
+
+def sample(drive, level="normal"):
+    return {"type": "sample", "drive": drive, "level": level, "percent": 10.0}
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "需要 Unix 域套接字")
+class TestEventBus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "events.sock")
+        self.bus = EventBus(self.path, queue_size=5, max_subscribers=2)
+        self.bus.start()
+        self.clients = []
+
+    def tearDown(self):
+        self.bus.stop()
+        for client in self.clients:
+            client.close()
+        self.tmp.cleanup()
+
+    def connect(self, subscription=None):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5)
+        client.connect(self.path)
+        self.clients.append(client)
+        if subscription is not None:
+            client.sendall(json.dumps(subscription).encode("utf-8") + b"\n")
+        reader = client.makefile("r", encoding="utf-8")
+        return client, reader
+
+    def read(self, reader):
+        return json.loads(reader.readline())
+
+    def wait_subscribers(self, count):
+        deadline = time.monotonic() + 5
+        while len(self.bus.subscribers) != count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.bus.subscribers), count)
+
+    def test_subscription_parse(self):
+        self.assertEqual(Subscription.parse("").types, {"sample", "transition", "error"})
+        subscription = Subscription.parse('{"types": "transition", "levels": ["critical"]}')
+        self.assertTrue(subscription.matches({"type": "transition", "drive": "/", "level": "critical"}))
+        self.assertFalse(subscription.matches({"type": "transition", "drive": "/", "level": "notice"}))
+        self.assertFalse(subscription.matches(sample("/", "critical")))
+        for bad in ("[1]", '{"types": ["cycle"]}', '{"drives": 3}', "{"):
+            with self.assertRaises(ValueError):
+                Subscription.parse(bad)
+
+    def test_filtered_delivery(self):
+        _, everything = self.connect({})
+        _, data_only = self.connect({"drives": ["/data"]})
+        self.assertEqual(self.read(everything)["type"], "subscribed")
+        self.assertEqual(self.read(data_only)["drives"], ["/data"])
+        self.wait_subscribers(2)
+        self.bus(sample("/"))
+        self.bus(sample("/data"))
+        self.bus({"type": "cycle", "drives": []})
+        self.bus({"type": "error", "drive": "/data", "probe": "statvfs", "message": "EIO"})
+        self.assertEqual([self.read(everything)["drive"] for _ in range(3)], ["/", "/data", "/data"])
+        self.assertEqual(self.read(data_only)["drive"], "/data")
+        self.assertEqual(self.read(data_only)["type"], "error")
+
+    def test_rejects(self):
+        _, reader = self.connect({"types": ["bogus"]})
+        record = self.read(reader)
+        self.assertEqual(record["type"], "rejected")
+        self.assertEqual(reader.readline(), "")
+        self.connect({})
+        self.connect({})
+        self.wait_subscribers(2)
+        _, reader = self.connect({})
+        self.assertEqual(self.read(reader), {"type": "rejected", "reason": "too many subscribers"})
+
+    def test_slow_subscriber_drops_oldest(self):
+        slow, reader = self.connect({"types": ["sample"]})
+        self.wait_subscribers(1)
+        writer = self.bus.subscribers[0]["writer"]
+        # 套接字缓冲区写满后写出线程阻塞，之后的事件只在队列中丢弃最旧的
+        payload = "x" * 4096
+        start = time.monotonic()
+        for i in range(2000):
+            self.bus(dict(sample(f"d{i}"), pad=payload))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertGreater(writer.dropped, 0)
+        self.assertEqual(self.read(reader)["type"], "subscribed")
+        # 读取恢复后先收到丢弃计数，最后收到的是最新的事件
+        types = []
+        record = None
+        while record is None or record.get("drive") != "d1999":
+            record = self.read(reader)
+            types.append(record["type"])
+        self.assertIn("dropped", types)
+
+    def test_disconnect_removes_subscriber(self):
+        client, _ = self.connect({})
+        self.wait_subscribers(1)
+        client.close()
+        with self.assertLogs(level="INFO"):
+            for _ in range(50):
+                self.bus(sample("/"))
+                if not self.bus.subscribers:
+                    break
+                time.sleep(0.02)
+        self.assertEqual(self.bus.subscribers, [])
+
+    def test_stale_socket_replaced(self):
+        self.bus.stop()
+        # 模拟异常退出留下的套接字文件
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.bus = EventBus(self.path)
+        self.bus.start()
+        with self.assertRaises(OSError):
+            EventBus(self.path).start()
+        self.bus.stop()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_refuses_to_replace_regular_file(self):
+        self.bus.stop()
+        with open(self.path, "w") as f:
+            f.write("keep me")
+        with self.assertRaises(OSError):
+            EventBus(self.path).start()
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+
+if __name__ == "__main__":
+    unittest.main()
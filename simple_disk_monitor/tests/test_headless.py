@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import socket
+import shutil
+import signal
+import tempfile
+import time
+import subprocess
+import unittest
+from unittest import mock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+from headless import sd_notify
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "需要 Unix 套接字")
+class TestHeadless(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_sd_notify(self):
+        path = os.path.join(self.tmp, "notify")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+            server.bind(path)
+            with mock.patch.dict(os.environ, {"NOTIFY_SOCKET": path}):
+                self.assertTrue(sd_notify("READY=1"))
+            self.assertEqual(server.recv(64), b"READY=1")
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertFalse(sd_notify("READY=1"))
+
+    def test_single_instance_lock_file(self):
+        from simple_disk_monitor import SingleInstance
+        with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmp}):
+            first = SingleInstance("TestInstance")
+            second = SingleInstance("TestInstance")
+            self.assertTrue(first.check())
+            with self.assertLogs(level="WARNING"):
+                self.assertFalse(second.check())
+            first.release()
+            self.assertTrue(second.check())
+            second.release()
+
+    def test_headless_monitor_does_not_load_ui(self):
+        config = os.path.join(self.tmp, "config.json")
+        with open(config, "w", encoding="utf-8") as f:
+            json.dump({"alert_sinks": [{"type": "stdout"}]}, f)
+        code = ("import sys, simple_disk_monitor; "
+                "m = simple_disk_monitor.SimpleDiskMonitor(sys.argv[1], headless=True); "
+                "m.check_disk_usage(); m.shutdown(); "
+                "print(','.join(n for n in sys.modules if n.split('.')[0] in ('tkinter', 'PIL', 'pystray')))")
+        env = dict(os.environ, HOME=self.tmp, XDG_RUNTIME_DIR=self.tmp)
+        result = subprocess.run([sys.executable, "-c", code, config], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+    @unittest.skipUnless(hasattr(signal, "sigwait"), "需要 sigwait")
+    def test_forwarded_reload_runs_on_main_thread(self):
+        import single_instance
+        config = os.path.join(self.tmp, "config.json")
+        with open(config, "w", encoding="utf-8") as f:
+            json.dump({"check_interval": 3600}, f)
+        env = dict(os.environ, HOME=self.tmp, XDG_RUNTIME_DIR=self.tmp)
+        process = subprocess.Popen([sys.executable, "simple_disk_monitor.py", "--headless", "--config", config],
+                                   cwd=ROOT, env=env, stderr=subprocess.PIPE, text=True)
+        try:
+            with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmp}):
+                address = single_instance.ipc_address()
+                deadline = time.monotonic() + 10
+                while not os.path.exists(address) and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                self.assertTrue(single_instance.send_command("reload")["ok"])
+        finally:
+            process.send_signal(signal.SIGTERM)
+            _, stderr = process.communicate(timeout=10)
+        self.assertEqual(process.returncode, 0)
+        # 转发的重新加载与 SIGHUP 走同一条路径
+        self.assertIn("收到重新加载请求", stderr)
+        self.assertIn("已重新加载配置文件", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
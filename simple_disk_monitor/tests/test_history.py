@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from history import UsageHistory
+
+GB = 1024 ** 3
+
+
+class TestUsageHistory(unittest.TestCase):
+
+    def test_points_keep_min_max_last(self):
+        history = UsageHistory()
+        history.record("/", 10, 100, ts=120)
+        history.record("/", 30, 100, ts=130)
+        history.record("/", 20, 100, ts=140)
+        history.record("/", 25, 100, ts=185)
+        self.assertEqual(history.series("/", "hour"), [(120, 10, 30, 20), (180, 25, 25, 25)])
+        self.assertEqual(history.series("/", "day"), [(0, 10, 30, 25)])
+        self.assertEqual(history.latest("/"), (185, 25, 100))
+
+    def test_ring_buffer_is_bounded(self):
+        history = UsageHistory()
+        for minute in range(200):
+            history.record("/", minute, 1000, ts=minute * 60)
+        self.assertEqual(len(history.series("/", "hour")), 60)
+        self.assertEqual(len(history.series("/", "day")), 14)
+
+    def test_growth_rate(self):
+        history = UsageHistory()
+        self.assertIsNone(history.growth_rate("/"))
+        history.record("/", 0, 100 * GB, ts=0)
+        history.record("/", GB, 100 * GB, ts=30)
+        # 跨度太短
+        self.assertIsNone(history.growth_rate("/"))
+        for minute in range(1, 181):
+            history.record("/", minute * GB, 100 * GB, ts=minute * 60)
+        # 每分钟增长1GB
+        self.assertAlmostEqual(history.growth_rate("/") * 60 / GB, 1.0, places=2)
+        self.assertAlmostEqual(history.growth_rate("/", window=600) * 60 / GB, 1.0, places=2)
+
+        history.forget("/")
+        self.assertIsNone(history.latest("/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from latency import (LatencyHistogram, LatencyTracker, WindowedHistogram,
+                     bucket_index, bucket_upper_bound, BUCKET_COUNT)
+
+
+class TestLatency(unittest.TestCase):
+
+    def test_bucket_bounds_are_monotonic_and_tight(self):
+        previous = -1
+        for index in range(BUCKET_COUNT):
+            upper = bucket_upper_bound(index)
+            self.assertGreater(upper, previous)
+            self.assertEqual(bucket_index(upper), index)
+            self.assertEqual(bucket_index(previous + 1), index)
+            previous = upper
+        for value in (1, 31, 32, 1000, 123456, 10**9):
+            self.assertLessEqual(bucket_upper_bound(bucket_index(value)) - value, value * 0.07 + 1)
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 500000, delta=500000 * 0.07)
+        self.assertAlmostEqual(histogram.percentile(99), 990000, delta=990000 * 0.07)
+        self.assertEqual(histogram.percentile(100), 1000000)
+        self.assertIsNone(LatencyHistogram().percentile(99))
+
+    def test_window_expires_old_samples(self):
+        histogram = WindowedHistogram(window_seconds=0.05)
+        histogram.record(5000)
+        self.assertEqual(histogram.snapshot().total, 1)
+        time.sleep(0.12)
+        self.assertEqual(histogram.snapshot().total, 0)
+
+    def test_tracker_timed_and_probe(self):
+        tracker = LatencyTracker()
+        tracker.timed("/", "statvfs", os.statvfs if hasattr(os, "statvfs") else os.stat, "/")
+        with self.assertRaises(OSError):
+            tracker.timed("/", "statvfs", os.stat, "/nonexistent/path")
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker.probe_write("/", tmp)
+            self.assertEqual(os.listdir(tmp), [])
+        summary = tracker.summary("/")
+        self.assertEqual(summary["statvfs"]["count"], 2)
+        self.assertEqual(summary["statvfs"]["errors"], 1)
+        self.assertEqual(summary["write"]["count"], 1)
+        self.assertGreaterEqual(summary["write"]["p99_ms"], summary["write"]["p50_ms"])
+
+    def test_error_callback(self):
+        tracker = LatencyTracker()
+        errors = []
+        tracker.on_error = lambda drive, kind, error: errors.append((drive, kind, type(error)))
+        with self.assertRaises(OSError):
+            tracker.timed("/", "statvfs", os.stat, "/nonexistent/path")
+        with self.assertLogs(level="WARNING"):
+            tracker.probe_write("/", "/nonexistent/path")
+        self.assertEqual(errors, [("/", "statvfs", FileNotFoundError), ("/", "write", FileNotFoundError)])
+        self.assertEqual(tracker.error_counts(), {("/", "statvfs"): 1, ("/", "write"): 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from metrics import CONTENT_TYPE, MetricsExporter, escape_label, render, start_server
+
+
+def cycle(**overrides):
+    record = {
+        "type": "cycle",
+        "time": "t",
+        "drives": [
+            {"drive": "/", "level": "warning",
+             "usage": {"total": 100, "used": 80, "free": 20, "percent": 80.0,
+                       "inodes_total": 10, "inodes_used": 4, "inodes_free": 6},
+             "latency": {"statvfs": {"count": 3, "p50_ms": 2.0, "p99_ms": 5.0}}},
+            {"drive": 'C:\\"x"', "level": "normal",
+             "usage": {"total": 100, "used": 10, "free": 90, "percent": 10.0,
+                       "inodes_total": None, "inodes_used": None, "inodes_free": None},
+             "latency": {}},
+        ],
+        "thresholds": {"notice": 60, "warning": 75, "critical": 90},
+        "cycle_stats": {"count": 2, "sum": 0.5, "last": 0.25, "finished": 1700000000.0},
+    }
+    record.update(overrides)
+    return record
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_escape_label(self):
+        self.assertEqual(escape_label('a\\b"c\nd'), 'a\\\\b\\"c\\nd')
+
+    def test_render(self):
+        text = render(cycle(), {("/", "write"): 2}).decode("utf-8")
+        lines = text.splitlines()
+        self.assertIn('disk_monitor_filesystem_used_bytes{mount="/"} 80', lines)
+        self.assertIn('disk_monitor_alert_level{mount="/"} 2', lines)
+        self.assertIn('disk_monitor_alert_level{mount="C:\\\\\\"x\\""} 0', lines)
+        self.assertIn('disk_monitor_probe_latency_seconds{mount="/",probe="statvfs",quantile="0.99"} 0.005', lines)
+        self.assertIn('disk_monitor_probe_errors_total{mount="/",probe="write"} 2', lines)
+        self.assertIn('disk_monitor_threshold_percent{level="critical"} 90', lines)
+        self.assertIn("disk_monitor_cycle_duration_seconds_count 2", lines)
+        self.assertIn("# TYPE disk_monitor_cycle_duration_seconds summary", lines)
+        # Windows 上没有 inode 数据，不输出空值
+        inode_lines = [line for line in lines if line.startswith("disk_monitor_filesystem_inodes{")]
+        self.assertEqual(inode_lines, ['disk_monitor_filesystem_inodes{mount="/"} 10'])
+        self.assertTrue(text.endswith("\n"))
+
+    def test_render_skips_empty_families(self):
+        text = render({"drives": []}).decode("utf-8")
+        self.assertNotIn("# TYPE", text)
+
+    def test_exporter_only_renders_cycles(self):
+        exporter = MetricsExporter(lambda: {})
+        initial = exporter.body
+        exporter({"type": "sample", "drive": "/"})
+        self.assertIs(exporter.body, initial)
+        exporter(cycle())
+        self.assertIn(b"disk_monitor_alert_level", exporter.body)
+        self.assertIsNotNone(exporter.updated)
+
+    def test_server_returns_buffer(self):
+        exporter = MetricsExporter()
+        exporter(cycle())
+        server = start_server(exporter, port=0)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(base + "/metrics", timeout=5) as response:
+                self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+                self.assertEqual(response.read(), exporter.body)
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                urllib.request.urlopen(base + "/other", timeout=5)
+            self.assertEqual(raised.exception.code, 404)
+            raised.exception.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import psutil
+
+from mounts import _unescape, disk_usage, is_monitorable, read_partitions
+
+
+class TestMounts(unittest.TestCase):
+
+    def test_is_monitorable(self):
+        self.assertTrue(is_monitorable("/", "overlay"))
+        self.assertTrue(is_monitorable("/data", "xfs"))
+        self.assertFalse(is_monitorable("/proc", "proc"))
+        self.assertFalse(is_monitorable("/run/user/1000", "tmpfs"))
+        self.assertFalse(is_monitorable("", "ext4"))
+        self.assertFalse(is_monitorable("/var/lib/docker/overlay2/x/merged", "overlay"))
+        self.assertTrue(is_monitorable("/var/lib/docker/overlay2/x/merged", "overlay", hide_container_mounts=False))
+
+    def test_unescape(self):
+        self.assertEqual(_unescape("/mnt/my\\040disk"), "/mnt/my disk")
+        self.assertEqual(_unescape("/plain"), "/plain")
+
+    def test_matches_psutil(self):
+        ours = {p.mountpoint for p in read_partitions()}
+        theirs = {p.mountpoint for p in psutil.disk_partitions(all=True)}
+        self.assertEqual(ours, theirs)
+
+        usage = disk_usage("/")
+        reference = psutil.disk_usage("/")
+        self.assertEqual(usage["total"], reference.total)
+        self.assertAlmostEqual(usage["percent"], reference.percent, delta=0.5)
+        if hasattr(os, "statvfs"):
+            self.assertGreater(usage["inodes_total"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import io
+import os
+import sys
+import json
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+# 测试环境没有图形界面，使用 pystray 自带的 dummy 后端
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+
+from ndjson_stream import ChangeFilter, NDJSONWriter, WatchStream, project
+from simple_disk_monitor import SimpleDiskMonitor
+
+
+def sample(drive, level="normal", percent=10.0, used=100):
+    return {"type": "sample", "time": "t", "host": "h", "drive": drive, "level": level,
+            "percent": percent, "used": used}
+
+
+class BlockingStream(io.StringIO):
+    """第一次写入时阻塞，模拟读得很慢的下游"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.blocked = threading.Event()
+
+    def write(self, text):
+        self.blocked.set()
+        self.release.wait(5)
+        return super().write(text)
+
+
+class BrokenStream:
+    def write(self, text):
+        raise BrokenPipeError(32, "Broken pipe")
+
+    def flush(self):
+        pass
+
+
+class TestNDJSONStream(unittest.TestCase):
+
+    def test_project(self):
+        record = dict(sample("/"), type="transition", previous="normal")
+        self.assertEqual(project(record, ["drive", "percent", "missing"]),
+                         {"type": "transition", "previous": "normal", "drive": "/", "percent": 10.0})
+        self.assertIs(project(record, None), record)
+
+    def test_change_filter(self):
+        changes = ChangeFilter()
+        self.assertTrue(changes.should_emit(sample("/")))
+        self.assertFalse(changes.should_emit(sample("/", used=200)))
+        self.assertTrue(changes.should_emit(sample("/data")))
+        self.assertTrue(changes.should_emit(sample("/", percent=10.1)))
+        by_used = ChangeFilter(["drive", "used"])
+        self.assertEqual(by_used.fields, ["used"])
+        self.assertTrue(by_used.should_emit(sample("/")))
+        self.assertTrue(by_used.should_emit(sample("/", used=200)))
+
+    def test_writer_flushes_lines(self):
+        stream = io.StringIO()
+        writer = NDJSONWriter(stream)
+        writer.put(sample("/"))
+        writer.put(sample("/data"))
+        writer.close()
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([r["drive"] for r in lines], ["/", "/data"])
+
+    def test_slow_consumer_drops_oldest(self):
+        stream = BlockingStream()
+        writer = NDJSONWriter(stream, maxsize=3)
+        writer.put(sample("first"))
+        self.assertTrue(stream.blocked.wait(2))
+        # 写出线程卡在第一条记录上，之后的 put 不能阻塞
+        for i in range(10):
+            writer.put(sample(f"d{i}"))
+        self.assertEqual(writer.dropped, 7)
+        stream.release.set()
+        writer.close()
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records[1], {"type": "dropped", "count": 7})
+        self.assertEqual([r["drive"] for r in records if r["type"] == "sample"], ["first", "d7", "d8", "d9"])
+
+    def test_broken_pipe_closes_writer(self):
+        closed = threading.Event()
+        writer = NDJSONWriter(BrokenStream(), on_closed=closed.set)
+        with self.assertLogs(level="WARNING"):
+            writer.put(sample("/"))
+            self.assertTrue(closed.wait(2))
+        writer.put(sample("/"))
+        self.assertTrue(writer.closed.is_set())
+
+    def test_watch_stream_filters_samples_only(self):
+        stream = io.StringIO()
+        writer = NDJSONWriter(stream)
+        watch = WatchStream(writer, ["drive", "level"], changes_only=True)
+        watch(sample("/"))
+        watch(sample("/"))
+        watch(dict(sample("/"), type="transition", previous="notice"))
+        watch({"type": "other"})
+        writer.close()
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records, [
+            {"type": "sample", "drive": "/", "level": "normal"},
+            {"type": "transition", "previous": "notice", "drive": "/", "level": "normal"},
+        ])
+
+
+class TestMonitorEvents(unittest.TestCase):
+
+    def make_monitor(self):
+        monitor = SimpleDiskMonitor.__new__(SimpleDiskMonitor)
+        monitor.lock = threading.Lock()
+        monitor.config = {}
+        monitor.drive_levels = {}
+        monitor.last_usage = {}
+        monitor.listeners = []
+        return monitor
+
+    def test_samples_and_transitions(self):
+        monitor = self.make_monitor()
+        records = []
+        monitor.add_listener(records.append)
+        usage = {"total": 100, "used": 80, "free": 20, "percent": 80.0}
+        status = {"critical": [], "warning": [{"drive": "/", "usage": usage, "level": "warning"}],
+                  "notice": [], "normal": []}
+        monitor._publish_samples(status)
+        monitor._detect_transitions(status)
+        monitor._detect_transitions(status)
+        self.assertEqual([r["type"] for r in records], ["sample", "transition"])
+        self.assertEqual((records[1]["previous"], records[1]["level"]), ("normal", "warning"))
+
+
+if __name__ == "__main__":
+    unittest.main()
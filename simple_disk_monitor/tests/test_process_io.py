@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from process_io import compute_write_deltas, match_drive, writers_for_drive, snapshot_write_bytes
+
+
+class TestProcessIO(unittest.TestCase):
+
+    def test_compute_write_deltas(self):
+        before = {1: 100, 2: 500, 3: 50}
+        after = {1: 400, 2: 500, 4: 9000}
+        self.assertEqual(compute_write_deltas(before, after), {1: 300})
+
+    def test_match_drive_longest_prefix(self):
+        drives = ["/", "/data", "/data/logs"]
+        self.assertEqual(match_drive("/data/logs/app.log", drives), "/data/logs")
+        self.assertEqual(match_drive("/data2/file", drives), "/")
+        self.assertEqual(match_drive("/data", drives), "/data")
+        self.assertIsNone(match_drive("/data/x", ["/srv"]))
+
+    def test_writers_for_drive(self):
+        writers = [
+            {"pid": 1, "drives": ["/"]},
+            {"pid": 2, "drives": ["/data"]},
+        ]
+        self.assertEqual([w["pid"] for w in writers_for_drive(writers, "/data")], [2])
+        self.assertEqual(len(writers_for_drive(writers, "/srv")), 2)
+
+    def test_snapshot_includes_current_process(self):
+        snapshot = snapshot_write_bytes()
+        self.assertIsInstance(snapshot, dict)
+        self.assertIn(os.getpid(), snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
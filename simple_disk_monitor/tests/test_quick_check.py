@@ -0,0 +1,109 @@
+import io
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import quick_check
+from mounts import Partition
+from quick_check import EXIT_UNKNOWN, level_for, probe, run_check, select_drives
+
+PARTITIONS = [
+    Partition("/dev/sda1", "/", "ext4", "rw"),
+    Partition("proc", "/proc", "proc", "rw"),
+    Partition("/dev/sdb1", "/data", "xfs", "rw"),
+    Partition("overlay", "/var/lib/docker/overlay2/x/merged", "overlay", "rw"),
+]
+
+
+def usage(percent):
+    return {"total": 100, "used": percent, "free": 100 - percent, "percent": float(percent),
+            "inodes_total": 10, "inodes_used": 1, "inodes_free": 9, "inodes_percent": 10.0}
+
+
+class TestQuickCheck(unittest.TestCase):
+
+    def test_level_for(self):
+        config = {"critical_threshold": 95}
+        self.assertEqual(level_for(96, config), "critical")
+        self.assertEqual(level_for(90, config), "warning")
+        self.assertEqual(level_for(60, config), "notice")
+        self.assertEqual(level_for(10, config), "normal")
+
+    def test_select_drives(self):
+        self.assertEqual(select_drives({}, PARTITIONS), [("/", "ext4"), ("/data", "xfs")])
+        self.assertEqual(select_drives({"drives_to_monitor": ["/data", "/gone"]}, PARTITIONS), [("/data", "xfs")])
+        self.assertEqual(select_drives({}, PARTITIONS, ["/tmp"]), [("/tmp", "")])
+        shown = select_drives({"hide_container_mounts": False}, PARTITIONS)
+        self.assertIn(("/var/lib/docker/overlay2/x/merged", "overlay"), shown)
+
+    def test_probe_times_out_hung_drive(self):
+        release = threading.Event()
+
+        def fake_usage(drive):
+            if drive == "/nfs":
+                release.wait(5)
+            return usage(10)
+
+        with mock.patch.object(quick_check, "disk_usage", side_effect=fake_usage):
+            results = probe(["/", "/nfs"], timeout=0.1)
+        release.set()
+        self.assertEqual(results["/nfs"], {"error": "timeout"})
+        self.assertEqual(results["/"]["percent"], 10.0)
+
+    def test_probe_times_out_single_hung_drive(self):
+        release = threading.Event()
+
+        def fake_usage(drive):
+            release.wait(5)
+            return usage(10)
+
+        start = time.monotonic()
+        with mock.patch.object(quick_check, "disk_usage", side_effect=fake_usage):
+            results = probe(["/nfs"], timeout=0.1)
+        self.assertLess(time.monotonic() - start, 2)
+        release.set()
+        self.assertEqual(results, {"/nfs": {"error": "timeout"}})
+
+    def run_with(self, usages):
+        def fake_usage(drive):
+            value = usages[drive]
+            if isinstance(value, Exception):
+                raise value
+            return usage(value)
+
+        with mock.patch.object(quick_check, "read_partitions", return_value=PARTITIONS), \
+                mock.patch.object(quick_check, "disk_usage", side_effect=fake_usage):
+            return run_check({})
+
+    def test_exit_codes(self):
+        self.assertEqual(self.run_with({"/": 10, "/data": 65})[1], 0)
+        self.assertEqual(self.run_with({"/": 80, "/data": 10})[1], 1)
+        self.assertEqual(self.run_with({"/": 80, "/data": 95})[1], 2)
+        report, code = self.run_with({"/": 80, "/data": OSError(5, "Input/output error")})
+        self.assertEqual(code, EXIT_UNKNOWN)
+        self.assertEqual(report["drives"][1], {"drive": "/data", "fstype": "xfs", "level": "unknown",
+                                               "error": "Input/output error"})
+        # 严重级别优先于无法读取
+        self.assertEqual(self.run_with({"/": 95, "/data": OSError(5, "Input/output error")})[1], 2)
+
+    def test_main_prints_json(self):
+        out = io.StringIO()
+        with mock.patch.object(quick_check, "read_partitions", return_value=PARTITIONS), \
+                mock.patch.object(quick_check, "disk_usage", return_value=usage(80)), \
+                mock.patch.object(sys, "stdout", out):
+            code = quick_check.main(["--check", "--config", os.devnull, "--drive", "/data"])
+        report = json.loads(out.getvalue())
+        self.assertEqual(code, 1)
+        self.assertEqual(report["status"], "warning")
+        self.assertEqual([d["drive"] for d in report["drives"]], ["/data"])
+        self.assertEqual(report["drives"][0]["inodes_percent"], 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
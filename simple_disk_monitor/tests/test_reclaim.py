@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import reclaim
+from reclaim import ReclaimAnalyzer, walk_size, ROTATED_LOG_PATTERN
+
+
+class TestReclaimAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.cache_dir = os.path.join(self.root, "cache")
+        self.log_dir = os.path.join(self.root, "log")
+        os.makedirs(os.path.join(self.cache_dir, "sub"))
+        os.makedirs(self.log_dir)
+        for path, size in [
+            (os.path.join(self.cache_dir, "a.bin"), 8192),
+            (os.path.join(self.cache_dir, "sub", "b.bin"), 4096),
+            (os.path.join(self.log_dir, "app.log"), 4096),
+            (os.path.join(self.log_dir, "app.log.1"), 8192),
+            (os.path.join(self.log_dir, "app.log.2.gz"), 4096),
+        ]:
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_walk_size_stays_on_one_filesystem(self):
+        real_scandir = os.scandir
+
+        class MountedEntry:
+            """把 sub 目录伪装成另一个文件系统的挂载点"""
+
+            def __init__(self, entry):
+                self._entry = entry
+
+            def __getattr__(self, name):
+                return getattr(self._entry, name)
+
+            def stat(self, follow_symlinks=True):
+                st = self._entry.stat(follow_symlinks=follow_symlinks)
+                return os.stat_result((st.st_mode, st.st_ino, st.st_dev + 1) + tuple(st)[3:])
+
+        class FakeScandir:
+            def __init__(self, path):
+                self._it = real_scandir(path)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._it.close()
+
+            def __iter__(self):
+                for entry in self._it:
+                    yield MountedEntry(entry) if entry.name == "sub" else entry
+
+        full = walk_size(self.cache_dir)
+        with mock.patch.object(reclaim.os, "scandir", FakeScandir):
+            self.assertEqual(walk_size(self.cache_dir), full - walk_size(os.path.join(self.cache_dir, "sub")))
+
+    def test_walk_size_with_pattern(self):
+        self.assertGreaterEqual(walk_size(self.cache_dir), 12288)
+        rotated = walk_size(self.log_dir, ROTATED_LOG_PATTERN)
+        self.assertGreaterEqual(rotated, 12288)
+        self.assertLess(rotated, walk_size(self.log_dir))
+
+    def test_analyze_groups_by_drive_and_caches(self):
+        catalog = [
+            {"category": "pip_cache", "path": self.cache_dir, "pattern": None},
+            {"category": "rotated_logs", "path": self.log_dir, "pattern": ROTATED_LOG_PATTERN},
+            {"category": "tmp", "path": os.path.join(self.root, "missing"), "pattern": None},
+        ]
+        analyzer = ReclaimAnalyzer(ttl=60, max_workers=2)
+        result = analyzer.analyze([self.root, "/nonexistent-drive"], catalog)
+        info = result[self.root]
+        self.assertEqual([item["category"] for item in info["items"]], ["pip_cache", "rotated_logs"])
+        self.assertEqual(info["total"], sum(item["bytes"] for item in info["items"]))
+        self.assertEqual(result["/nonexistent-drive"]["total"], 0)
+
+        # 缓存期间删除文件不影响结果
+        os.remove(os.path.join(self.cache_dir, "a.bin"))
+        self.assertIs(analyzer.analyze([self.root, "/nonexistent-drive"], catalog), result)
+        analyzer.invalidate()
+        self.assertLess(analyzer.analyze([self.root, "/nonexistent-drive"], catalog)[self.root]["total"], info["total"])
+
+
+if __name__ == '__main__':
+    unittest.main()
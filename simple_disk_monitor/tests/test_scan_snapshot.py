@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from scan_snapshot import (iter_scan, iter_snapshot, order_key, save_snapshot,
+                           diff_records, diff_snapshots, write_snapshot, read_header)
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+class TestScanSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "root")
+        _write(os.path.join(self.root, "a", "b", "f1"), 4096)
+        _write(os.path.join(self.root, "a-b", "f2"), 4096)
+        _write(os.path.join(self.root, "c\tweird", "f3"), 4096)
+        _write(os.path.join(self.root, "top"), 4096)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_order_is_post_order(self):
+        paths = [relpath for relpath, _, _ in iter_scan(self.root)]
+        self.assertEqual(paths, sorted(paths, key=order_key))
+        self.assertEqual(paths, ["a/b", "a", "a-b", "c\tweird", ""])
+
+    def test_roundtrip(self):
+        output = os.path.join(self.tmp.name, "snap.gz")
+        self.assertEqual(save_snapshot(self.root, output), 5)
+        self.assertEqual(list(iter_snapshot(output)), list(iter_scan(self.root)))
+        self.assertEqual(read_header(output)["root"], os.path.abspath(self.root))
+
+    def test_diff_reports_deepest_growing_subtree(self):
+        old = os.path.join(self.tmp.name, "old.gz")
+        new = os.path.join(self.tmp.name, "new.gz")
+        save_snapshot(self.root, old)
+        _write(os.path.join(self.root, "a", "b", "big"), 4 * 1024 * 1024)
+        _write(os.path.join(self.root, "new_dir", "f"), 8192)
+        save_snapshot(self.root, new)
+
+        result = diff_snapshots(old, new, top_n=5, min_bytes=0)
+        absolute = [item["path"] for item in result["absolute"]]
+        self.assertEqual(absolute[0], "a/b")
+        # 增长完全来自子目录的祖先目录不会出现在结果中
+        self.assertNotIn("a", absolute)
+        self.assertIn("new_dir", absolute)
+        self.assertGreater(result["new_total"], result["old_total"])
+        self.assertEqual(result["relative"][0]["path"], "a/b")
+
+    def test_diff_records_handles_removed_directories(self):
+        old = [("x", 100, 1), ("y", 50, 1), ("", 150, 2)]
+        new = [("x", 300, 1), ("", 300, 1)]
+        result = diff_records(old, new, min_bytes=0)
+        self.assertEqual(result["compared"], 3)
+        self.assertEqual([item["path"] for item in result["absolute"]], ["x"])
+
+    def test_write_snapshot_uses_prefix_encoding(self):
+        output = os.path.join(self.tmp.name, "prefix.gz")
+        records = [("dir/sub1", 1, 1), ("dir/sub2", 1, 1), ("dir", 2, 2), ("", 2, 2)]
+        write_snapshot(records, output)
+        self.assertEqual(list(iter_snapshot(output)), records)
+
+
+if __name__ == '__main__':
+    unittest.main()
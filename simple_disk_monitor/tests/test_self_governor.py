@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from self_governor import SelfGovernor, MAX_LEVEL, RECOVER_SAMPLES
+
+
+class TestSelfGovernor(unittest.TestCase):
+
+    def test_within_budget_stays_normal(self):
+        governor = SelfGovernor(cpu_percent=0, rss_mb=100000, threads=100000, fds=100000)
+        self.assertEqual(governor.sample(), (0, 0))
+        self.assertEqual(governor.interval_multiplier(), 1)
+        self.assertTrue(governor.allows_optional_work())
+        status = governor.status()
+        self.assertIn("rss_mb", status["usage"])
+        self.assertGreater(status["usage"]["threads"], 0)
+
+    def test_escalates_and_recovers(self):
+        # 1MB内存预算必然超出
+        governor = SelfGovernor(cpu_percent=0, rss_mb=1, threads=0, fds=0)
+        for expected in range(1, MAX_LEVEL + 2):
+            governor.sample()
+            self.assertEqual(governor.level, min(expected, MAX_LEVEL))
+        self.assertFalse(governor.allows_optional_work())
+        self.assertEqual(governor.interval_multiplier(), 4)
+
+        governor.budgets["rss_mb"] = 100000
+        for _ in range(RECOVER_SAMPLES - 1):
+            governor.sample()
+        self.assertEqual(governor.level, MAX_LEVEL)
+        governor.sample()
+        self.assertEqual(governor.level, MAX_LEVEL - 1)
+
+    def test_concurrent_samples_stay_consistent(self):
+        governor = SelfGovernor(cpu_percent=0, rss_mb=100000, threads=100000, fds=100000)
+        self.assertEqual(governor.status()["usage"], {})
+        cpu = []
+
+        def sampler():
+            for _ in range(100):
+                governor.sample()
+                cpu.append(governor.status()["usage"]["cpu_percent"])
+
+        threads = [threading.Thread(target=sampler) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 采样不在锁内时，旧的CPU时间会与新的时间戳配对，算出负的占用率
+        self.assertTrue(all(value >= 0 for value in cpu))
+
+    def test_due(self):
+        governor = SelfGovernor(check_seconds=3600)
+        self.assertFalse(governor.due())
+        governor.check_seconds = 0
+        self.assertTrue(governor.due())
+
+
+if __name__ == "__main__":
+    unittest.main()
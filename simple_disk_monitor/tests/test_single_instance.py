@@ -0,0 +1,137 @@
+import io
+import os
+import sys
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import subprocess
+from unittest import mock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+import single_instance
+from single_instance import EXIT_FAILED, EXIT_NOT_RUNNING, EXIT_OK, SingleInstance, send_command
+
+
+@unittest.skipIf(sys.platform == "win32", "测试 flock 和 Unix 域套接字")
+class TestSingleInstance(unittest.TestCase):
+
+    def setUp(self):
+        # Unix 域套接字路径有长度限制，不使用 tempfile 的默认长路径
+        self.tmp = tempfile.mkdtemp(dir="/tmp")
+        patcher = mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmp})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.commands = []
+        self.instance = SingleInstance("TestInstance")
+        self.assertTrue(self.instance.check())
+        self.addCleanup(self.instance.release)
+
+    def handler(self, command):
+        self.commands.append(command)
+        if command == "open-settings":
+            raise ValueError("no settings window")
+        return f"done {command}"
+
+    def test_forward_commands(self):
+        self.instance.serve(self.handler)
+        with open(single_instance.lock_path("TestInstance")) as f:
+            self.assertEqual(f.read().strip(), str(os.getpid()))
+        self.assertEqual(send_command("reload", "TestInstance"), {"ok": True, "message": "done reload"})
+        self.assertEqual(send_command("open-settings", "TestInstance"),
+                         {"ok": False, "message": "no settings window"})
+        self.assertFalse(send_command("format-disk", "TestInstance")["ok"])
+        self.assertEqual(self.commands, ["reload", "open-settings"])
+
+    def test_main_exit_codes(self):
+        self.instance.serve(self.handler)
+        out = io.StringIO()
+        with mock.patch.object(sys, "stdout", out), mock.patch.object(sys, "stderr", io.StringIO()):
+            self.assertEqual(single_instance.main(["--check-now", "--reload"], "TestInstance"), EXIT_OK)
+            self.assertEqual(single_instance.main(["--open-settings"], "TestInstance"), EXIT_FAILED)
+        self.assertEqual(out.getvalue().splitlines(), ["done check-now", "done reload"])
+
+        self.instance.release()
+        with mock.patch.object(sys, "stderr", io.StringIO()):
+            self.assertEqual(single_instance.main(["--reload"], "TestInstance"), EXIT_NOT_RUNNING)
+
+    def test_release_stops_server(self):
+        self.instance.serve(self.handler)
+        address = self.instance.address
+        self.instance.release()
+        self.assertFalse(os.path.exists(address))
+        self.assertFalse(any(t.name == "instance-commands" and t.is_alive() for t in threading.enumerate()))
+        # 锁已释放，新实例可以接管并重新创建端点
+        successor = SingleInstance("TestInstance")
+        self.assertTrue(successor.check())
+        successor.serve(self.handler)
+        self.assertTrue(send_command("check-now", "TestInstance")["ok"])
+        successor.release()
+
+    def test_stale_socket_is_replaced(self):
+        # 模拟异常退出留下的套接字文件
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.instance.address)
+        stale.close()
+        self.instance.serve(self.handler)
+        self.assertTrue(send_command("reload", "TestInstance")["ok"])
+
+    def test_regular_file_is_not_replaced(self):
+        with open(self.instance.address, "w") as f:
+            f.write("keep me")
+        with self.assertLogs(level="ERROR"):
+            self.instance.serve(self.handler)
+        with open(self.instance.address) as f:
+            self.assertEqual(f.read(), "keep me")
+
+    def test_private_fallback_dir(self):
+        self.instance.release()
+        with mock.patch.dict(os.environ), mock.patch.object(single_instance, "TMP_DIR", self.tmp):
+            del os.environ["XDG_RUNTIME_DIR"]
+            instance = SingleInstance("TestInstance")
+            self.assertTrue(instance.check())
+            directory = os.path.dirname(single_instance.lock_path("TestInstance"))
+            instance.release()
+            self.assertEqual(os.path.dirname(directory), self.tmp)
+            self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
+
+            # 其他用户可以访问的目录不使用
+            os.chmod(directory, 0o777)
+            with self.assertRaises(PermissionError):
+                single_instance.ensure_runtime_dir("TestInstance")
+            os.chmod(directory, 0o700)
+
+            # 锁文件位置上的符号链接不会被跟随，链接指向的文件不会被截断
+            victim = os.path.join(self.tmp, "victim")
+            with open(victim, "w") as f:
+                f.write("data")
+            os.remove(single_instance.lock_path("TestInstance"))
+            os.symlink(victim, single_instance.lock_path("TestInstance"))
+            with self.assertLogs(level="ERROR"):
+                SingleInstance("TestInstance").check()
+            with open(victim) as f:
+                self.assertEqual(f.read(), "data")
+
+    def test_script_forwards_without_loading_core(self):
+        instance = SingleInstance()
+        instance.release()
+        self.instance.release()
+        self.assertTrue(instance.check())
+        instance.serve(self.handler)
+        try:
+            env = dict(os.environ, XDG_RUNTIME_DIR=self.tmp)
+            result = subprocess.run([sys.executable, "-X", "importtime", "simple_disk_monitor.py", "--reload"],
+                                    cwd=ROOT, env=env, capture_output=True, text=True)
+        finally:
+            instance.release()
+        self.assertEqual(result.returncode, EXIT_OK)
+        self.assertEqual(result.stdout.strip(), "done reload")
+        self.assertNotIn("psutil", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
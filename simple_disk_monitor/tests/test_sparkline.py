@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from history import UsageHistory
+from sparkline import SparklineCache, chart_coords, downsample_minmax, render_sparkline, value_range
+
+
+class TestSparkline(unittest.TestCase):
+
+    def test_downsample_keeps_min_and_max_per_column(self):
+        points = [(t, v, v, v) for t, v in enumerate([5, 1, 9, 3, 4, 4, 8, 2])]
+        columns = downsample_minmax(points, 4, 0, 7)
+        # 8个点映射到4列，尖峰不会因为降采样而丢失
+        self.assertEqual([c[0] for c in columns], [0, 1, 2, 3])
+        self.assertEqual(value_range(columns), (1, 9))
+        self.assertEqual(columns[0], (0, 1, 9))
+        # 超出时间范围的点被忽略
+        self.assertEqual(downsample_minmax(points, 4, 10, 20), [])
+
+    def test_chart_coords_fit_inside_canvas(self):
+        columns = [(0, 10, 20), (1, 15, 15), (9, 0, 30)]
+        coords = chart_coords(columns, 20, 40, padding=5)
+        xs, ys = coords[0::2], coords[1::2]
+        self.assertTrue(all(5 <= x < 15 for x in xs))
+        self.assertTrue(all(5 <= y <= 34 for y in ys))
+        self.assertEqual(min(ys), 5)
+        self.assertEqual(max(ys), 34)
+        self.assertEqual(chart_coords([(0, 1, 1)], 20, 40), [])
+
+    def test_render_and_cache(self):
+        image = render_sparkline([(0, 1, 1), (57, 2, 2)])
+        self.assertEqual(image.size, (60, 16))
+        self.assertIsNotNone(image.getbbox())
+
+        cache = SparklineCache()
+        points = [(0, 1, 1, 1), (60, 2, 2, 2)]
+        first, changed = cache.get("/", "hour", points, 0, 3600)
+        self.assertTrue(changed)
+        self.assertIs(cache.get("/", "hour", points, 0, 3600)[0], first)
+        self.assertTrue(cache.get("/", "hour", points + [(120, 3, 3, 3)], 0, 3600)[1])
+
+    def test_hundreds_of_drives_render_quickly(self):
+        history = UsageHistory()
+        now = 1_000_000
+        for t in range(0, 7 * 24 * 3600, 300):
+            history.record("/", (t * 7919) % 10 ** 9, 10 ** 10, ts=now + t)
+        points = history.series("/", "week")
+        t1 = points[-1][0]
+        cache = SparklineCache()
+        start = time.perf_counter()
+        for i in range(300):
+            cache.get(f"/mnt/{i}", "week", points, t1 - 7 * 24 * 3600, t1)
+        elapsed = time.perf_counter() - start
+        # 正常约30毫秒；放宽上限，避免在很慢的机器上误报
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import subprocess
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+from measure_startup import UI_MODULES, parse_importtime
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_core_import_does_not_load_ui(self):
+        code = ("import sys, simple_disk_monitor; "
+                "print(','.join(m for m in sys.modules if m.split('.')[0] in "
+                f"{UI_MODULES + ('multiprocessing', 'ctypes', 'config_window', 'status_view', 'alert_digest')!r}))")
+        env = dict(os.environ, PYSTRAY_BACKEND="dummy")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_parse_importtime(self):
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   _io",
+            "import time:      1500 |       4000 | psutil",
+            "some warning",
+            "import time:        10 |         10 | psutil",
+        ])
+        times = parse_importtime(stderr)
+        self.assertEqual(times, {"_io": (120, 120), "psutil": (1500, 4000)})
+
+
+if __name__ == "__main__":
+    unittest.main()
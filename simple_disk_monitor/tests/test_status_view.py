@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from status_view import COLUMNS, diff_rows, format_row, sort_value
+
+GB = 1024 ** 3
+
+
+def make_info(drive, percent, free, growth=None, level="normal"):
+    return {
+        "drive": drive,
+        "level": level,
+        "usage": {"percent": percent, "used": 100 * GB - free, "free": free, "total": 100 * GB},
+        "growth": growth,
+        "latency": {"statvfs": {"p50_ms": 0.1, "p99_ms": 2.5, "max_ms": 3.0, "count": 5, "errors": 0}},
+    }
+
+
+class TestStatusView(unittest.TestCase):
+
+    def test_format_row(self):
+        row = format_row(make_info("/data", 42.0, 58 * GB, growth=GB / 3600), lambda key: key)
+        self.assertEqual(len(row), len(COLUMNS))
+        values = dict(zip(COLUMNS, row))
+        self.assertEqual(values["level"], "level_normal")
+        self.assertEqual(values["percent"], "42.0%")
+        self.assertEqual(values["growth"], "+1.00 GB/h")
+        self.assertEqual(values["reclaimable"], "-")
+        self.assertEqual(values["latency"], "2.5 ms")
+
+    def test_diff_rows_reports_only_changed_cells(self):
+        translate = lambda key: key
+        old = {d["drive"]: format_row(d, translate) for d in (make_info("/a", 10, 90 * GB), make_info("/b", 20, 80 * GB))}
+        new = {d["drive"]: format_row(d, translate) for d in (make_info("/a", 10, 90 * GB), make_info("/c", 5, 95 * GB),
+                                                             make_info("/b", 95, 80 * GB, level="critical"))}
+        added, removed, changed = diff_rows(old, new)
+        self.assertEqual(added, ["/c"])
+        self.assertEqual(removed, [])
+        self.assertEqual(set(changed), {"/b"})
+        self.assertEqual(changed["/b"], {"level": "level_critical", "percent": "95.0%"})
+
+        added, removed, changed = diff_rows(new, old)
+        self.assertEqual(removed, ["/c"])
+
+    def test_sort_value_puts_missing_values_last(self):
+        infos = [make_info("/a", 10, 90 * GB), make_info("/b", 20, 80 * GB, growth=5.0),
+                 make_info("/c", 30, 70 * GB, growth=-1.0)]
+        order = sorted(infos, key=lambda i: sort_value(i, "growth", True), reverse=True)
+        self.assertEqual([i["drive"] for i in order], ["/b", "/c", "/a"])
+        order = sorted(infos, key=lambda i: sort_value(i, "growth", False))
+        self.assertEqual([i["drive"] for i in order], ["/c", "/b", "/a"])
+        order = sorted(infos, key=lambda i: sort_value(i, "free", True), reverse=True)
+        self.assertEqual([i["drive"] for i in order], ["/a", "/b", "/c"])
+        # 没有延迟数据的驱动器同样在两个方向上都排在最后
+        infos[1]["latency"] = {}
+        for descending in (True, False):
+            order = sorted(infos, key=lambda i: sort_value(i, "latency", descending), reverse=descending)
+            self.assertEqual(order[-1]["drive"], "/b")
+
+
+if __name__ == "__main__":
+    unittest.main()
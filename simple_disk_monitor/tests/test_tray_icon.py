@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from language import get_text
+from tray_icon import (BUCKETS, TOOLTIP_MAX_CHARS, IconCache, bucket_for, render_icon,
+                       tooltip_text, worst_drive)
+
+
+def make_info(drive, percent, level):
+    return {"drive": drive, "level": level, "usage": {"percent": percent}}
+
+
+class TestTrayIcon(unittest.TestCase):
+
+    def test_buckets(self):
+        self.assertEqual(bucket_for(0), 0)
+        self.assertEqual(bucket_for(9.9), 0)
+        self.assertEqual(bucket_for(55), 5)
+        self.assertEqual(bucket_for(99.9), BUCKETS - 1)
+        self.assertEqual(bucket_for(100), BUCKETS)
+
+    def test_cache_returns_same_image(self):
+        cache = IconCache()
+        image = cache.get(5, "warning")
+        self.assertIs(cache.get(5, "warning"), image)
+        self.assertIsNot(cache.get(5, "critical"), image)
+        self.assertEqual(image.size, (64, 64))
+        # 填充越多，有颜色的像素越多
+        def filled(image):
+            return sum(count for count, color in image.getcolors(64 * 64) if color[:3] == (0, 120, 215))
+        self.assertGreater(filled(render_icon(9, "normal")), filled(render_icon(2, "normal")))
+        self.assertEqual(filled(render_icon(0, "normal")), 0)
+
+    def test_worst_drive_and_tooltip(self):
+        infos = [make_info("/a", 95, "critical"), make_info("/b", 99, "normal"), make_info("/c", 80, "warning"),
+                 make_info("/d", 70, "notice"), make_info("/e", 10, "normal")]
+        self.assertEqual(worst_drive(infos)["drive"], "/a")
+        self.assertIsNone(worst_drive([]))
+
+        translate = lambda key, *args: get_text(key, "en_US", *args)
+        text = tooltip_text("Disk Monitor", infos, translate)
+        self.assertEqual(text.splitlines(), ["Disk Monitor", "/a 95% Critical", "/c 80% Warning",
+                                             "/d 70% Notice", "2 more drives"])
+        long_infos = [make_info("/very/long/mount/point/" + str(i) * 40, 50, "notice") for i in range(5)]
+        self.assertLessEqual(len(tooltip_text("Disk Monitor", long_infos, translate)), TOOLTIP_MAX_CHARS)
+
+
+if __name__ == "__main__":
+    unittest.main()
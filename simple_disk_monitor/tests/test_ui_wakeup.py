@@ -0,0 +1,110 @@
+import os
+import select
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ui_wakeup import WAKE_EVENT, PipeWaker, WakeupQueue, attach
+
+
+@unittest.skipIf(sys.platform == "win32", "自管道唤醒只在Unix上使用")
+class TestPipeWaker(unittest.TestCase):
+
+    def setUp(self):
+        self.waker = PipeWaker()
+        self.addCleanup(self.waker.close)
+
+    def readable(self, timeout=0):
+        return bool(select.select([self.waker.fileno()], [], [], timeout)[0])
+
+    def test_wakes_are_coalesced_until_consumed(self):
+        self.assertFalse(self.readable())
+        for _ in range(1000):
+            self.waker.wake()
+        self.assertTrue(self.readable())
+        self.assertEqual(os.read(self.waker.fileno(), 4096), b"\0")
+        self.waker.wake()
+        self.assertFalse(self.readable())
+
+        self.waker.consume()
+        self.assertFalse(self.readable())
+        self.waker.wake()
+        self.assertTrue(self.readable())
+
+    def test_queue_wakes_consumer_thread(self):
+        ui_queue = WakeupQueue()
+        ui_queue.put(("early",))
+        ui_queue.set_waker(self.waker.wake)
+        # 设置唤醒函数前已入队的任务也会触发唤醒
+        self.assertTrue(self.readable())
+        self.waker.consume()
+        ui_queue.get()
+
+        threading.Timer(0.05, lambda: ui_queue.put(("check_now",))).start()
+        self.assertTrue(self.readable(timeout=5))
+        self.waker.consume()
+        self.assertEqual(ui_queue.get(block=False), ("check_now",))
+        self.assertFalse(self.readable())
+
+
+class FakeTk:
+    """没有 createfilehandler、启用了线程支持的Tcl解释器"""
+
+    def eval(self, script):
+        return "1"
+
+
+class FakeRoot:
+    def __init__(self, failures):
+        self.tk = FakeTk()
+        self.failures = failures
+        self.bindings = {}
+        self.generated = []
+
+    def bind(self, sequence, callback):
+        self.bindings[sequence] = callback
+
+    def event_generate(self, sequence, when=None):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("main thread is not in main loop")
+        self.generated.append(sequence)
+
+
+class TestVirtualEventWake(unittest.TestCase):
+
+    def test_failed_event_generate_does_not_block_later_wakes(self):
+        root = FakeRoot(failures=1)
+        ui_queue = WakeupQueue()
+        handled = []
+        attach(root, ui_queue, lambda: handled.append(ui_queue.get(block=False)))
+        with self.assertLogs(level="ERROR"):
+            ui_queue.put(("lost",))
+        self.assertEqual(root.generated, [])
+        ui_queue.put(("check_now",))
+        ui_queue.put(("coalesced",))
+        self.assertEqual(root.generated, [WAKE_EVENT])
+        root.bindings[WAKE_EVENT](None)
+        self.assertEqual(handled, [("lost",)])
+
+
+class TestCheckQueue(unittest.TestCase):
+
+    def test_bad_task_does_not_strand_later_tasks(self):
+        from simple_disk_monitor import SimpleDiskMonitor
+        monitor = mock.Mock()
+        monitor.ui_queue = WakeupQueue()
+        # 格式错误的任务在记录错误时也会出错，之后的任务仍应在同一次唤醒中处理
+        monitor.ui_queue.put(None)
+        monitor.ui_queue.put(("run_disk_check",))
+        with self.assertLogs(level="ERROR"):
+            SimpleDiskMonitor.check_queue(monitor)
+        monitor._handle_disk_check_request.assert_called_once_with()
+        self.assertTrue(monitor.ui_queue.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import sys
+import gzip
+import json
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from history import UsageHistory
+from web_api import ApiState, ResponseCache, etag_matches, start_server
+
+
+def cycle_record(percent=80.0):
+    return {
+        "type": "cycle", "time": "2024-01-01T00:00:00+0000",
+        "drives": [{"drive": "/", "level": "warning", "latency": {},
+                    "usage": {"total": 1000, "used": 800, "free": 200, "percent": percent}}],
+        "thresholds": {"notice": 60, "warning": 75, "critical": 90},
+        "cycle_stats": {"count": 1, "sum": 0.1, "last": 0.1, "finished": 0.0},
+    }
+
+
+def transition(drive, level, previous):
+    return {"type": "transition", "time": "t", "drive": drive, "level": level, "previous": previous,
+            "percent": 80.0, "free": 200, "used": 800}
+
+
+class TestWebApiHelpers(unittest.TestCase):
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches('W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+
+    def test_cache_builds_once(self):
+        cache = ResponseCache(maxsize=2)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return b"x" * 1000
+
+        body, compressed = cache.get('"1"', build, True)
+        self.assertTrue(compressed)
+        self.assertEqual(gzip.decompress(body), b"x" * 1000)
+        self.assertEqual(cache.get('"1"', build, False), (b"x" * 1000, False))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get('"2"', lambda: b"small", True), (b"small", False))
+        cache.get('"3"', build, False)
+        cache.get('"1"', build, False)
+        self.assertEqual(len(calls), 3)
+
+    def test_alert_log(self):
+        state = ApiState(UsageHistory(), alert_log_size=3)
+        for i in range(5):
+            state(transition(f"/d{i}", "warning", "normal"))
+        state({"type": "sample", "drive": "/"})
+        _, build = state.alerts({"limit": ["2"]})
+        data = json.loads(build())
+        self.assertEqual(data["last_id"], 5)
+        self.assertEqual([a["drive"] for a in data["alerts"]], ["/d4", "/d3"])
+        _, build = state.alerts({"after": ["4"]})
+        self.assertEqual([a["id"] for a in json.loads(build())["alerts"]], [5])
+
+
+class TestWebApiServer(unittest.TestCase):
+
+    def setUp(self):
+        self.history = UsageHistory()
+        for i in range(60):
+            self.history.record("/", 500 + i, 1000, ts=1000000 + i * 60)
+        self.state = ApiState(self.history)
+        self.server = start_server(self.state, port=0)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path, headers=None):
+        request = urllib.request.Request(self.base + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            with e:
+                return e.code, dict(e.headers), e.read()
+
+    def test_status_etag(self):
+        self.assertEqual(self.get("/api/status")[0], 503)
+        self.state(cycle_record())
+        status, headers, body = self.get("/api/status")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["drives"][0]["level"], "warning")
+        etag = headers["ETag"]
+        self.assertEqual(self.get("/api/status", {"If-None-Match": etag})[0], 304)
+        self.state(cycle_record(81.0))
+        status, headers, _ = self.get("/api/status", {"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+
+    def test_history_downsampled_and_gzipped(self):
+        status, headers, body = self.get("/api/history?drive=/&tier=hour&points=10",
+                                         {"Accept-Encoding": "gzip"})
+        self.assertEqual(status, 200)
+        if headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        data = json.loads(body)
+        self.assertLessEqual(len(data["points"]), 10)
+        self.assertEqual(data["points"][-1][2], 559)
+        self.assertEqual(data["total"], 1000)
+        self.assertEqual(self.get("/api/history?drive=/&tier=hour&points=10",
+                                  {"If-None-Match": headers["ETag"]})[0], 304)
+        # 新样本改变 ETag
+        self.history.record("/", 600, 1000, ts=1000000 + 3600)
+        self.assertEqual(self.get("/api/history?drive=/&tier=hour&points=10",
+                                  {"If-None-Match": headers["ETag"]})[0], 200)
+
+    def test_errors(self):
+        self.assertEqual(self.get("/api/history")[0], 400)
+        self.assertEqual(self.get("/api/history?drive=/&tier=year")[0], 400)
+        self.assertEqual(self.get("/api/history?drive=/&points=x")[0], 400)
+        for value in ("nan", "inf", "-inf", "NaN"):
+            self.assertEqual(self.get(f"/api/history?drive=/&since={value}")[0], 400)
+            self.assertEqual(self.get(f"/api/history?drive=/&until={value}")[0], 400)
+        self.assertEqual(self.get("/api/history?drive=/missing")[0], 404)
+        self.assertEqual(self.get("/nothing")[0], 404)
+
+    def test_dashboard(self):
+        status, headers, body = self.get("/", {"Accept-Encoding": "gzip"})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertIn(b"/api/status", gzip.decompress(body))
+
+
+if __name__ == "__main__":
+    unittest.main()
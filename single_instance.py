@@ -0,0 +1,314 @@
+"""
+单实例锁和命令转发
+
+第一个实例持有锁（Windows 为命名互斥体，其他平台为运行时目录中锁文件上的 flock，文件内容为PID），
+并在本机的命令端点上接受命令：其他平台为锁文件旁边的 Unix 域套接字，Windows 为命名管道。
+运行时目录为 XDG_RUNTIME_DIR；未设置时（macOS、cron、普通 ssh 会话）使用 /tmp 下只属于当前用户、
+权限为 0700 的目录，其他用户无法在其中预先放置符号链接或抢先加锁。
+之后启动的 --check-now、--open-settings、--reload 不再创建监控器，而是把命令转发给
+运行中的实例后立即退出：在 Unix 上只需导入本模块、json 和 socket，不加载 psutil 和界面。
+
+协议：客户端发送一行JSON {"command": 命令}，服务端回复一行JSON {"ok": 是否成功, "message": 说明}。
+"""
+
+import os
+import sys
+import json
+import stat
+import socket
+import logging
+import threading
+
+APP_NAME = "SimpleDiskMonitor"
+# 可以转发的命令，对应命令行参数 --<命令>
+COMMANDS = ("check-now", "open-settings", "reload")
+# 客户端等待回复的时间（秒）
+REPLY_TIMEOUT = 5.0
+MAX_MESSAGE_SIZE = 4096
+# 未设置 XDG_RUNTIME_DIR 时，在该目录下创建当前用户专有的运行时目录
+TMP_DIR = "/tmp"
+
+EXIT_OK = 0
+EXIT_NOT_RUNNING = 1
+EXIT_FAILED = 2
+
+
+def runtime_dir(app_name=APP_NAME):
+    return os.environ.get("XDG_RUNTIME_DIR") or os.path.join(TMP_DIR, f"{app_name}-{os.getuid()}")
+
+
+def ensure_runtime_dir(app_name=APP_NAME, create=True):
+    """
+    返回运行时目录；使用 /tmp 下的后备目录时按需创建，并确认它是当前用户所有、其他用户无权访问的目录
+
+    目录不安全时抛出 OSError
+    """
+    path = runtime_dir(app_name)
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return path
+    if create:
+        try:
+            os.mkdir(path, 0o700)
+        except FileExistsError:
+            pass
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return path
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory owned by the current user")
+    return path
+
+
+def lock_path(app_name=APP_NAME):
+    return os.path.join(runtime_dir(app_name), f"{app_name}-{os.getuid()}.lock")
+
+
+def ipc_address(app_name=APP_NAME):
+    """命令端点的地址：Windows 为命名管道，其他平台为 Unix 域套接字路径"""
+    if sys.platform == "win32":
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\{app_name}-{user}"
+    return os.path.join(runtime_dir(app_name), f"{app_name}-{os.getuid()}.sock")
+
+
+def _read_line(sock):
+    data = b""
+    while b"\n" not in data and len(data) < MAX_MESSAGE_SIZE:
+        chunk = sock.recv(MAX_MESSAGE_SIZE)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b"\n", 1)[0]
+
+
+class SingleInstance:
+    """
+    单例模式实现，确保程序只有一个实例在运行
+
+    check() 成功后可以调用 serve(handler) 接受其他进程转发的命令，
+    handler(command) 返回说明文本，命令无法执行时抛出 ValueError。
+    """
+    def __init__(self, app_name=APP_NAME):
+        self.app_name = app_name
+        self.mutex_name = f'Global\\{app_name}'
+        self.mutex = None
+        self.lock_file = None
+        self.address = ipc_address(app_name)
+        self._listener = None
+        self._thread = None
+        self._closing = False
+
+    def check(self):
+        """
+        检查是否已有实例在运行
+        返回：True表示这是唯一实例，False表示已有实例在运行
+        """
+        if sys.platform != 'win32':
+            return self._check_lock_file()
+        try:
+            import ctypes
+            # 尝试创建命名互斥体
+            self.mutex = ctypes.windll.kernel32.CreateMutexW(None, False, self.mutex_name)
+            last_error = ctypes.windll.kernel32.GetLastError()
+
+            # 如果互斥体已存在，说明已有实例在运行
+            if last_error == 183:  # ERROR_ALREADY_EXISTS
+                logging.warning("程序已经在运行中，拒绝启动新实例")
+                return False
+            return True
+        except Exception as e:
+            logging.error(f"检查单例时发生错误: {e}", exc_info=True)
+            # 出错时允许程序继续运行
+            return True
+
+    def _check_lock_file(self):
+        """非Windows平台：对运行时目录中的锁文件加 flock，进程退出时由内核自动释放"""
+        import fcntl
+        path = lock_path(self.app_name)
+        try:
+            ensure_runtime_dir(self.app_name)
+            # 不跟随符号链接，避免截断链接指向的其他文件
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+            lock_file = os.fdopen(fd, "r+")
+        except OSError as e:
+            logging.error(f"无法打开单例锁文件 {path}: {e}")
+            return True
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            logging.warning("程序已经在运行中，拒绝启动新实例")
+            return False
+        except OSError as e:
+            lock_file.close()
+            logging.error(f"锁定单例锁文件 {path} 时出错: {e}")
+            return True
+        lock_file.truncate(0)
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self.lock_file = lock_file
+        return True
+
+    def serve(self, handler):
+        """在后台线程中接受转发的命令；端点无法创建时只记录错误，已在接受时什么也不做"""
+        if self._listener is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                from multiprocessing.connection import Listener
+                self._listener = Listener(self.address, family="AF_PIPE")
+                target = self._serve_pipe
+            else:
+                ensure_runtime_dir(self.app_name)
+                # 持有 flock 时不会有其他实例在监听，旧的套接字文件是上次异常退出留下的；
+                # 不是套接字的文件不删除
+                try:
+                    mode = os.lstat(self.address).st_mode
+                except FileNotFoundError:
+                    mode = None
+                if mode is not None:
+                    if not stat.S_ISSOCK(mode):
+                        raise OSError(f"{self.address} exists and is not a socket")
+                    os.unlink(self.address)
+                listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                listener.bind(self.address)
+                os.chmod(self.address, 0o600)
+                listener.listen(4)
+                self._listener = listener
+                target = self._serve_socket
+        except OSError as e:
+            logging.error(f"无法创建命令端点 {self.address}: {e}")
+            return
+        self._thread = threading.Thread(target=target, args=(handler,), name="instance-commands", daemon=True)
+        self._thread.start()
+
+    def _serve_socket(self, handler):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            if self._closing:
+                conn.close()
+                return
+            with conn:
+                try:
+                    conn.settimeout(REPLY_TIMEOUT)
+                    reply = self._dispatch(handler, _read_line(conn))
+                    conn.sendall(reply + b"\n")
+                except OSError as e:
+                    logging.warning(f"处理转发的命令时连接出错: {e}")
+
+    def _serve_pipe(self, handler):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return
+            if self._closing:
+                conn.close()
+                return
+            with conn:
+                try:
+                    conn.send_bytes(self._dispatch(handler, conn.recv_bytes(MAX_MESSAGE_SIZE)))
+                except (OSError, EOFError) as e:
+                    logging.warning(f"处理转发的命令时连接出错: {e}")
+
+    def _dispatch(self, handler, data):
+        try:
+            command = json.loads(data.decode("utf-8"))["command"]
+            if command not in COMMANDS:
+                raise ValueError(f"unknown command: {command}")
+            logging.info(f"收到转发的命令: {command}")
+            reply = {"ok": True, "message": handler(command)}
+        except (ValueError, KeyError, TypeError) as e:
+            reply = {"ok": False, "message": str(e)}
+        except Exception as e:
+            logging.error(f"执行转发的命令时出错: {e}", exc_info=True)
+            reply = {"ok": False, "message": str(e)}
+        return json.dumps(reply, ensure_ascii=False).encode("utf-8")
+
+    def release(self):
+        """释放互斥体和锁文件，关闭命令端点"""
+        if self._listener:
+            self._closing = True
+            # 连接一次唤醒阻塞在 accept 上的线程，各平台都可靠；
+            # 服务端直接关闭连接，Windows 的命名管道客户端此时抛出 EOFError
+            try:
+                send_command("", self.app_name, timeout=0.5, address=self.address)
+            except (OSError, EOFError):
+                pass
+            self._thread.join(1.0)
+            self._listener.close()
+            self._listener = None
+            if sys.platform != "win32":
+                try:
+                    os.unlink(self.address)
+                except OSError:
+                    pass
+        if self.lock_file:
+            self.lock_file.close()
+            self.lock_file = None
+        if self.mutex:
+            try:
+                import ctypes
+                ctypes.windll.kernel32.ReleaseMutex(self.mutex)
+                ctypes.windll.kernel32.CloseHandle(self.mutex)
+                self.mutex = None
+            except Exception as e:
+                logging.error(f"释放互斥体时发生错误: {e}", exc_info=True)
+
+
+def send_command(command, app_name=APP_NAME, timeout=REPLY_TIMEOUT, address=None):
+    """
+    把命令发送给运行中的实例
+
+    返回:
+        dict: {"ok": 是否成功, "message": 说明}；没有运行中的实例时抛出 OSError
+    """
+    address = address or ipc_address(app_name)
+    request = json.dumps({"command": command}).encode("utf-8")
+    if sys.platform == "win32":
+        from multiprocessing.connection import Client
+        with Client(address, family="AF_PIPE") as conn:
+            conn.send_bytes(request)
+            if not conn.poll(timeout):
+                raise TimeoutError("no reply from the running instance")
+            reply = conn.recv_bytes(MAX_MESSAGE_SIZE)
+    else:
+        if address == ipc_address(app_name):
+            # 后备目录被其他用户占用时不连接其中的套接字
+            ensure_runtime_dir(app_name, create=False)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(address)
+            sock.sendall(request + b"\n")
+            reply = _read_line(sock)
+    if not reply:
+        raise ConnectionError("the running instance closed the connection")
+    return json.loads(reply.decode("utf-8"))
+
+
+def main(argv=None, app_name=APP_NAME):
+    """转发命令行中的 --check-now / --open-settings / --reload，返回退出码"""
+    argv = sys.argv[1:] if argv is None else argv
+    commands = [command for command in COMMANDS if f"--{command}" in argv]
+    for command in commands:
+        try:
+            reply = send_command(command, app_name)
+        except (FileNotFoundError, ConnectionRefusedError):
+            print("磁盘监控器没有在运行。", file=sys.stderr)
+            return EXIT_NOT_RUNNING
+        except OSError as e:
+            print(f"无法连接运行中的磁盘监控器: {e}", file=sys.stderr)
+            return EXIT_NOT_RUNNING
+        if not reply.get("ok"):
+            print(f"{command}: {reply.get('message')}", file=sys.stderr)
+            return EXIT_FAILED
+        print(reply.get("message", ""))
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
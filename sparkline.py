@@ -0,0 +1,90 @@
+"""
+使用量趋势图绘制
+
+历史点先按像素列降采样（每列保留最小值和最大值），再绘制：
+    迷你趋势图  小 PIL 图像上的一条折线，按驱动器和最新历史点缓存
+    详细趋势图  Canvas 上的单条折线，依次连接每列的最大值和最小值
+因此绘制成本只和像素宽度有关，与样本数量无关。
+"""
+
+from PIL import Image, ImageDraw
+
+from history import downsample_minmax
+
+SPARKLINE_SIZE = (60, 16)
+LINE_COLOR = (0, 90, 180)
+
+
+def value_range(columns):
+    """返回降采样结果的 (最小值, 最大值)，没有数据时返回None"""
+    if not columns:
+        return None
+    return min(c[1] for c in columns), max(c[2] for c in columns)
+
+
+def chart_coords(columns, width, height, padding=4, bounds=None):
+    """
+    生成折线坐标：依次连接每列的最大值和最小值，纵轴按 bounds（默认为数据范围）缩放
+
+    columns 的列号应小于 width - 2 * padding。
+
+    返回:
+        list: [x0, y0, x1, y1, ...]，可以直接传给 Canvas.create_line 或 ImageDraw.line；点数少于2时为空
+    """
+    bounds = bounds or value_range(columns)
+    if bounds is None:
+        return []
+    vmin, vmax = bounds
+    bottom = height - padding - 1
+    # 数据没有变化时画在中间
+    k = (height - 2 * padding - 1) / (vmax - vmin) if vmax > vmin else 0
+    if not k:
+        bottom = height // 2
+    coords = []
+    for col, low, high in columns:
+        x = padding + col
+        coords.append(x)
+        coords.append(int(bottom - (high - vmin) * k))
+        if low != high:
+            coords.append(x)
+            coords.append(int(bottom - (low - vmin) * k))
+    return coords if len(coords) >= 4 else []
+
+
+def render_sparkline(columns, size=SPARKLINE_SIZE, color=LINE_COLOR, padding=1):
+    """把降采样结果（列号小于 宽度 - 2*padding）绘制为透明背景的迷你趋势图"""
+    img = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    coords = chart_coords(columns, size[0], size[1], padding)
+    if coords:
+        ImageDraw.Draw(img).line(coords, fill=color)
+    elif columns:
+        # 只有一个点时画一条短横线
+        x, y = padding + columns[0][0], size[1] // 2
+        ImageDraw.Draw(img).line((x, y, x + 1, y), fill=color)
+    return img
+
+
+class SparklineCache:
+    """
+    迷你趋势图缓存
+
+    以 (驱动器, 时间范围) 为单位保存，最新历史点没有变化时直接返回缓存的图像。
+    """
+
+    def __init__(self, size=SPARKLINE_SIZE):
+        self.size = size
+        self._images = {}
+
+    def get(self, drive, tier, points, t0, t1):
+        version = (points[-1], t0) if points else None
+        cached = self._images.get((drive, tier))
+        if cached is not None and cached[0] == version:
+            return cached[1], False
+        columns = downsample_minmax(points, self.size[0] - 2, t0, t1)
+        image = render_sparkline(columns, self.size, padding=1)
+        self._images[(drive, tier)] = (version, image)
+        return image, True
+
+    def forget(self, drive):
+        for key in [k for k in self._images if k[0] == drive]:
+            del self._images[key]
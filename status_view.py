@@ -0,0 +1,338 @@
+"""
+实时磁盘状态窗口
+
+基于 ttk.Treeview 显示所有监控的驱动器，每个驱动器一行。Treeview 只绘制可见的行，
+几百个挂载点也能流畅滚动。新样本到达时只更新发生变化的单元格；
+点击列标题按使用率、剩余空间或增长速度等排序，只移动行的位置，不重建控件。
+每行带有最近一小时、一天或一周的迷你趋势图，选中行时在下方显示详细趋势图。
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from PIL import ImageTk
+
+from history import TIERS
+from sparkline import SparklineCache, chart_coords, downsample_minmax, value_range
+
+COLUMNS = ("drive", "level", "percent", "used", "free", "total", "growth", "reclaimable", "compressed", "latency")
+# 列标题使用的翻译键
+HEADINGS = {
+    "drive": "drive",
+    "level": "level",
+    "percent": "usage",
+    "used": "used_space",
+    "free": "free_space",
+    "total": "total_space",
+    "growth": "growth_per_hour",
+    "reclaimable": "reclaimable_now",
+    "compressed": "compression_saved",
+    "latency": "latency_p99",
+}
+LEVEL_ORDER = {"normal": 0, "notice": 1, "warning": 2, "critical": 3}
+LEVEL_COLORS = {"critical": "#FFCCCC", "warning": "#FFFFCC", "notice": "#CCE5FF", "normal": "#FFFFFF"}
+GB = 1024 ** 3
+# 各趋势范围覆盖的时间（秒）
+TIER_SPANS = {name: resolution * capacity for name, resolution, capacity in TIERS}
+CHART_HEIGHT = 120
+CHART_PADDING = 6
+
+
+def _gb(value):
+    return f"{value / GB:.2f} GB"
+
+
+def format_row(info, translate):
+    """
+    把驱动器信息格式化为一行显示文本
+
+    返回:
+        tuple: 与 COLUMNS 顺序一致的字符串
+    """
+    usage = info["usage"]
+    growth = info.get("growth")
+    reclaimable = info.get("reclaimable")
+    latency = info.get("latency") or {}
+    p99 = max((stats["p99_ms"] for stats in latency.values()), default=None)
+    return (
+        info["drive"],
+        translate("level_" + info.get("level", "normal")),
+        f"{usage['percent']:.1f}%",
+        _gb(usage["used"]),
+        _gb(usage["free"]),
+        _gb(usage["total"]),
+        f"{growth * 3600 / GB:+.2f} GB/h" if growth is not None else "-",
+        _gb(reclaimable["total"]) if reclaimable else "-",
+        _gb(info["compression_saved"]) if info.get("compression_saved") else "-",
+        f"{p99:.1f} ms" if p99 is not None else "-",
+    )
+
+
+def sort_value(info, column, descending=False):
+    """
+    返回驱动器在指定列上的排序键 (是否排在后面, 值)
+
+    缺失的值（没有增长速度、可回收空间、压缩节省或延迟数据）不论升序还是降序都排在最后，
+    因此需要传入与 sorted(reverse=...) 相同的 descending。
+    """
+    usage = info["usage"]
+    if column == "drive":
+        value = info["drive"]
+    elif column == "level":
+        value = LEVEL_ORDER.get(info.get("level", "normal"), 0)
+    elif column == "percent":
+        value = usage["percent"]
+    elif column in ("used", "free", "total"):
+        value = usage[column]
+    elif column == "growth":
+        value = info.get("growth")
+    elif column == "reclaimable":
+        reclaimable = info.get("reclaimable")
+        value = reclaimable["total"] if reclaimable else None
+    elif column == "compressed":
+        value = info.get("compression_saved") or None
+    elif column == "latency":
+        latency = info.get("latency") or {}
+        value = max((stats["p99_ms"] for stats in latency.values()), default=None)
+    else:
+        raise ValueError(f"未知的列: {column}")
+    missing = value is None
+    # 降序排序会反转整个键，缺失标志也要反过来
+    return (missing != descending, 0 if missing else value)
+
+
+def diff_rows(old_rows, new_rows):
+    """
+    比较两次的行内容
+
+    参数:
+        old_rows (dict): {drive: 行}
+        new_rows (dict): {drive: 行}
+
+    返回:
+        tuple: (新增的驱动器列表, 删除的驱动器列表, {drive: {列名: 新值}})
+    """
+    added = [drive for drive in new_rows if drive not in old_rows]
+    removed = [drive for drive in old_rows if drive not in new_rows]
+    changed = {}
+    for drive, row in new_rows.items():
+        old = old_rows.get(drive)
+        if old is None or old == row:
+            continue
+        changed[drive] = {column: value for column, old_value, value in zip(COLUMNS, old, row) if old_value != value}
+    return added, removed, changed
+
+
+class DiskStatusWindow:
+    """实时磁盘状态窗口，由 SimpleDiskMonitor 在UI线程中创建和更新"""
+
+    def __init__(self, monitor, parent):
+        self.monitor = monitor
+        self._ = monitor._
+        self.rows = {}
+        self.infos = {}
+        self.sort_column = "percent"
+        self.sort_descending = True
+        self.sparklines = SparklineCache()
+        # 每个驱动器一个 PhotoImage，趋势变化时原地 paste 新图像
+        self.photos = {}
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(self._("disk_status"))
+        self.window.geometry("960x560")
+        self.create_widgets()
+
+    def create_widgets(self):
+        # 趋势范围选择
+        range_frame = tk.Frame(self.window)
+        range_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Label(range_frame, text=self._("trend_range")).pack(side=tk.LEFT)
+        self.range_var = tk.StringVar(value=TIERS[0][0])
+        for name, _, _ in TIERS:
+            tk.Radiobutton(range_frame, text=self._("range_" + name), variable=self.range_var, value=name,
+                           command=self.on_range_change).pack(side=tk.LEFT, padx=5)
+
+        frame = tk.Frame(self.window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.tree = ttk.Treeview(frame, columns=COLUMNS, show="tree headings", selectmode="browse")
+        self.tree.heading("#0", text=self._("trend"))
+        self.tree.column("#0", width=80, stretch=False)
+        for column in COLUMNS:
+            self.tree.heading(column, text=self._(HEADINGS[column]), command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=140 if column == "drive" else 85,
+                             anchor=tk.W if column == "drive" else tk.E, stretch=column == "drive")
+        for level, color in LEVEL_COLORS.items():
+            self.tree.tag_configure(level, background=color)
+
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # 选中行的详细信息（可回收空间明细、延迟分位数）
+        self.detail_label = tk.Label(self.window, text="", justify=tk.LEFT, anchor=tk.W, wraplength=860)
+        self.detail_label.pack(fill=tk.X, padx=10)
+        # 选中驱动器的详细趋势图
+        self.chart = tk.Canvas(self.window, height=CHART_HEIGHT, bg="white", highlightthickness=0)
+        self.chart.pack(fill=tk.X, padx=10, pady=(5, 0))
+        self.chart.bind("<Configure>", lambda e: self.draw_chart())
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self.update_detail())
+        self.tree.bind("<Double-1>", lambda e: self.open_age_report())
+
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(fill=tk.X, pady=10)
+        tk.Button(button_frame, text=self._("close"), command=self.close, width=10).pack(side=tk.RIGHT, padx=10)
+        tk.Button(button_frame, text=self._("age_report"), command=self.open_age_report).pack(side=tk.LEFT, padx=10)
+        # 本机有Docker数据目录时提供容器存储视图
+        if self.monitor.container_analyzer.available():
+            tk.Button(button_frame, text=self._("container_usage"),
+                      command=self.monitor.start_container_usage).pack(side=tk.LEFT, padx=10)
+
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    def exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def close(self):
+        self.window.destroy()
+
+    def selected_drive(self):
+        selection = self.tree.selection()
+        return selection[0] if selection else None
+
+    def open_age_report(self):
+        drive = self.selected_drive()
+        if drive:
+            self.monitor.start_age_report(drive)
+
+    def update(self, drives_info):
+        """应用一批新样本，只修改发生变化的单元格"""
+        new_infos = {}
+        for info in drives_info:
+            previous = self.infos.get(info["drive"])
+            # 实时刷新时不统计可回收空间，沿用上一次的结果
+            if "reclaimable" not in info and previous and previous.get("reclaimable"):
+                info = dict(info, reclaimable=previous["reclaimable"])
+            new_infos[info["drive"]] = info
+        new_rows = {drive: format_row(info, self._) for drive, info in new_infos.items()}
+        added, removed, changed = diff_rows(self.rows, new_rows)
+
+        for drive in removed:
+            self.tree.delete(drive)
+            self.photos.pop(drive, None)
+            self.sparklines.forget(drive)
+        for drive in added:
+            level = new_infos[drive].get("level", "normal")
+            self.tree.insert("", tk.END, iid=drive, values=new_rows[drive], tags=(level,))
+        for drive, cells in changed.items():
+            for column, value in cells.items():
+                self.tree.set(drive, column, value)
+            if "level" in cells:
+                self.tree.item(drive, tags=(new_infos[drive].get("level", "normal"),))
+
+        self.rows = new_rows
+        self.infos = new_infos
+        self.apply_sort()
+        self.update_sparklines()
+        self.update_detail()
+
+    def _time_range(self, drive, tier):
+        """趋势图的时间范围：以最新样本为终点，向前覆盖该范围的全部时间"""
+        latest = self.monitor.history.latest(drive)
+        t1 = latest[0] if latest else time.time()
+        return t1 - TIER_SPANS[tier], t1
+
+    def update_sparklines(self, force=False):
+        """刷新每行的迷你趋势图，历史没有变化的行直接使用缓存"""
+        tier = self.range_var.get()
+        for drive in self.infos:
+            points = self.monitor.history.series(drive, tier)
+            t0, t1 = self._time_range(drive, tier)
+            image, changed = self.sparklines.get(drive, tier, points, t0, t1)
+            photo = self.photos.get(drive)
+            if photo is None:
+                photo = self.photos[drive] = ImageTk.PhotoImage(image, master=self.window)
+                self.tree.item(drive, image=photo)
+            elif changed or force:
+                photo.paste(image)
+
+    def on_range_change(self):
+        # 各范围的图像分别缓存，切换时只需把对应的图像贴到每行上
+        self.update_sparklines(force=True)
+        self.draw_chart()
+
+    def draw_chart(self):
+        """用一条折线绘制选中驱动器的详细趋势，历史点先降采样到画布宽度"""
+        self.chart.delete("all")
+        drive = self.selected_drive()
+        if not drive:
+            return
+        tier = self.range_var.get()
+        width = max(self.chart.winfo_width(), 200)
+        t0, t1 = self._time_range(drive, tier)
+        columns = downsample_minmax(self.monitor.history.series(drive, tier),
+                                    width - 2 * CHART_PADDING, t0, t1)
+        bounds = value_range(columns)
+        if bounds is None:
+            self.chart.create_text(width // 2, CHART_HEIGHT // 2, text=self._("trend_no_data"), fill="#808080")
+            return
+        coords = chart_coords(columns, width, CHART_HEIGHT, CHART_PADDING, bounds)
+        if coords:
+            self.chart.create_line(*coords, fill="#005AB4")
+        self.chart.create_text(CHART_PADDING, CHART_PADDING, anchor=tk.NW, fill="#606060",
+                               text=f"{bounds[1] / GB:.2f} GB")
+        self.chart.create_text(CHART_PADDING, CHART_HEIGHT - CHART_PADDING, anchor=tk.SW, fill="#606060",
+                               text=f"{bounds[0] / GB:.2f} GB")
+        self.chart.create_text(width - CHART_PADDING, CHART_PADDING, anchor=tk.NE, fill="#606060",
+                               text=f"{drive}  {self._('range_' + tier)}")
+
+    def sort_by(self, column):
+        """点击列标题：同一列再次点击时反转顺序"""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = column != "drive"
+        self.apply_sort()
+
+    def apply_sort(self):
+        """按当前排序列移动行，顺序没有变化时不做任何操作"""
+        order = sorted(self.infos, key=lambda d: sort_value(self.infos[d], self.sort_column, self.sort_descending),
+                       reverse=self.sort_descending)
+        if list(self.tree.get_children("")) != order:
+            for index, drive in enumerate(order):
+                self.tree.move(drive, "", index)
+        for column in COLUMNS:
+            text = self._(HEADINGS[column])
+            if column == self.sort_column:
+                text += " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(column, text=text)
+
+    def update_detail(self):
+        drive = self.selected_drive()
+        info = self.infos.get(drive) if drive else None
+        self.draw_chart()
+        if not info:
+            self.detail_label.config(text="")
+            return
+        lines = []
+        reclaimable = info.get("reclaimable")
+        if reclaimable:
+            breakdown = ", ".join(
+                f"{self._('reclaim_' + item['category'])} {item['bytes'] / GB:.2f} GB"
+                for item in reclaimable["items"][:3]
+            )
+            if breakdown:
+                lines.append(f"{self._('reclaimable_now')}: {breakdown}")
+        latency = info.get("latency") or {}
+        latency_text = "  ".join(
+            self._("latency_short", kind, stats["p50_ms"], stats["p99_ms"]) for kind, stats in latency.items()
+        )
+        if latency_text:
+            lines.append(latency_text)
+        self.detail_label.config(text=f"{self._('drive')} {drive}\n" + "\n".join(lines))
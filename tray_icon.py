@@ -0,0 +1,88 @@
+"""
+动态托盘图标
+
+托盘图标显示使用率最高（级别最严重）的驱动器的填充程度和级别颜色。
+使用率按10%分桶，每个 (分桶, 级别) 的图像只绘制一次并缓存，
+之后更新图标只是一次字典查找。
+"""
+
+import threading
+
+BUCKETS = 10
+ICON_SIZE = 64
+LEVEL_ORDER = {"normal": 0, "notice": 1, "warning": 2, "critical": 3}
+# 各级别的填充颜色
+LEVEL_COLORS = {
+    "normal": (0, 120, 215),
+    "notice": (30, 144, 255),
+    "warning": (230, 170, 0),
+    "critical": (220, 40, 40),
+}
+# Windows 托盘提示最多显示127个字符
+TOOLTIP_MAX_CHARS = 127
+
+
+def bucket_for(percent, buckets=BUCKETS):
+    """把使用率映射到分桶：0..buckets，只有100%才落在最后一个桶"""
+    percent = min(max(percent, 0), 100)
+    return min(int(percent * buckets / 100), buckets - 1) if percent < 100 else buckets
+
+
+def render_icon(bucket, level, buckets=BUCKETS, size=ICON_SIZE):
+    """绘制一个竖直的磁盘图标，填充高度对应分桶，颜色对应级别"""
+    from PIL import Image, ImageDraw
+    img = Image.new("RGBA", (size, size), color=(0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    left, top, right, bottom = size * 5 // 32, size // 16, size * 27 // 32, size * 15 // 16
+    d.rectangle((left, top, right, bottom), fill=(235, 235, 235), outline=(90, 90, 90), width=max(size // 32, 1))
+    inner_top, inner_bottom = top + 3, bottom - 3
+    fill_height = (inner_bottom - inner_top) * bucket // buckets
+    if fill_height > 0:
+        d.rectangle((left + 3, inner_bottom - fill_height, right - 3, inner_bottom), fill=LEVEL_COLORS[level])
+    return img
+
+
+def worst_drive(drive_infos):
+    """返回级别最严重、其次使用率最高的驱动器信息，没有驱动器时返回None"""
+    return max(drive_infos, key=lambda i: (LEVEL_ORDER.get(i["level"], 0), i["usage"]["percent"]), default=None)
+
+
+def tooltip_text(title, drive_infos, translate, limit=3):
+    """
+    生成托盘提示：程序名加上最严重的几个驱动器
+
+    超出 TOOLTIP_MAX_CHARS 时截断。
+    """
+    ordered = sorted(drive_infos, key=lambda i: (LEVEL_ORDER.get(i["level"], 0), i["usage"]["percent"]), reverse=True)
+    lines = [title]
+    for info in ordered[:limit]:
+        lines.append(translate("tray_tooltip_line", info["drive"], info["usage"]["percent"],
+                               translate("level_" + info["level"])))
+    if len(ordered) > limit:
+        lines.append(translate("tray_tooltip_more", len(ordered) - limit))
+    text = "\n".join(lines)
+    return text if len(text) <= TOOLTIP_MAX_CHARS else text[:TOOLTIP_MAX_CHARS - 1] + "…"
+
+
+class IconCache:
+    """按 (分桶, 级别) 缓存已绘制的图标，线程安全"""
+
+    def __init__(self, buckets=BUCKETS, size=ICON_SIZE):
+        self.buckets = buckets
+        self.size = size
+        self._images = {}
+        self._lock = threading.Lock()
+
+    def get(self, bucket, level):
+        key = (bucket, level)
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                image = self._images[key] = render_icon(bucket, level, self.buckets, self.size)
+            return image
+
+    def prerender(self):
+        """预先绘制所有组合（共 (BUCKETS+1)*4 张小图）"""
+        for level in LEVEL_COLORS:
+            for bucket in range(self.buckets + 1):
+                self.get(bucket, level)
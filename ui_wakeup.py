@@ -0,0 +1,173 @@
+"""
+事件驱动的UI队列
+
+后台线程（监控线程、托盘菜单回调等）通过 ui_queue 把任务交给Tk主线程。
+以前主线程每100毫秒轮询一次队列，空闲时每秒也要唤醒10次。
+WakeupQueue 在放入任务时通知主线程，主线程只在有任务时才被唤醒:
+    Unix     自管道（self-pipe）的读端注册到 Tk 的 createfilehandler
+    其他平台 从生产者线程 event_generate 一个虚拟事件
+连续放入多个任务时只通知一次，直到主线程取走任务。
+"""
+
+import os
+import queue
+import logging
+import threading
+
+WAKE_EVENT = "<<UIQueueWake>>"
+# 两种唤醒方式都不可用时的后备轮询间隔（毫秒）
+FALLBACK_POLL_MS = 1000
+
+
+class PipeWaker:
+    """
+    自管道唤醒器
+
+    wake() 可以在任意线程调用；管道中最多只有一个未读字节，
+    因此连续唤醒不会堆积，也不会因为管道写满而阻塞。
+    """
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+        os.set_blocking(self.write_fd, False)
+        self._armed = False
+        self._lock = threading.Lock()
+
+    def fileno(self):
+        return self.read_fd
+
+    def wake(self):
+        with self._lock:
+            if self._armed:
+                return
+            self._armed = True
+        try:
+            os.write(self.write_fd, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def consume(self):
+        """清空管道，之后的 wake() 会再次写入"""
+        with self._lock:
+            self._armed = False
+        try:
+            while os.read(self.read_fd, 512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self):
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class WakeupQueue(queue.Queue):
+    """放入任务时调用唤醒函数的队列"""
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self._waker = None
+
+    def set_waker(self, waker):
+        """设置唤醒函数；设置前已排队的任务会立即触发一次唤醒"""
+        self._waker = waker
+        if waker is not None and not self.empty():
+            waker()
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        waker = self._waker
+        if waker is not None:
+            try:
+                waker()
+            except Exception as e:
+                logging.error(f"唤醒UI线程失败: {e}")
+
+
+def attach(root, ui_queue, handler):
+    """
+    把队列接到Tk主循环上：有任务时在主线程中调用 handler()
+
+    返回:
+        callable: 退出前调用的清理函数
+    """
+    tk_app = root.tk
+    if hasattr(tk_app, "createfilehandler"):
+        try:
+            waker = PipeWaker()
+
+            def on_readable(fd, mask):
+                waker.consume()
+                handler()
+
+            tk_app.createfilehandler(waker.fileno(), 1, on_readable)  # 1 == tkinter.READABLE
+
+            def detach():
+                ui_queue.set_waker(None)
+                try:
+                    tk_app.deletefilehandler(waker.fileno())
+                except Exception:
+                    pass
+                waker.close()
+
+            ui_queue.set_waker(waker.wake)
+            logging.info("UI队列使用自管道唤醒")
+            return detach
+        except Exception as e:
+            logging.warning(f"无法注册自管道唤醒，改用虚拟事件: {e}")
+
+    if _threaded_tcl(root):
+        pending = threading.Event()
+
+        def wake():
+            # 同一时间只投递一个唤醒事件
+            if pending.is_set():
+                return
+            pending.set()
+            try:
+                root.event_generate(WAKE_EVENT, when="tail")
+            except Exception:
+                # 事件没有投递出去，不清除的话之后的唤醒都会被跳过
+                pending.clear()
+                raise
+
+        def on_wake():
+            pending.clear()
+            handler()
+
+        root.bind(WAKE_EVENT, lambda event: on_wake())
+
+        def detach():
+            ui_queue.set_waker(None)
+
+        ui_queue.set_waker(wake)
+        logging.info("UI队列使用虚拟事件唤醒")
+        return detach
+
+    # Tcl未启用线程支持时不能从其他线程调用Tk，只能轮询
+    logging.warning(f"Tcl未启用线程支持，UI队列退回到每 {FALLBACK_POLL_MS} 毫秒轮询")
+    state = {"running": True}
+
+    def poll():
+        if not state["running"]:
+            return
+        handler()
+        root.after(FALLBACK_POLL_MS, poll)
+
+    root.after(FALLBACK_POLL_MS, poll)
+
+    def detach():
+        state["running"] = False
+
+    return detach
+
+
+def _threaded_tcl(root):
+    try:
+        return bool(root.tk.eval("set tcl_platform(threaded)"))
+    except Exception:
+        return False
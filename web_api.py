@@ -0,0 +1,274 @@
+"""
+只读的 HTTP JSON 接口和网页仪表盘
+
+    GET /                   仪表盘页面（静态，定时轮询下面的接口）
+    GET /api/status         最近一轮检查的结果
+    GET /api/history        已用空间历史，参数 drive、tier、points、since、until，在服务端按列降采样
+    GET /api/alerts         报警记录（级别变化），参数 limit、after
+
+状态和报警记录在监控线程发布 cycle / transition 记录时生成，处理线程只读取。
+每个响应都带 ETag：状态和报警记录用序号，历史用驱动器最近一个样本的时间加请求参数，
+If-None-Match 命中时直接返回 304，不做序列化也不降采样。
+客户端接受 gzip 时压缩，响应体和压缩结果按 ETag 缓存，多个客户端轮询同一份数据只生成一次。
+"""
+
+import gzip
+import json
+import math
+import time
+import zlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs, urlsplit
+
+from history import TIERS, downsample_minmax
+
+JSON_TYPE = "application/json; charset=utf-8"
+HTML_TYPE = "text/html; charset=utf-8"
+# 保留的报警记录条数
+ALERT_LOG_SIZE = 500
+# 历史降采样的默认列数和上限
+DEFAULT_POINTS = 120
+MAX_POINTS = 1000
+# 小于该大小的响应不压缩
+GZIP_MIN_SIZE = 512
+# 按 ETag 缓存的响应数
+CACHE_SIZE = 64
+
+
+class ApiError(Exception):
+    """请求参数错误，status 为 HTTP 状态码"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _make_etag(*parts):
+    return '"%08x"' % zlib.crc32(repr(parts).encode("utf-8"))
+
+
+def etag_matches(header, etag):
+    """If-None-Match 中是否包含 etag（支持逗号分隔的多个值、弱校验前缀和 *）"""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag or candidate == "*":
+            return True
+    return False
+
+
+def _int_param(query, name, default, low, high):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    return max(low, min(value, high))
+
+
+def _float_param(query, name):
+    if name not in query:
+        return None
+    try:
+        value = float(query[name][0])
+    except ValueError:
+        raise ApiError(400, f"{name} must be a number")
+    # nan 与任何时间比较都为假，inf 会进入 ETag 和输出的 JSON，都按参数错误处理
+    if not math.isfinite(value):
+        raise ApiError(400, f"{name} must be a finite number")
+    return value
+
+
+class ResponseCache:
+    """按 ETag 缓存 (响应体, gzip响应体)，超出容量时淘汰最久未用的"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, etag, build, compress):
+        """
+        返回 etag 对应的响应体；没有缓存时调用 build() 生成
+
+        参数:
+            compress (bool): 是否需要 gzip 压缩的版本
+
+        返回:
+            tuple: (响应体, 是否已压缩)
+        """
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry:
+                self._entries.move_to_end(etag)
+        if entry is None:
+            entry = [build(), None]
+        body = entry[0]
+        compressed = compress and len(body) >= GZIP_MIN_SIZE
+        if compressed and entry[1] is None:
+            entry[1] = gzip.compress(body, compresslevel=6, mtime=0)
+        with self._lock:
+            self._entries[etag] = entry
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return (entry[1], True) if compressed else (body, False)
+
+
+class ApiState:
+    """
+    监控事件的监听器：保存最近一轮检查的结果和报警记录，并生成各个接口的响应
+
+    参数:
+        history (UsageHistory): 已用空间历史
+    """
+
+    def __init__(self, history, alert_log_size=ALERT_LOG_SIZE):
+        self.history = history
+        self.cache = ResponseCache()
+        # 区分进程重启前后的 ETag，避免序号重复时误返回 304
+        self.instance = "%x" % int(time.time())
+        self._lock = threading.Lock()
+        self._status = None
+        self._status_version = 0
+        self._alerts = deque(maxlen=alert_log_size)
+        self._alert_seq = 0
+
+    def __call__(self, record):
+        if record["type"] == "cycle":
+            status = {
+                "time": record["time"],
+                "thresholds": record.get("thresholds", {}),
+                "cycle": record.get("cycle_stats", {}),
+                "drives": [dict(d["usage"], drive=d["drive"], level=d["level"], latency=d.get("latency", {}))
+                           for d in record["drives"]],
+            }
+            with self._lock:
+                self._status_version += 1
+                self._status = status
+        elif record["type"] == "transition":
+            entry = {key: record.get(key) for key in ("time", "drive", "level", "previous", "percent", "free")}
+            with self._lock:
+                self._alert_seq += 1
+                entry["id"] = self._alert_seq
+                self._alerts.append(entry)
+
+    def status(self, query):
+        """返回 (ETag, 生成响应体的函数)"""
+        with self._lock:
+            status, version = self._status, self._status_version
+        if status is None:
+            raise ApiError(503, "waiting for the first check")
+        return f'"{self.instance}-s{version}"', lambda: _dumps(status)
+
+    def alerts(self, query):
+        limit = _int_param(query, "limit", 50, 1, self._alerts.maxlen)
+        after = _int_param(query, "after", 0, 0, 2 ** 63)
+        with self._lock:
+            seq = self._alert_seq
+            entries = [e for e in self._alerts if e["id"] > after]
+        entries = entries[-limit:][::-1]
+        return f'"{self.instance}-a{seq}-{limit}-{after}"', lambda: _dumps({"last_id": seq, "alerts": entries})
+
+    def history_range(self, query):
+        drive = query.get("drive", [None])[0]
+        if not drive:
+            raise ApiError(400, "drive is required")
+        tier = query.get("tier", ["hour"])[0]
+        tiers = {name: resolution * capacity for name, resolution, capacity in TIERS}
+        if tier not in tiers:
+            raise ApiError(400, f"tier must be one of {', '.join(tiers)}")
+        points = _int_param(query, "points", DEFAULT_POINTS, 1, MAX_POINTS)
+        since = _float_param(query, "since")
+        until = _float_param(query, "until")
+        latest = self.history.latest(drive)
+        if latest is None:
+            raise ApiError(404, f"no history for {drive}")
+        # 最近一个样本的时间决定了历史是否变化，命中时不需要读取历史
+        etag = _make_etag(self.instance, drive, tier, points, since, until, latest[0])
+
+        def build():
+            t1 = until if until is not None else latest[0]
+            t0 = since if since is not None else t1 - tiers[tier]
+            columns = downsample_minmax(self.history.series(drive, tier), points, t0, t1)
+            step = (t1 - t0) / (points - 1) if points > 1 else 0
+            return _dumps({
+                "drive": drive, "tier": tier, "t0": t0, "t1": t1, "total": latest[2],
+                "points": [[round(t0 + col * step, 3), low, high] for col, low, high in columns],
+            })
+        return etag, build
+
+
+def start_server(state, host="127.0.0.1", port=8765):
+    """
+    在后台线程中启动 HTTP 服务
+
+    返回:
+        ThreadingHTTPServer: 调用 shutdown() 和 server_close() 停止
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from dashboard import PAGE
+
+    page_etag = _make_etag(PAGE)
+    routes = {
+        "/api/status": state.status,
+        "/api/history": state.history_range,
+        "/api/alerts": state.alerts,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                if url.path in ("/", "/index.html"):
+                    self.respond(page_etag, lambda: PAGE, HTML_TYPE)
+                elif url.path in routes:
+                    etag, build = routes[url.path](parse_qs(url.query))
+                    self.respond(etag, build, JSON_TYPE)
+                else:
+                    raise ApiError(404, "not found")
+            except ApiError as e:
+                body = _dumps({"error": str(e)})
+                self.send_response(e.status)
+                self.send_header("Content-Type", JSON_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def respond(self, etag, build, content_type):
+            if etag_matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+            body, compressed = state.cache.get(etag, build, accepts_gzip)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            # 浏览器每次都带上 If-None-Match 重新验证
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            if compressed:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 仪表盘每隔几秒轮询一次，不逐条记录
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="web-api-http", daemon=True).start()
+    logging.info(f"网页接口已启动: http://{host}:{server.server_address[1]}/")
+    return server